@@ -3,130 +3,23 @@ Agresif Optimizasyon - Bot'u kar eden hale getirmek için
 Grid search ile en iyi parametreleri bulur
 """
 import pandas as pd
-import numpy as np
 from datetime import datetime
-from bot.data.yahoo import fetch_candles
-from bot.strategy.bot_hunter import compute_bot_hunter_signals
-from bot.exchange.paper import PaperExchange
-from itertools import product
-import sys
+from bot.data.store import fetch_candles
+from bot.backtest.optimizer import grid_search
+from bot.backtest.walkforward import walk_forward
+from bot.backtest.events import INFO, default_sink
 
 
-class OptimizedBacktester:
-    """Optimize edilmiş backtester"""
-    
-    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001):
-        self.initial_capital = initial_capital
-        self.commission = commission
-    
-    def run_backtest(self, df: pd.DataFrame, symbol: str, 
-                    stop_loss_pct: float,
-                    take_profit_pct: float,
-                    min_confidence: float,
-                    position_size_pct: float,
-                    use_trend_filter: bool) -> dict:
-        """Backtest with specific parameters"""
-        
-        if df.empty or len(df) < 200:
-            return self._empty_result()
-        
-        exchange = PaperExchange(self.initial_capital)
-        trades = []
-        equity_curve = [self.initial_capital]
-        
-        # Trend filtresi
-        close = df['close'].astype(float)
-        ema_50 = close.ewm(span=50).mean()
-        ema_200 = close.ewm(span=200).mean()
-        
-        for i in range(200, len(df)):
-            current_data = df.iloc[:i+1]
-            current_price = float(current_data.iloc[-1]['close'])
-            
-            # Trend kontrolü
-            current_ema_50 = ema_50.iloc[i] if i < len(ema_50) else current_price
-            current_ema_200 = ema_200.iloc[i] if i < len(ema_200) else current_price
-            is_uptrend = current_ema_50 > current_ema_200
-            
-            signal = compute_bot_hunter_signals(current_data, symbol=symbol)
-            current_equity = exchange.cash + (exchange.position * current_price)
-            equity_curve.append(current_equity)
-            
-            # Stop-loss ve take-profit
-            if exchange.position > 0 and exchange.avg_entry_price:
-                pnl_pct = (current_price - exchange.avg_entry_price) / exchange.avg_entry_price
-                
-                if pnl_pct <= -stop_loss_pct:
-                    exchange.market_sell(symbol, exchange.position, current_price)
-                    trades.append({'type': 'STOP_LOSS', 'pnl_pct': pnl_pct})
-                    continue
-                
-                if pnl_pct >= take_profit_pct:
-                    exchange.market_sell(symbol, exchange.position, current_price)
-                    trades.append({'type': 'TAKE_PROFIT', 'pnl_pct': pnl_pct})
-                    continue
-            
-            # Sinyal bazlı işlemler
-            if signal.side == "buy" and exchange.position <= 0:
-                if signal.confidence > min_confidence:
-                    if use_trend_filter and not is_uptrend:
-                        continue
-                    
-                    account_balance = exchange.cash + (exchange.position * current_price if exchange.position > 0 else 0)
-                    position_value = account_balance * position_size_pct
-                    qty = position_value / current_price
-                    
-                    if qty > 0 and exchange.cash >= position_value * (1 + self.commission):
-                        exchange.market_buy(symbol, int(qty * 10000) / 10000, current_price)
-                        trades.append({'type': 'BUY'})
-            
-            elif signal.side == "sell" and exchange.position > 0:
-                if signal.confidence > min_confidence:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    pnl_pct = (current_price - entry_price) / entry_price
-                    trades.append({'type': 'SELL', 'pnl_pct': pnl_pct})
-        
-        # Kalan pozisyonu kapat
-        if exchange.position > 0:
-            final_price = float(df.iloc[-1]['close'])
-            exchange.market_sell(symbol, exchange.position, final_price)
-        
-        final_equity = exchange.cash
-        total_return = (final_equity - self.initial_capital) / self.initial_capital
-        
-        # Trade istatistikleri
-        sell_trades = [t for t in trades if t['type'] in ['SELL', 'TAKE_PROFIT', 'STOP_LOSS']]
-        trade_pnl = [t.get('pnl_pct', 0) for t in sell_trades]
-        profitable = sum(1 for pnl in trade_pnl if pnl > 0)
-        win_rate = profitable / len(trade_pnl) if trade_pnl else 0
-        
-        # Max drawdown
-        equity_series = pd.Series(equity_curve)
-        rolling_max = equity_series.expanding().max()
-        drawdown = (equity_series - rolling_max) / rolling_max
-        max_drawdown = drawdown.min()
-        
-        return {
-            'total_return': total_return,
-            'final_equity': final_equity,
-            'total_trades': len(trade_pnl),
-            'win_rate': win_rate,
-            'max_drawdown': max_drawdown
-        }
-    
-    def _empty_result(self):
-        return {
-            'total_return': 0.0,
-            'final_equity': self.initial_capital,
-            'total_trades': 0,
-            'win_rate': 0.0,
-            'max_drawdown': 0.0
-        }
+PARAM_GRID = {
+    'stop_loss': [0.02, 0.03, 0.04, 0.05, 0.06],  # %2-6
+    'take_profit': [0.05, 0.08, 0.10, 0.12, 0.15],  # %5-15
+    'min_confidence': [0.65, 0.70, 0.75, 0.80],  # %65-80
+    'position_size': [0.3, 0.4, 0.5, 0.6],  # %30-60
+    'use_trend': [True, False],
+}
 
 
-def optimize_parameters(symbol: str, df: pd.DataFrame):
+def optimize_parameters(symbol: str, df: pd.DataFrame, workers: int = None):
     """Parametre optimizasyonu - Grid Search"""
     
     print(f"\n{'='*100}")
@@ -134,11 +27,11 @@ def optimize_parameters(symbol: str, df: pd.DataFrame):
     print(f"{'='*100}")
     
     # Test edilecek parametreler (daha geniş aralık)
-    stop_loss_options = [0.02, 0.03, 0.04, 0.05, 0.06]  # %2-6
-    take_profit_options = [0.05, 0.08, 0.10, 0.12, 0.15]  # %5-15
-    confidence_options = [0.65, 0.70, 0.75, 0.80]  # %65-80
-    position_size_options = [0.3, 0.4, 0.5, 0.6]  # %30-60
-    trend_filter_options = [True, False]
+    stop_loss_options = PARAM_GRID['stop_loss']
+    take_profit_options = PARAM_GRID['take_profit']
+    confidence_options = PARAM_GRID['min_confidence']
+    position_size_options = PARAM_GRID['position_size']
+    trend_filter_options = PARAM_GRID['use_trend']
     
     total_combinations = len(stop_loss_options) * len(take_profit_options) * len(confidence_options) * len(position_size_options) * len(trend_filter_options)
     
@@ -150,78 +43,43 @@ def optimize_parameters(symbol: str, df: pd.DataFrame):
     best_return = float('-inf')
     results = []
     
-    count = 0
     start_time = datetime.now()
+    events = default_sink()
     
-    # Her 10 kombinasyonda bir ilerleme göster
-    progress_interval = max(10, total_combinations // 50)  # En az 50 progress mesajı
+    # Sinyaller sembol başına bir kez hesaplanır, kombinasyonlar paralel değerlendirilir
+    rows = grid_search(df, symbol, PARAM_GRID, workers=workers)
+    count = len(rows)
     
-    for stop_loss, take_profit, min_conf, pos_size, use_trend in product(
-        stop_loss_options, take_profit_options, confidence_options, 
-        position_size_options, trend_filter_options
-    ):
-        count += 1
-        
-        # İlerleme göster
-        if count % progress_interval == 0 or count == 1:
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if count > 1:
-                avg_time_per_test = elapsed / count
-                remaining_tests = total_combinations - count
-                estimated_remaining = avg_time_per_test * remaining_tests
-                progress_pct = (count / total_combinations) * 100
-                
-                print(f"[{progress_pct:.1f}%] Test {count}/{total_combinations} | "
-                      f"Geçen: {elapsed/60:.1f}dk | "
-                      f"Tahmini kalan: {estimated_remaining/60:.1f}dk | "
-                      f"En iyi: {best_return:+.2%} | "
-                      f"Kar eden: {sum(1 for r in results if r['return'] > 0)}/{len(results)}", 
-                      flush=True)  # flush=True ile anında göster
-            else:
-                print(f"[0.0%] Test {count}/{total_combinations} başlatılıyor...")
-        
-        # Her 100 testte bir checkpoint (ilerleme kaydet)
-        if count % 100 == 0:
-            print(f"✓ Checkpoint: {count}/{total_combinations} tamamlandı", flush=True)
-        
-        backtester = OptimizedBacktester()
-        result = backtester.run_backtest(
-            df, symbol,
-            stop_loss_pct=stop_loss,
-            take_profit_pct=take_profit,
-            min_confidence=min_conf,
-            position_size_pct=pos_size,
-            use_trend_filter=use_trend
-        )
-        
+    for row in rows:
         results.append({
-            'stop_loss': stop_loss,
-            'take_profit': take_profit,
-            'min_confidence': min_conf,
-            'position_size': pos_size,
-            'use_trend': use_trend,
-            'return': result['total_return'],
-            'trades': result['total_trades'],
-            'win_rate': result['win_rate'],
-            'max_drawdown': result['max_drawdown']
+            'stop_loss': row['stop_loss'],
+            'take_profit': row['take_profit'],
+            'min_confidence': row['min_confidence'],
+            'position_size': row['position_size'],
+            'use_trend': row['use_trend'],
+            'return': row['total_return'],
+            'trades': row['total_trades'],
+            'win_rate': row['win_rate'],
+            'max_drawdown': row['max_drawdown']
         })
         
-        if result['total_return'] > best_return and result['total_trades'] > 0:
-            best_return = result['total_return']
-            best_result = result
+        if row['total_return'] > best_return and row['total_trades'] > 0:
+            best_return = row['total_return']
+            best_result = {k: row[k] for k in ('total_return', 'final_equity', 'total_trades', 'win_rate', 'max_drawdown')}
             best_params = {
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'min_confidence': min_conf,
-                'position_size': pos_size,
-                'use_trend': use_trend
+                'stop_loss': row['stop_loss'],
+                'take_profit': row['take_profit'],
+                'min_confidence': row['min_confidence'],
+                'position_size': row['position_size'],
+                'use_trend': row['use_trend']
             }
-            # Yeni en iyi bulunduğunda hemen göster
-            print(f"  ⭐ YENİ EN İYİ! Getiri: {best_return:+.2%} | "
-                  f"SL: {stop_loss:.1%} | TP: {take_profit:.1%} | "
-                  f"Conf: {min_conf:.0%} | Size: {pos_size:.0%} | "
-                  f"Trend: {use_trend} | İşlem: {result['total_trades']}")
+            # Yeni en iyi bulunduğunda olay kaydı (BACKTEST_EVENTS ile açılır)
+            if events.wants(INFO):
+                events.emit(INFO, "new_best", symbol=symbol, total_return=best_return,
+                            trades=row['total_trades'], **best_params)
     
+    events.flush()
+
     # Toplam süre
     total_time = (datetime.now() - start_time).total_seconds()
     print(f"\n{'='*100}")
@@ -279,6 +137,26 @@ def optimize_parameters(symbol: str, df: pd.DataFrame):
     return best_params, best_result
 
 
+def walk_forward_report(symbol: str, df: pd.DataFrame, train_bars: int = 90, test_bars: int = 30,
+                        workers: int = None):
+    """Walk-forward: her eğitim penceresinde optimize et, sonraki test penceresinde işlem yap"""
+    wf = walk_forward(df, symbol, PARAM_GRID, train_bars, test_bars, workers=workers)
+
+    print(f"\n{'='*100}")
+    print(f"WALK-FORWARD (örneklem dışı): {symbol} | Eğitim: {train_bars} bar | Test: {test_bars} bar")
+    print(f"{'='*100}")
+    for i, fold in enumerate(wf.folds, 1):
+        params = fold['params']
+        desc = (f"SL: {params['stop_loss']:.1%} | TP: {params['take_profit']:.1%} | "
+                f"Conf: {params['min_confidence']:.0%} | Size: {params['position_size']:.0%} | "
+                f"Trend: {params['use_trend']}") if params else "işlem yok (nakitte)"
+        print(f"{i}. {fold['test_start']:%Y-%m-%d} - {fold['test_end']:%Y-%m-%d} | "
+              f"Eğitim: {fold['in_sample_return']:+.2%} | Test: {fold['out_of_sample_return']:+.2%} | {desc}")
+    print(f"\nÖrneklem dışı getiri: {wf.total_return:+.2%} | İşlem: {wf.total_trades} | "
+          f"Kazanma Oranı: {wf.win_rate:.1%} | Max Drawdown: {wf.max_drawdown:.2%}")
+    return wf
+
+
 def main():
     """Ana optimizasyon fonksiyonu"""
     
@@ -308,6 +186,8 @@ def main():
         print(f"Toplam Gün: {len(df)}")
         
         best_params, best_result = optimize_parameters(symbol, df)
+        # Tüm geçmişte optimize edilen getiri örneklem içidir; dürüst karşılaştırma için walk-forward
+        walk_forward_report(symbol, df)
         
         if best_params:
             all_best_params[symbol] = best_params
@@ -2,7 +2,7 @@
 AAPL için detaylı analiz - neden sadece 4 işlem?
 """
 import pandas as pd
-from bot.data.yahoo import fetch_candles
+from bot.data.store import fetch_candles
 from bot.strategy.bot_hunter import compute_bot_hunter_signals
 
 # AAPL verisi çek
@@ -0,0 +1,165 @@
+"""
+Benchmark cases and the synthetic candles they run on (bot.data.synthetic,
+ending at its REFERENCE date so the data never depends on the clock).
+
+Every case is a (prepare, run) pair: `prepare(df)` builds whatever the run
+needs outside the timed region (fresh database, cleared caches, a test
+client) and `run(ctx)` is the part that is timed. Cases whose cost grows
+faster than the bar count, such as the per-bar chart endpoint or the loop
+backtest engine, carry a `max_bars` cap and are skipped on larger inputs.
+"""
+import contextlib
+import importlib
+import inspect
+import io
+import os
+import pkgutil
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from bot.data.synthetic import REFERENCE, generate_candles
+
+BENCH_SYMBOL = "BTC-USD"  # crypto: pivot levels come from the frame, never from yfinance
+
+
+def synthetic_candles(n: int, seed: int = 0, interval: str = "5m") -> pd.DataFrame:
+    return generate_candles(BENCH_SYMBOL, interval, n, end=REFERENCE, seed=seed)
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Any], Any]
+    prepare: Optional[Callable[[pd.DataFrame], Any]] = None
+    max_bars: Optional[int] = None
+
+
+def _quiet(fn: Callable) -> Callable:
+    """Drop the progress prints some of the timed code paths still make."""
+    def wrapper(*args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# Required arguments of signal functions that have no default
+_SIGNAL_ARGS: Dict[str, Dict[str, Any]] = {
+    "compute_sma_signals": {"fast": 20, "slow": 50},
+}
+
+# Signal functions that refit a model on every call; their cost is dominated by training
+_SIGNAL_MAX_BARS: Dict[str, int] = {
+    "compute_ml_signals": 100_000,
+    "compute_ml_signals_cached": 100_000,
+    "compute_ml_signals_batch": 100_000,
+}
+
+
+def _reset_signal_caches(df: pd.DataFrame) -> pd.DataFrame:
+    from bot.strategy import ml_strategy, tradingview_pivots
+    tradingview_pivots._daily_ohlc_cache.clear()
+    ml_strategy._default_manager = None
+    return df
+
+
+def signal_cases() -> List[Case]:
+    """One case per public compute_*_signals[_batch] function in bot.strategy."""
+    import bot.strategy
+    cases = []
+    for info in sorted(pkgutil.iter_modules(bot.strategy.__path__), key=lambda m: m.name):
+        module = importlib.import_module(f"bot.strategy.{info.name}")
+        for name, fn in inspect.getmembers(module, inspect.isfunction):
+            if fn.__module__ != module.__name__ or not re.fullmatch(r"compute_\w+_signals(_batch|_cached)?", name):
+                continue
+            kwargs = dict(_SIGNAL_ARGS.get(name, {}))
+            if "symbol" in inspect.signature(fn).parameters:
+                kwargs["symbol"] = BENCH_SYMBOL
+            cases.append(Case(
+                name=f"signals.{info.name}.{name}",
+                run=lambda df, fn=fn, kwargs=kwargs: fn(df, **kwargs),
+                prepare=_reset_signal_caches,
+                max_bars=_SIGNAL_MAX_BARS.get(name),
+            ))
+    return cases
+
+
+def _simple_backtest(engine: str) -> Callable[[pd.DataFrame], Any]:
+    from bot.backtest.events import NULL_SINK
+    from bot.backtest.simple_backtester import SimpleBacktester
+
+    def run(df):
+        return SimpleBacktester(symbol=BENCH_SYMBOL, engine=engine, events=NULL_SINK).run_backtest(df, BENCH_SYMBOL)
+    return run
+
+
+def _backtest(df: pd.DataFrame):
+    from bot.backtest.backtester import Backtester
+    from bot.backtest.events import NULL_SINK
+    return Backtester(events=NULL_SINK).run_backtest(df)
+
+
+def backtest_cases() -> List[Case]:
+    return [
+        Case("backtest.simple.vectorized", _simple_backtest("vectorized"), _reset_signal_caches),
+        Case("backtest.simple.intrabar", _simple_backtest("intrabar"), _reset_signal_caches, max_bars=100_000),
+        Case("backtest.simple.loop", _simple_backtest("loop"), _reset_signal_caches, max_bars=10_000),
+        Case("backtest.backtester", _backtest),
+    ]
+
+
+def _fresh_database(df: pd.DataFrame):
+    from bot.storage.db import Database
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    os.unlink(path)
+    return Database(path), path, df
+
+
+def _insert_candles(ctx) -> None:
+    db, path, df = ctx
+    try:
+        db.insert_candles(BENCH_SYMBOL, "5m", df)
+    finally:
+        db.conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path + suffix)
+
+
+def _chart_client(df: pd.DataFrame):
+    from bot import web_ui
+    web_ui.current_data = df
+    web_ui.current_symbol = BENCH_SYMBOL
+    return web_ui.app.test_client()
+
+
+def _get_chart(client) -> None:
+    response = client.get("/api/chart")
+    if response.status_code != 200:
+        raise RuntimeError(f"/api/chart returned {response.status_code}")
+
+
+def _resample(interval: str) -> Callable[[pd.DataFrame], Any]:
+    from bot.data.resample import resample
+    return lambda df: resample(df, interval)
+
+
+def data_cases() -> List[Case]:
+    return [Case(f"data.resample.{iv}", _resample(iv)) for iv in ("15m", "1h", "1d")]
+
+
+def storage_cases() -> List[Case]:
+    return [Case("storage.insert_candles", _insert_candles, _fresh_database)]
+
+
+def web_cases() -> List[Case]:
+    # The chart recomputes the EMA/RSI/ATR signal on every prefix of the frame
+    return [Case("web.api_chart", _quiet(_get_chart), _quiet(_chart_client), max_bars=1_000)]
+
+
+def all_cases() -> List[Case]:
+    return signal_cases() + backtest_cases() + data_cases() + storage_cases() + web_cases()
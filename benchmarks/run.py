@@ -0,0 +1,160 @@
+"""
+Offline benchmark runner.
+
+    python -m benchmarks.run                          # 1k/10k/100k/1M bars, all cases
+    python -m benchmarks.run --sizes 1k,10k --only signals.
+    python -m benchmarks.run --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Each case runs on the same seeded synthetic candles, untimed preparation
+first, and is repeated until `--min-time` has elapsed (at most `--repeat`
+times). The median and minimum wall time go to a JSON report. With a
+baseline, a case whose median is more than `--tolerance` slower (and at
+least `--noise-floor` seconds slower) is a regression and the exit code
+is 1. Baselines are per machine; record one before comparing.
+"""
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Never touch the network, the user's candle cache or event files
+os.environ["DATA_OFFLINE"] = "1"
+os.environ["DATA_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_cache_")
+atexit.register(shutil.rmtree, os.environ["DATA_CACHE_DIR"], ignore_errors=True)
+os.environ["BACKTEST_EVENTS"] = ""
+os.environ["RESULT_CACHE_MB"] = "0"
+
+import numpy as np
+import pandas as pd
+import typer
+
+from benchmarks.cases import Case, all_cases, synthetic_candles
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+app = typer.Typer(help="Offline speed benchmarks")
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    if text and text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def time_case(case: Case, df: pd.DataFrame, repeat: int, min_time: float) -> Dict:
+    times: List[float] = []
+    while len(times) < repeat and (not times or sum(times) < min_time):
+        ctx = case.prepare(df) if case.prepare else df
+        t0 = time.perf_counter()
+        case.run(ctx)
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {
+        "bars": len(df),
+        "runs": len(times),
+        "median": median,
+        "min": min(times),
+        "bars_per_sec": len(df) / median if median > 0 else None,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float,
+            noise_floor: float) -> List[Dict]:
+    """Per shared key: ratio of current to baseline median and whether it counts as a regression."""
+    rows = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base or "median" not in current or "median" not in base:
+            continue
+        ratio = current["median"] / base["median"] if base["median"] > 0 else float("inf")
+        slower = current["median"] - base["median"]
+        rows.append({
+            "key": key,
+            "baseline": base["median"],
+            "current": current["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance and slower > noise_floor,
+        })
+    return rows
+
+
+def _environment() -> Dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+@app.command()
+def main(
+    sizes: str = typer.Option("1k,10k,100k,1m", help="Comma-separated bar counts (k/m suffixes allowed)"),
+    only: str = typer.Option("", help="Run only cases whose name starts with one of these comma-separated prefixes"),
+    repeat: int = typer.Option(5, help="Maximum timed runs per case and size"),
+    min_time: float = typer.Option(0.5, help="Stop repeating once this many seconds were spent on a case"),
+    seed: int = typer.Option(0, help="Seed of the synthetic candles"),
+    out: Optional[str] = typer.Option(None, help="Write the JSON report here (default: stdout)"),
+    baseline: Optional[str] = typer.Option(None, help="Baseline report to compare against"),
+    save_baseline: bool = typer.Option(False, help=f"Also write the report to {DEFAULT_BASELINE.name}"),
+    tolerance: float = typer.Option(0.25, help="Allowed relative slowdown before a case counts as a regression"),
+    noise_floor: float = typer.Option(0.005, help="Ignore slowdowns smaller than this many seconds"),
+):
+    """Time strategies, backtesters, storage and the chart endpoint on synthetic candles."""
+    prefixes = tuple(p.strip() for p in only.split(",") if p.strip())
+    cases = [c for c in all_cases() if not prefixes or c.name.startswith(prefixes)]
+    results: Dict[str, Dict] = {}
+
+    for n in sorted(parse_size(s) for s in sizes.split(",") if s.strip()):
+        df = synthetic_candles(n, seed=seed)
+        for case in cases:
+            key = f"{case.name}@{n}"
+            if case.max_bars is not None and n > case.max_bars:
+                results[key] = {"bars": n, "skipped": f"over max_bars={case.max_bars}"}
+                continue
+            try:
+                results[key] = time_case(case, df, repeat, min_time)
+            except Exception as e:
+                results[key] = {"bars": n, "error": f"{type(e).__name__}: {e}"}
+            row = results[key]
+            status = f"{row['median'] * 1e3:10.1f} ms" if "median" in row else row.get("skipped") or row["error"]
+            print(f"{key:70s} {status}", file=sys.stderr)
+
+    report = {"environment": _environment(), "seed": seed, "results": results}
+
+    exit_code = 0
+    baseline_path = Path(baseline) if baseline else None
+    if baseline_path is not None:
+        rows = compare(results, json.loads(baseline_path.read_text())["results"], tolerance, noise_floor)
+        report["comparison"] = rows
+        for row in rows:
+            if row["regression"]:
+                exit_code = 1
+                print(f"REGRESSION {row['key']}: {row['baseline'] * 1e3:.1f} ms -> {row['current'] * 1e3:.1f} ms "
+                      f"(x{row['ratio']:.2f})", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if out:
+        Path(out).write_text(text)
+    else:
+        print(text)
+    if save_baseline:
+        DEFAULT_BASELINE.write_text(text)
+    raise typer.Exit(exit_code)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,8 +1,10 @@
 import pandas as pd
-import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from ..strategy.simple_signals import compute_simple_signals, compute_alternating_signals
+from ..data.candles import Candles, as_candles
+from .events import DEBUG, INFO, WARNING, EventSink, default_sink
+from .metrics import compute_metrics, infer_interval_seconds, periods_per_year
+from ..strategy.simple_signals import SimpleSignal, compute_simple_signals_batch, compute_alternating_signals_batch
 
 
 @dataclass
@@ -23,11 +25,13 @@ class BacktestResult:
 
 
 class Backtester:
-    def __init__(self, initial_capital: float = 10000, commission: float = 0.001):
+    def __init__(self, initial_capital: float = 10000, commission: float = 0.001,
+                 events: Optional[EventSink] = None):
         self.initial_capital = initial_capital
         self.commission = commission  # 0.1% commission per trade
+        self.events = events if events is not None else default_sink()
         
-    def run_backtest(self, df: pd.DataFrame, strategy_params: Dict = None) -> BacktestResult:
+    def run_backtest(self, df: Union[pd.DataFrame, Candles], strategy_params: Dict = None) -> BacktestResult:
         """
         Run backtest on historical data
         """
@@ -50,48 +54,40 @@ class Backtester:
         
         # Track performance metrics
         trade_returns = []
-        peak_equity = self.initial_capital
-        max_dd = 0
         
-        print(f"Starting backtest with ${self.initial_capital:,.2f} initial capital")
-        print(f"Data period: {df.index[0]} to {df.index[-1]}")
-        print(f"Total bars: {len(df)}")
+        candles = as_candles(df)
+        close = candles.close
+        index = candles.index
         
-        for i in range(50, len(df)):  # Start from index 50 to ensure enough data
+        events = self.events
+        if events.wants(INFO):
+            events.emit(INFO, "start", initial_capital=self.initial_capital,
+                        first_bar=index[0], last_bar=index[-1], bars=len(candles))
+        
+        # Signals for every prefix in one pass; bar i equals the call on df.iloc[:i+1]
+        simple = compute_simple_signals_batch(candles)
+        alternating = compute_alternating_signals_batch(candles)
+        
+        for i in range(50, len(candles)):  # Start from index 50 to ensure enough data
             try:
-                # Get current price and historical data for signal calculation
-                current_price = float(df.iloc[i]["close"].iloc[0])
-                signal_data = df.iloc[:i+1].copy()
-                
-                # Calculate signal using ultra-simple strategy
-                signal = compute_simple_signals(signal_data)
+                current_price = float(close[i])
                 
-                # If no signal, try alternating strategy
-                if signal.side == "hold":
-                    signal = compute_alternating_signals(signal_data)
+                # Ultra-simple strategy; if no signal, fall back to the alternating strategy
+                signal = simple if simple.side[i] != "hold" else alternating
+                signal = SimpleSignal(side=signal.side[i], confidence=float(signal.confidence[i]))
                 
                 # Remove confidence threshold for now - let all signals through
                 # if hasattr(signal, 'confidence') and signal.confidence < strategy_params['min_confidence']:
                 #     signal.side = "hold"
                 
-                # Debug: Print signal info
-                if i % 20 == 0:  # Print every 20 iterations
-                    print(f"Index {i}: Signal={signal.side}, Confidence={signal.confidence:.3f}, Price=${current_price:.2f}")
-                
-                # Print all non-hold signals
-                if signal.side != "hold":
-                    print(f"TRADE SIGNAL at {i}: {signal.side.upper()} at ${current_price:.2f} (Conf: {signal.confidence:.3f})")
+                if events.wants(DEBUG) and (i % 20 == 0 or signal.side != "hold"):
+                    events.emit(DEBUG, "signal", bar=i, side=signal.side, confidence=signal.confidence,
+                                price=current_price)
                 
                 # Calculate current equity
                 current_equity = cash + (position * current_price)
                 equity_curve.append(current_equity)
                 
-                # Update peak and drawdown
-                if current_equity > peak_equity:
-                    peak_equity = current_equity
-                current_dd = (peak_equity - current_equity) / peak_equity
-                max_dd = max(max_dd, current_dd)
-                
                 # Execute trades based on signal
                 if signal.side == "buy" and position <= 0:
                     # Simple position sizing - use 50% of available cash for more trades
@@ -107,14 +103,16 @@ class Backtester:
                         
                         trades.append({
                             'type': 'BUY',
-                            'date': df.index[i],
+                            'date': index[i],
                             'price': current_price,
                             'quantity': position_size,
                             'value': cost,
                             'confidence': signal.confidence
                         })
                         
-                        print(f"BUY: {position_size:.2f} shares at ${current_price:.2f} (Conf: {signal.confidence:.2f})")
+                        if events.wants(INFO):
+                            events.emit(INFO, "buy", bar=i, quantity=position_size, price=current_price,
+                                        confidence=signal.confidence)
                 
                 elif signal.side == "sell" and position > 0:
                     # Execute sell
@@ -126,15 +124,13 @@ class Backtester:
                     if avg_entry_price > 0:
                         trade_return = (current_price - avg_entry_price) / avg_entry_price
                         trade_returns.append(trade_return)
-                        
-                        if trade_return > 0:
-                            print(f"SELL: {sell_quantity:.2f} shares at ${current_price:.2f} (Return: {trade_return:.2%})")
-                        else:
-                            print(f"SELL: {sell_quantity:.2f} shares at ${current_price:.2f} (Loss: {trade_return:.2%})")
+                        if events.wants(INFO):
+                            events.emit(INFO, "sell", bar=i, quantity=sell_quantity, price=current_price,
+                                        trade_return=trade_return)
                     
                     trades.append({
                         'type': 'SELL',
-                        'date': df.index[i],
+                        'date': index[i],
                         'price': current_price,
                         'quantity': sell_quantity,
                         'value': proceeds,
@@ -156,14 +152,16 @@ class Backtester:
                         
                         trades.append({
                             'type': 'STOP_LOSS',
-                            'date': df.index[i],
+                            'date': index[i],
                             'price': current_price,
                             'quantity': position,
                             'value': proceeds,
                             'return': pnl_pct
                         })
                         
-                        print(f"STOP-LOSS: Sold {position:.2f} shares at ${current_price:.2f} (Loss: {pnl_pct:.2%})")
+                        if events.wants(INFO):
+                            events.emit(INFO, "stop_loss", bar=i, quantity=position, price=current_price,
+                                        trade_return=pnl_pct)
                         position = 0
                         avg_entry_price = 0
                         
@@ -174,72 +172,45 @@ class Backtester:
                         
                         trades.append({
                             'type': 'TAKE_PROFIT',
-                            'date': df.index[i],
+                            'date': index[i],
                             'price': current_price,
                             'quantity': position,
                             'value': proceeds,
                             'return': pnl_pct
                         })
                         
-                        print(f"TAKE-PROFIT: Sold {position:.2f} shares at ${current_price:.2f} (Gain: {pnl_pct:.2%})")
+                        if events.wants(INFO):
+                            events.emit(INFO, "take_profit", bar=i, quantity=position, price=current_price,
+                                        trade_return=pnl_pct)
                         position = 0
                         avg_entry_price = 0
                             
             except Exception as e:
-                print(f"Error at index {i}: {e}")
+                if events.wants(WARNING):
+                    events.emit(WARNING, "error", bar=i, error=str(e))
                 continue
         
         # Close any remaining position
         if position > 0:
-            final_price = float(df.iloc[-1]["close"])
+            final_price = float(close[-1])
             proceeds = position * final_price * (1 - self.commission)
             cash += proceeds
             if avg_entry_price > 0:
                 trade_return = (final_price - avg_entry_price) / avg_entry_price
                 trade_returns.append(trade_return)
         
-        # Calculate final metrics
+        # Trade statistics are per-trade returns; drawdown is reported as a positive fraction here
+        seconds = infer_interval_seconds(index) if isinstance(index, pd.DatetimeIndex) else None
+        m = compute_metrics(equity_curve, trade_returns, periods_per_year("1d", seconds=seconds), final_equity=cash)
         final_equity = cash
-        total_return = (final_equity - self.initial_capital) / self.initial_capital
-        
-        # Calculate annual return (assuming daily data)
-        days = len(df)
-        years = days / 365
-        annual_return = (final_equity / self.initial_capital) ** (1 / years) - 1 if years > 0 else 0
-        
-        # Calculate Sharpe ratio
-        if trade_returns:
-            returns_std = np.std(trade_returns)
-            sharpe_ratio = np.mean(trade_returns) / returns_std * np.sqrt(252) if returns_std > 0 else 0
-        else:
-            sharpe_ratio = 0
-        
-        # Calculate win rate
-        winning_trades = [r for r in trade_returns if r > 0]
-        losing_trades = [r for r in trade_returns if r < 0]
-        win_rate = len(winning_trades) / len(trade_returns) if trade_returns else 0
-        
-        # Calculate profit factor
-        total_wins = sum(winning_trades) if winning_trades else 0
-        total_losses = abs(sum(losing_trades)) if losing_trades else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else float('inf') if total_wins > 0 else 0
-        
-        # Calculate average win/loss
-        avg_win = np.mean(winning_trades) if winning_trades else 0
-        avg_loss = np.mean(losing_trades) if losing_trades else 0
+        total_return, annual_return, sharpe_ratio = m.total_return, m.annual_return, m.sharpe_ratio
+        max_dd = -m.max_drawdown
+        win_rate, profit_factor, avg_win, avg_loss = m.win_rate, m.profit_factor, m.avg_win, m.avg_loss
         
-        print(f"\n=== BACKTEST RESULTS ===")
-        print(f"Initial Capital: ${self.initial_capital:,.2f}")
-        print(f"Final Equity: ${final_equity:,.2f}")
-        print(f"Total Return: {total_return:.2%}")
-        print(f"Annual Return: {annual_return:.2%}")
-        print(f"Sharpe Ratio: {sharpe_ratio:.2f}")
-        print(f"Max Drawdown: {max_dd:.2%}")
-        print(f"Total Trades: {len(trade_returns)}")
-        print(f"Win Rate: {win_rate:.2%}")
-        print(f"Profit Factor: {profit_factor:.2f}")
-        print(f"Average Win: {avg_win:.2%}")
-        print(f"Average Loss: {avg_loss:.2%}")
+        events.summary(initial_capital=self.initial_capital, final_equity=final_equity,
+                       total_return=total_return, annual_return=annual_return, sharpe_ratio=sharpe_ratio,
+                       max_drawdown=max_dd, total_trades=m.total_trades, win_rate=win_rate,
+                       profit_factor=profit_factor, avg_win=avg_win, avg_loss=avg_loss)
         
         return BacktestResult(
             total_return=total_return,
@@ -247,9 +218,9 @@ class Backtester:
             sharpe_ratio=sharpe_ratio,
             max_drawdown=max_dd,
             win_rate=win_rate,
-            total_trades=len(trade_returns),
-            profitable_trades=len(winning_trades),
-            losing_trades=len(losing_trades),
+            total_trades=m.total_trades,
+            profitable_trades=m.profitable_trades,
+            losing_trades=m.losing_trades,
             avg_win=avg_win,
             avg_loss=avg_loss,
             profit_factor=profit_factor,
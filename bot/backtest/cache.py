@@ -0,0 +1,136 @@
+"""
+Persistent backtest result cache.
+
+Results are pickled under `<DATA_CACHE_DIR>/results`, one file per key. The
+key hashes the candle data (optimizer.frame_fingerprint), the strategy name,
+the parameter dict and ENGINE_VERSION, so a repeat run over unchanged candles
+is a file read, and a symbol whose candles moved on, or a changed parameter,
+misses and is recomputed. Reads refresh a file's mtime; when the directory
+grows past RESULT_CACHE_MB the least recently used files are deleted.
+RESULT_CACHE_MB=0 turns the cache off.
+
+Parameters must be JSON-like (numbers, strings, lists, dicts, dataclasses);
+anything else, e.g. a sizing callable, makes the run uncacheable and it is
+simply executed.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ..config import settings
+from .optimizer import frame_fingerprint
+
+# Bump whenever a change to the engines or backtesters alters their results
+ENGINE_VERSION = "8"
+
+T = TypeVar("T")
+
+
+def _encode(value):
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__name__, **dataclasses.asdict(value)}
+    raise TypeError(f"Uncacheable parameter: {value!r}")
+
+
+class ResultCache:
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root or os.path.join(settings.data_cache_dir, "results"))
+        self.max_bytes = settings.result_cache_mb * 1024 * 1024 if max_bytes is None else max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, data, strategy: str, params: Dict[str, Any], version: str = ENGINE_VERSION) -> Optional[str]:
+        """Cache key, or None when the parameters cannot be hashed stably."""
+        try:
+            encoded = json.dumps(params, sort_keys=True, default=_encode)
+        except TypeError:
+            return None
+        h = hashlib.sha1()
+        for part in (frame_fingerprint(data), strategy, encoded, version):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            # Truncated, corrupt, or pickled from a class layout that no longer exists
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            return None
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.root.glob("*.pkl"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def get_or_run(self, data, strategy: str, params: Dict[str, Any], run: Callable[[], T]) -> T:
+        """Cached result for (data, strategy, params), computing and storing it with `run()` on a miss."""
+        key = self.key(data, strategy, params) if self.enabled else None
+        if key is None:
+            return run()
+        result = self.get(key)
+        if result is None:
+            result = run()
+            self.put(key, result)
+        return result
+
+    def run_engine(self, engine, df, symbol: str = ""):
+        """BacktestEngine.run through the cache, keyed by the engine's settings."""
+        params = dict(vars(engine), symbol=symbol, engine=type(engine).__name__)
+        return self.get_or_run(df, engine.strategy, params, lambda: engine.run(df, symbol))
+
+    def clear(self) -> None:
+        for path in self.root.glob("*.pkl"):
+            path.unlink()
+
+
+_default: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    global _default
+    if _default is None:
+        _default = ResultCache()
+    return _default
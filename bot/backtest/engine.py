@@ -0,0 +1,336 @@
+"""
+Single-position backtest engine shared by the research scripts.
+
+Signals come from a registry of named strategies, each backed by a
+`compute_*_signals_batch` function, so the whole history is scored in one
+vectorized pass. The engine then walks the bars once over plain floats with
+the rules every script used: PaperExchange fills at the close, exit rules
+checked first (a triggered exit skips the signal on that bar), entries gated
+by confidence and an optional EMA50/EMA200 trend filter, and the open
+position liquidated on the last close.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.candles import Candles, as_frame
+from ..strategy.bot_hunter import compute_bot_hunter_signals_batch
+from ..strategy.ema_rsi_atr import compute_ema_rsi_atr_signals_batch
+from ..strategy.ml_scalping_strategy import compute_ml_scalping_signals_batch
+from ..strategy.ml_strategy import compute_ml_signals_batch
+from ..strategy.momentum_strategy import compute_momentum_signals_batch
+from ..strategy.price_action import (
+    compute_price_action_signals_batch, compute_simple_trend_signals_batch,
+    compute_volatility_breakout_signals_batch,
+)
+from ..strategy.series import SignalSeries
+from ..strategy.simple_reversal import compute_mean_reversion_signals_batch
+from ..strategy.simple_signals import compute_alternating_signals_batch, compute_simple_signals_batch
+from ..strategy.vwap_strategy import compute_vwap_signals_batch
+from .metrics import max_drawdown
+
+SignalFn = Callable[[pd.DataFrame, str], SignalSeries]
+
+# name -> fn(df, symbol) returning the signal for every bar. Pivot levels are not
+# here: their exits are per-position R1-R3 targets (with a partial at R1), which
+# the batch signals cannot carry; SimpleBacktester is the engine for them.
+STRATEGIES: Dict[str, SignalFn] = {
+    "bot_hunter": lambda df, symbol: compute_bot_hunter_signals_batch(df, symbol=symbol),
+    "ema_rsi_atr": lambda df, symbol: compute_ema_rsi_atr_signals_batch(df),
+    "momentum": lambda df, symbol: compute_momentum_signals_batch(df),
+    "vwap": lambda df, symbol: compute_vwap_signals_batch(df),
+    "ml_scalping": lambda df, symbol: compute_ml_scalping_signals_batch(df),
+    "ml": lambda df, symbol: compute_ml_signals_batch(df, symbol=symbol),
+    "mean_reversion": lambda df, symbol: compute_mean_reversion_signals_batch(df),
+    "price_action": lambda df, symbol: compute_price_action_signals_batch(df),
+    "volatility_breakout": lambda df, symbol: compute_volatility_breakout_signals_batch(df),
+    "simple_trend": lambda df, symbol: compute_simple_trend_signals_batch(df),
+    "simple": lambda df, symbol: compute_simple_signals_batch(df),
+    "alternating": lambda df, symbol: compute_alternating_signals_batch(df),
+}
+
+
+def register_strategy(name: str, fn: SignalFn) -> None:
+    """Make `fn(df, symbol) -> SignalSeries` available to the engine as `name`."""
+    STRATEGIES[name] = fn
+
+
+def per_bar_strategy(fn: Callable) -> SignalFn:
+    """
+    Adapt a per-bar `compute_*_signals(df)` with no batch version. Calls fn on
+    every prefix, so it is O(n^2); prefer writing a batch function.
+    """
+    def batch(df: pd.DataFrame, symbol: str) -> SignalSeries:
+        out = SignalSeries.hold(len(df))
+        for i in range(len(df)):
+            sig = fn(df.iloc[:i + 1])
+            out.side[i] = sig.side
+            out.confidence[i] = getattr(sig, "confidence", 0.0)
+            out.reason[i] = getattr(sig, "reason", "")
+        return out
+    return batch
+
+
+_SIDE_CODES = {"buy": 1, "sell": -1, "hold": 0}
+
+
+@dataclass
+class SignalStream:
+    close: np.ndarray       # close price per bar
+    side: np.ndarray        # 1 buy, -1 sell, 0 hold
+    confidence: np.ndarray
+    is_uptrend: np.ndarray  # EMA50 > EMA200
+    start: int              # first bar the backtest trades on
+    reason: Optional[np.ndarray] = None
+
+
+def build_stream(df: Union[pd.DataFrame, Candles], symbol: str = "", strategy: str = "bot_hunter",
+                 start: int = 200) -> SignalStream:
+    """Score every bar of df with a registered strategy."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    df = as_frame(df)
+    close = df['close'].astype(float)
+    ema_50 = close.ewm(span=50).mean()
+    ema_200 = close.ewm(span=200).mean()
+
+    signals = STRATEGIES[strategy](df, symbol)
+    return SignalStream(
+        close=close.to_numpy(),
+        side=np.array([_SIDE_CODES.get(s, 0) for s in signals.side], dtype=np.int8),
+        confidence=signals.confidence,
+        is_uptrend=(ema_50 > ema_200).to_numpy(),
+        start=start,
+        reason=signals.reason,
+    )
+
+
+class ExitRule(ABC):
+    """Closes the whole position when `triggered` returns True for the bar."""
+    kind = "EXIT"
+    label = "Exit"
+
+    @abstractmethod
+    def triggered(self, pnl_pct: float, price: float, peak: float, bars_held: int) -> bool:
+        """Whether the open position exits on this bar."""
+
+
+@dataclass
+class StopLoss(ExitRule):
+    pct: float
+    kind = "STOP_LOSS"
+    label = "Stop-loss"
+
+    def triggered(self, pnl_pct, price, peak, bars_held):
+        return pnl_pct <= -self.pct
+
+
+@dataclass
+class TakeProfit(ExitRule):
+    pct: float
+    kind = "TAKE_PROFIT"
+    label = "Take-profit"
+
+    def triggered(self, pnl_pct, price, peak, bars_held):
+        return pnl_pct >= self.pct
+
+
+@dataclass
+class TrailingStop(ExitRule):
+    pct: float  # give-back from the highest close since entry
+    kind = "TRAILING_STOP"
+    label = "Trailing stop"
+
+    def triggered(self, pnl_pct, price, peak, bars_held):
+        return price <= peak * (1 - self.pct)
+
+
+@dataclass
+class TimeStop(ExitRule):
+    bars: int  # bars held after the entry bar
+    kind = "TIME_STOP"
+    label = "Time stop"
+
+    def triggered(self, pnl_pct, price, peak, bars_held):
+        return bars_held >= self.bars
+
+
+@dataclass
+class EngineResult:
+    total_return: float
+    final_equity: float
+    total_trades: int  # closed trades, final liquidation excluded
+    win_rate: float
+    max_drawdown: float
+    trades: List[Dict] = field(default_factory=list)
+    equity_curve: List[float] = field(default_factory=list)
+
+
+class BacktestEngine:
+    """
+    position_size is the fraction of cash committed per entry, or a callable
+    mapping the signal confidence to that fraction. commission only gates
+    whether an entry is affordable; PaperExchange itself charges none.
+    trend_exit restricts signal sells to bars outside the uptrend.
+    Exit rules: StopLoss and TakeProfit are checked first, then any other
+    rules in the order given; the first one that fires closes the position.
+    """
+
+    def __init__(self, strategy: str = "bot_hunter", exits: Sequence[ExitRule] = (),
+                 min_confidence: float = 0.0, position_size: Union[float, Callable[[float], float]] = 0.5,
+                 trend_filter: bool = False, trend_exit: bool = False, start: int = 200,
+                 initial_capital: float = 10000.0, commission: float = 0.001):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.exits = tuple(exits)
+        self.min_confidence = min_confidence
+        self.position_size = position_size
+        self.trend_filter = trend_filter
+        self.trend_exit = trend_exit
+        self.start = start
+        self.initial_capital = initial_capital
+        self.commission = commission
+
+    def run(self, df: Union[pd.DataFrame, Candles], symbol: str = "") -> EngineResult:
+        stream = build_stream(df, symbol, self.strategy, self.start)
+        return self.run_stream(stream, index=df.index)
+
+    def run_stream(self, stream: SignalStream, index: Optional[pd.Index] = None,
+                   record_trades: bool = True) -> EngineResult:
+        close = stream.close.tolist()
+        side = stream.side.tolist()
+        confidence = stream.confidence.tolist()
+        is_uptrend = stream.is_uptrend.tolist()
+        reason = stream.reason
+        stamps = index if index is not None else range(len(close))
+        # Stop-loss / take-profit reduce to two threshold compares on the hot path
+        stops = [r for r in self.exits if type(r) is StopLoss]
+        profits = [r for r in self.exits if type(r) is TakeProfit]
+        others = [r for r in self.exits if type(r) not in (StopLoss, TakeProfit)]
+        stop_rule = min(stops, key=lambda r: r.pct) if stops else None
+        profit_rule = min(profits, key=lambda r: r.pct) if profits else None
+        stop_level = -stop_rule.pct if stop_rule else float('-inf')
+        profit_level = profit_rule.pct if profit_rule else float('inf')
+        min_confidence = self.min_confidence
+        trend_filter = self.trend_filter
+        trend_exit = self.trend_exit
+        size = self.position_size
+        sizer = size if callable(size) else (lambda conf: size)
+        commission = self.commission
+
+        cash = float(self.initial_capital)
+        position = 0
+        avg_entry_price = None
+        entry_bar = 0
+        peak = 0.0
+        equity_curve = [self.initial_capital]
+        trades = []
+        trade_pnl = []
+
+        for i in range(stream.start, len(close)):
+            current_price = close[i]
+            equity_curve.append(cash + position * current_price)
+
+            if position > 0 and avg_entry_price:
+                if current_price > peak:
+                    peak = current_price
+                pnl_pct = (current_price - avg_entry_price) / avg_entry_price
+                rule = None
+                if pnl_pct <= stop_level:
+                    rule = stop_rule
+                elif pnl_pct >= profit_level:
+                    rule = profit_rule
+                else:
+                    for other in others:
+                        if other.triggered(pnl_pct, current_price, peak, i - entry_bar):
+                            rule = other
+                            break
+                if rule is not None:
+                    cash += position * current_price
+                    if record_trades:
+                        trades.append(_exit_trade(stamps[i], rule.kind, current_price, avg_entry_price, position,
+                                                  cash, f"{rule.label} triggered ({pnl_pct:.2%})", 1.0))
+                    trade_pnl.append(pnl_pct)
+                    position -= position
+                    avg_entry_price = None
+                    continue
+
+            if side[i] == 1 and position <= 0:
+                if confidence[i] > min_confidence:
+                    if trend_filter and not is_uptrend[i]:
+                        continue
+                    position_value = cash * sizer(confidence[i])
+                    qty = position_value / current_price
+                    if qty > 0 and cash >= position_value * (1 + commission):
+                        qty = int(qty * 10000) / 10000
+                        cash -= qty * current_price
+                        avg_entry_price = current_price
+                        position += qty
+                        entry_bar = i
+                        peak = current_price
+                        if record_trades:
+                            trades.append({
+                                'timestamp': stamps[i],
+                                'type': 'BUY',
+                                'side': 'BUY',
+                                'price': current_price,
+                                'entry_price': current_price,
+                                'quantity': qty,
+                                'pnl_pct': 0.0,
+                                'pnl_usd': 0.0,
+                                'equity': cash + position * current_price,
+                                'reason': reason[i] if reason is not None else "",
+                                'confidence': confidence[i],
+                            })
+            elif side[i] == -1 and position > 0:
+                if confidence[i] > min_confidence and not (trend_exit and is_uptrend[i]):
+                    entry_price = avg_entry_price if avg_entry_price else current_price
+                    cash += position * current_price
+                    if record_trades:
+                        trades.append(_exit_trade(stamps[i], 'SELL', current_price, entry_price, position, cash,
+                                                  reason[i] if reason is not None else "", confidence[i]))
+                    trade_pnl.append((current_price - entry_price) / entry_price)
+                    position -= position
+                    avg_entry_price = None
+
+        if position > 0:
+            final_price = close[-1]
+            entry_price = avg_entry_price if avg_entry_price else final_price
+            cash += position * final_price
+            if record_trades:
+                trades.append(_exit_trade(stamps[len(close) - 1], 'FINAL', final_price, entry_price, position, cash,
+                                          'Final liquidation', 0.0))
+
+        final_equity = cash
+        profitable = sum(1 for pnl in trade_pnl if pnl > 0)
+
+        return EngineResult(
+            total_return=(final_equity - self.initial_capital) / self.initial_capital,
+            final_equity=final_equity,
+            total_trades=len(trade_pnl),
+            win_rate=profitable / len(trade_pnl) if trade_pnl else 0,
+            max_drawdown=max_drawdown(equity_curve),
+            trades=trades,
+            equity_curve=equity_curve,
+        )
+
+
+def _exit_trade(stamp, kind: str, price: float, entry_price: float, qty: float, cash: float,
+                reason: str, confidence: float) -> Dict:
+    return {
+        'timestamp': stamp,
+        'type': kind,
+        'side': 'SELL',
+        'price': price,
+        'entry_price': entry_price,
+        'quantity': qty,
+        'pnl_pct': (price - entry_price) / entry_price,
+        'pnl_usd': (price - entry_price) * qty,
+        'equity': cash,
+        'reason': reason,
+        'confidence': confidence,
+    }
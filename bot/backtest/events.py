@@ -0,0 +1,100 @@
+"""
+Structured backtest events.
+
+Backtesters report signals, fills and the run summary through an EventSink
+instead of print(). The default NullSink drops everything and says it wants
+nothing, so call sites that guard with `sink.wants(level)` skip even the
+formatting and a silent run pays only an attribute check per event.
+
+JsonlSink buffers one JSON record per event and appends them to a file in
+batches; ConsoleSink prints one readable line per event for interactive
+runs. BACKTEST_EVENTS picks the default sink: empty (off), "console", or a
+path to a .jsonl file. LOG_LEVEL sets the threshold (DEBUG adds per-bar
+records, INFO is trades and summaries).
+"""
+import json
+import logging
+import time
+from typing import List, Optional
+
+from ..config import settings
+
+DEBUG, INFO, WARNING = logging.DEBUG, logging.INFO, logging.WARNING
+
+
+def _json_default(value):
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    return str(value)
+
+
+class EventSink:
+    def __init__(self, level: int = INFO) -> None:
+        self.level = level
+
+    def wants(self, level: int) -> bool:
+        return level >= self.level
+
+    def emit(self, level: int, event: str, **fields) -> None:
+        """Record one event; the base sink drops it, subclasses write it somewhere."""
+
+    def summary(self, event: str = "summary", **fields) -> None:
+        """Closing record of a run; flushes buffered records."""
+        if self.wants(INFO):
+            self.emit(INFO, event, **fields)
+        self.flush()
+
+    def flush(self) -> None:
+        pass
+
+
+class NullSink(EventSink):
+    def wants(self, level: int) -> bool:
+        return False
+
+
+class JsonlSink(EventSink):
+    def __init__(self, path: str, level: int = INFO, buffer_size: int = 1000) -> None:
+        super().__init__(level)
+        self.path = path
+        self.buffer_size = buffer_size
+        self._lines: List[str] = []
+
+    def emit(self, level: int, event: str, **fields) -> None:
+        if level < self.level:
+            return
+        record = {"ts": time.time(), "level": logging.getLevelName(level), "event": event}
+        record.update(fields)
+        self._lines.append(json.dumps(record, default=_json_default) + "\n")
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(self._lines))
+        self._lines = []
+
+
+class ConsoleSink(EventSink):
+    def emit(self, level: int, event: str, **fields) -> None:
+        if level < self.level:
+            return
+        parts = " ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in fields.items())
+        print(f"{event.upper()} {parts}")
+
+
+NULL_SINK = NullSink()
+
+
+def default_sink(target: Optional[str] = None) -> EventSink:
+    """Sink selected by `target` or BACKTEST_EVENTS, thresholded by LOG_LEVEL."""
+    target = settings.backtest_events if target is None else target
+    level = logging.getLevelName(settings.log_level.upper())
+    level = level if isinstance(level, int) else INFO
+    if not target:
+        return NULL_SINK
+    if target == "console":
+        return ConsoleSink(level)
+    return JsonlSink(target, level)
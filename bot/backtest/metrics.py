@@ -0,0 +1,213 @@
+"""
+Shared performance metrics.
+
+`compute_metrics` takes an equity curve (one value per bar) and the result
+of every closed trade as NumPy arrays and derives return, annualized return,
+Sharpe ratio, max drawdown, win rate, average win/loss and profit factor in
+vectorized passes. Trade results may be USD P&L or per-trade returns; the
+trade statistics are reported in the same unit.
+
+Annualization follows the bar interval instead of assuming 5m bars: crypto
+trades around the clock, stocks 252 sessions of 6.5 hours a year.
+
+`StreamingMetrics` keeps the same numbers for a live session in O(1) per
+bar and per trade (Welford mean/variance of bar returns, running peak and
+drawdown, trade sums), so a dashboard never recomputes history.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..data.store import INTERVAL_SECONDS
+from ..data.symbols import is_crypto
+
+TRADING_DAYS = 252
+STOCK_SESSION_SECONDS = 6.5 * 3600
+
+
+def infer_interval_seconds(index) -> Optional[float]:
+    """Median spacing of a DatetimeIndex (or epoch-second array) in seconds."""
+    if isinstance(index, pd.DatetimeIndex):
+        stamps = index.asi8 / 1e9
+    else:
+        stamps = np.asarray(index, dtype=float)
+    if len(stamps) < 2:
+        return None
+    step = float(np.median(np.diff(stamps)))
+    return step if step > 0 else None
+
+
+def periods_per_year(interval: Optional[str] = None, symbol: str = "", seconds: Optional[float] = None) -> float:
+    """Bars per year for `interval` (or a bar length in seconds) on the symbol's market."""
+    if seconds is None:
+        seconds = INTERVAL_SECONDS.get(interval or "1d", 86400)
+    if is_crypto(symbol) or seconds >= 7 * 86400:
+        return 365 * 86400 / seconds
+    if seconds >= 86400:
+        return TRADING_DAYS * 86400 / seconds
+    return TRADING_DAYS * max(STOCK_SESSION_SECONDS / seconds, 1.0)
+
+
+@dataclass
+class Metrics:
+    total_return: float
+    annual_return: float
+    sharpe_ratio: float
+    max_drawdown: float  # <= 0, fraction of the running peak
+    total_trades: int    # closed trades
+    profitable_trades: int
+    losing_trades: int
+    win_rate: float
+    avg_win: float
+    avg_loss: float
+    profit_factor: float
+
+
+def max_drawdown(equity: Sequence[float]) -> float:
+    equity = np.asarray(equity, dtype=float)
+    if len(equity) == 0:
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    return float(((equity - peak) / peak).min())
+
+
+def _profit_factor(gross_win: float, gross_loss: float) -> float:
+    if gross_loss > 0:
+        return gross_win / gross_loss
+    return float('inf') if gross_win > 0 else 0.0
+
+
+def _annualize(total_return: float, bars: int, periods: float) -> float:
+    if bars <= 0 or total_return <= -1:
+        return -1.0 if total_return <= -1 else 0.0
+    return (1 + total_return) ** (periods / bars) - 1
+
+
+def compute_metrics(equity: Sequence[float], trade_results: Sequence[float], periods: float,
+                    final_equity: Optional[float] = None) -> Metrics:
+    """
+    equity[0] is the starting equity and each later value one bar. `periods`
+    is bars per year (see periods_per_year). final_equity overrides the last
+    curve value for the return, e.g. after liquidation costs.
+    """
+    equity = np.asarray(equity, dtype=float)
+    trades = np.asarray(trade_results, dtype=float)
+    start = equity[0] if len(equity) else 0.0
+    end = final_equity if final_equity is not None else (equity[-1] if len(equity) else 0.0)
+    total_return = (end - start) / start if start else 0.0
+
+    sharpe = 0.0
+    if len(equity) > 2:
+        returns = equity[1:] / equity[:-1] - 1
+        std = returns.std(ddof=1)
+        if std > 0:
+            sharpe = float(returns.mean() / std * math.sqrt(periods))
+
+    wins = trades[trades > 0]
+    losses = trades[trades < 0]
+    return Metrics(
+        total_return=float(total_return),
+        annual_return=float(_annualize(total_return, len(equity) - 1, periods)),
+        sharpe_ratio=sharpe,
+        max_drawdown=max_drawdown(equity),
+        total_trades=len(trades),
+        profitable_trades=len(wins),
+        losing_trades=len(losses),
+        win_rate=len(wins) / len(trades) if len(trades) else 0.0,
+        avg_win=float(wins.mean()) if len(wins) else 0.0,
+        avg_loss=float(losses.mean()) if len(losses) else 0.0,
+        profit_factor=_profit_factor(float(wins.sum()), float(-losses.sum())),
+    )
+
+
+class StreamingMetrics:
+    """
+    Incremental `compute_metrics` for one equity stream; every update is O(1).
+    The latest bar stays pending until a later timestamp arrives, so a bar
+    re-marked several times counts once, at its last equity.
+    """
+
+    def __init__(self, initial_equity: float, periods: float) -> None:
+        self.initial_equity = float(initial_equity)
+        self.periods = periods
+        self.equity = self.initial_equity  # latest equity, pending while its bar is open
+        self.last_timestamp = None
+        self.bars = 0  # committed bar returns
+        self._pending = False
+        self._committed_equity = self.initial_equity
+        self._mean = 0.0  # Welford accumulators over bar returns
+        self._m2 = 0.0
+        self._peak = self.initial_equity
+        self._max_drawdown = 0.0
+        self._wins = 0
+        self._losses = 0
+        self._trades = 0
+        self._gross_win = 0.0
+        self._gross_loss = 0.0
+
+    def update(self, equity: float, timestamp=None) -> None:
+        """
+        Record the equity at the close of a bar. A repeated timestamp is the
+        same bar re-marked and replaces its pending equity; without
+        timestamps every update is a new bar.
+        """
+        if self._pending and (timestamp is None or timestamp != self.last_timestamp):
+            (self.bars, self._mean, self._m2, self._peak, self._max_drawdown) = self._folded()
+            self._committed_equity = self.equity
+        self.equity = equity
+        self.last_timestamp = timestamp
+        self._pending = True
+
+    def _folded(self):
+        """Bar count, Welford and peak/drawdown state with the pending bar included."""
+        bars, mean, m2 = self.bars, self._mean, self._m2
+        peak, max_dd = self._peak, self._max_drawdown
+        if not self._pending:
+            return bars, mean, m2, peak, max_dd
+        equity = self.equity
+        if self._committed_equity:
+            r = equity / self._committed_equity - 1
+            bars += 1
+            delta = r - mean
+            mean += delta / bars
+            m2 += delta * (r - mean)
+        if equity > peak:
+            peak = equity
+        elif peak > 0:
+            max_dd = min(max_dd, (equity - peak) / peak)
+        return bars, mean, m2, peak, max_dd
+
+    def add_trade(self, result: float) -> None:
+        """Record one closed trade's P&L (or return)."""
+        self._trades += 1
+        if result > 0:
+            self._wins += 1
+            self._gross_win += result
+        elif result < 0:
+            self._losses += 1
+            self._gross_loss -= result
+
+    def snapshot(self) -> Metrics:
+        bars, mean, m2, _, max_dd = self._folded()
+        total_return = (self.equity - self.initial_equity) / self.initial_equity if self.initial_equity else 0.0
+        sharpe = 0.0
+        if bars > 1:
+            std = math.sqrt(m2 / (bars - 1))
+            if std > 0:
+                sharpe = mean / std * math.sqrt(self.periods)
+        return Metrics(
+            total_return=total_return,
+            annual_return=_annualize(total_return, bars, self.periods),
+            sharpe_ratio=sharpe,
+            max_drawdown=max_dd,
+            total_trades=self._trades,
+            profitable_trades=self._wins,
+            losing_trades=self._losses,
+            win_rate=self._wins / self._trades if self._trades else 0.0,
+            avg_win=self._gross_win / self._wins if self._wins else 0.0,
+            avg_loss=-self._gross_loss / self._losses if self._losses else 0.0,
+            profit_factor=_profit_factor(self._gross_win, self._gross_loss),
+        )
@@ -0,0 +1,128 @@
+"""
+Monte Carlo resampling of a backtest's closed trades.
+
+Each trade's realized P&L is turned into a return on the equity it was
+booked against, then thousands of alternative trade sequences are drawn at
+once as a (paths x trades) matrix: with replacement ("bootstrap") or as
+permutations of the actual trades ("shuffle"). Equity paths are compounded
+in log space, so final return and max drawdown of every path come from a
+couple of cumulative reductions along the trade axis. Runs are processed
+in row blocks small enough for each block's passes to stay in cache.
+
+Shuffling keeps the set of trades and therefore the final return; only the
+drawdown distribution changes. Bootstrapping varies both.
+
+Cost at 100k paths x 300 trades on one core: about 0.6s bootstrapping and
+0.9-1.0s shuffling. About half of the shuffle is drawing the row
+permutations (rng.permuted); argsort of random keys and float32 paths
+were both measured slower, so that draw is the floor.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_BLOCK_CELLS = 1 << 16  # matrix cells per block (512 KB of float64, L2-sized)
+_LOSS_TOLERANCE = 1e-9  # final returns within this of zero are break-even, not losses
+
+
+@dataclass
+class MonteCarloResult:
+    paths: int
+    trades: int
+    method: str
+    return_percentiles: Dict[int, float]
+    drawdown_percentiles: Dict[int, float]  # drawdowns are negative; the 5th percentile is the bad tail
+    ruin_probability: float                 # share of paths whose equity ever fell to the ruin level
+    loss_probability: float                 # share of paths ending below the starting equity
+    final_returns: np.ndarray = field(default_factory=lambda: np.empty(0))
+    max_drawdowns: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    def to_dict(self) -> dict:
+        return {
+            'paths': self.paths,
+            'trades': self.trades,
+            'method': self.method,
+            'return_percentiles': self.return_percentiles,
+            'drawdown_percentiles': self.drawdown_percentiles,
+            'ruin_probability': self.ruin_probability,
+            'loss_probability': self.loss_probability,
+        }
+
+
+def trade_pnl(result) -> np.ndarray:
+    """
+    Realized USD P&L per closed trade from a backtest result: `trade_pnl` of
+    a SimpleBacktestResult, or the exit trades (final liquidation included) of
+    an EngineResult / PortfolioResult.
+    """
+    pnl = getattr(result, 'trade_pnl', None)
+    if pnl is None:
+        pnl = [t['pnl_usd'] for t in result.trades if t['type'] != 'BUY']
+    return np.asarray(pnl, dtype=float)
+
+
+def trade_returns(pnl: Sequence[float], initial_capital: float) -> np.ndarray:
+    """Each trade's P&L over the realized equity before it, so compounding the returns in order reproduces the backtest."""
+    pnl = np.asarray(pnl, dtype=float)
+    equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    return pnl / equity_before
+
+
+def simulate(pnl: Sequence[float], initial_capital: float = 10000.0, paths: int = 10000,
+             method: str = "bootstrap", ruin_level: float = 0.5, seed: Optional[int] = None) -> MonteCarloResult:
+    """
+    Resample the trade sequence `paths` times. ruin_level is the fraction of
+    starting equity at or below which a path counts as ruined.
+    """
+    if method not in ("bootstrap", "shuffle"):
+        raise ValueError(f"Unknown method: {method}")
+    returns = trade_returns(pnl, initial_capital)
+    n = len(returns)
+    if n == 0:
+        zeros = {p: 0.0 for p in PERCENTILES}
+        return MonteCarloResult(paths, 0, method, zeros, dict(zeros), 0.0, 0.0,
+                                np.zeros(paths), np.zeros(paths))
+
+    # A trade losing everything ends the path; clip so log1p stays finite
+    log_returns = np.log1p(np.maximum(returns, -1 + 1e-12))
+    ruin_log = np.log(ruin_level) if ruin_level > 0 else -np.inf
+    # Every shuffled path ends at the same equity; use the exact sum, not each path's float-rounded cumsum
+    shuffled_final = math.fsum(log_returns) if method == "shuffle" else None
+    rng = np.random.default_rng(seed)
+    final = np.empty(paths)
+    drawdown = np.empty(paths)
+    ruined = np.empty(paths, dtype=bool)
+
+    block = max(1, _BLOCK_CELLS // n)
+    for lo in range(0, paths, block):
+        rows = min(block, paths - lo)
+        if method == "bootstrap":
+            draws = log_returns[rng.integers(0, n, size=(rows, n))]
+        else:
+            draws = rng.permuted(np.broadcast_to(log_returns, (rows, n)), axis=1)
+        curve = np.cumsum(draws, axis=1, out=draws)
+        final[lo:lo + rows] = curve[:, -1] if shuffled_final is None else shuffled_final
+        ruined[lo:lo + rows] = curve.min(axis=1) <= ruin_log
+        # Peak includes the starting equity (log 0); reuse the peak buffer for the drawdown
+        under = np.maximum.accumulate(curve, axis=1)
+        np.maximum(under, 0.0, out=under)
+        np.subtract(curve, under, out=under)
+        drawdown[lo:lo + rows] = under.min(axis=1)
+
+    final_returns = np.expm1(final)
+    max_drawdowns = np.minimum(np.expm1(drawdown), 0.0)
+    return MonteCarloResult(
+        paths=paths,
+        trades=n,
+        method=method,
+        return_percentiles=dict(zip(PERCENTILES, np.percentile(final_returns, PERCENTILES).tolist())),
+        drawdown_percentiles=dict(zip(PERCENTILES, np.percentile(max_drawdowns, PERCENTILES).tolist())),
+        ruin_probability=float(ruined.mean()),
+        loss_probability=float((final_returns < -_LOSS_TOLERANCE).mean()),
+        final_returns=final_returns,
+        max_drawdowns=max_drawdowns,
+    )
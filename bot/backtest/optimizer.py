@@ -0,0 +1,119 @@
+"""
+Parallel grid search over the risk/sizing layer of the engine backtest
+(Bot Hunter signals unless another registered strategy is given).
+
+The signal (side + confidence per bar) and the EMA50/EMA200 trend filter do
+not depend on stop-loss, take-profit, confidence threshold or position size.
+They are computed once per symbol into a SignalStream, and each parameter
+combination only replays the cheap exit/entry rules in BacktestEngine over
+plain floats. Combinations are spread over a process pool.
+"""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..data.candles import as_frame
+from .engine import BacktestEngine, SignalStream, StopLoss, TakeProfit, build_stream
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the OHLCV columns and index, used as a cache key."""
+    df = as_frame(df)
+    h = hashlib.sha1()
+    h.update(np.asarray(df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))).tobytes())
+    for col in ("open", "high", "low", "close", "volume"):
+        if col in df:
+            h.update(df[col].to_numpy(dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+_stream_cache: Dict[tuple, SignalStream] = {}
+_STREAM_CACHE_SIZE = 32
+
+
+def precompute_signals(df: pd.DataFrame, symbol: str, start: int = 200,
+                       strategy: str = "bot_hunter") -> SignalStream:
+    """Signal stream of `strategy` for every bar from `start`; cached by data fingerprint."""
+    df = as_frame(df)
+    key = (symbol, strategy, start, frame_fingerprint(df))
+    cached = _stream_cache.get(key)
+    if cached is not None:
+        return cached
+
+    stream = build_stream(df, symbol, strategy, start)
+    if len(_stream_cache) >= _STREAM_CACHE_SIZE:
+        _stream_cache.pop(next(iter(_stream_cache)))
+    _stream_cache[key] = stream
+    return stream
+
+
+def evaluate(stream: SignalStream, stop_loss_pct: float, take_profit_pct: float, min_confidence: float,
+             position_size_pct: float, use_trend_filter: bool, initial_capital: float = 10000.0,
+             commission: float = 0.001) -> dict:
+    """
+    Replay the optimization backtest rules (PaperExchange fills at the close,
+    stop-loss/take-profit on the close, confidence + trend filtered entries)
+    for one parameter set on the shared BacktestEngine.
+    """
+    engine = BacktestEngine(
+        exits=(StopLoss(stop_loss_pct), TakeProfit(take_profit_pct)),
+        min_confidence=min_confidence,
+        position_size=position_size_pct,
+        trend_filter=use_trend_filter,
+        start=stream.start,
+        initial_capital=initial_capital,
+        commission=commission,
+    )
+    result = engine.run_stream(stream, record_trades=False)
+    return {
+        'total_return': result.total_return,
+        'final_equity': result.final_equity,
+        'total_trades': result.total_trades,
+        'win_rate': result.win_rate,
+        'max_drawdown': result.max_drawdown
+    }
+
+
+PARAM_NAMES = ('stop_loss', 'take_profit', 'min_confidence', 'position_size', 'use_trend')
+
+# Worker-process state: the stream is shipped once per worker, not per task
+_worker_stream: Optional[SignalStream] = None
+_worker_costs: tuple = ()
+
+
+def _init_worker(stream: SignalStream, initial_capital: float, commission: float) -> None:
+    global _worker_stream, _worker_costs
+    _worker_stream = stream
+    _worker_costs = (initial_capital, commission)
+
+
+def _evaluate_combo(combo: tuple) -> dict:
+    return evaluate(_worker_stream, *combo, *_worker_costs)
+
+
+def grid_search(df: pd.DataFrame, symbol: str, grid: Dict[str, Sequence], workers: Optional[int] = None,
+                initial_capital: float = 10000.0, commission: float = 0.001,
+                strategy: str = "bot_hunter") -> List[dict]:
+    """
+    Evaluate every combination of `grid` (keys: PARAM_NAMES) and return one
+    row per combination, in itertools.product order, with the parameters and
+    the backtest result merged.
+    """
+    combos = list(product(*(grid[name] for name in PARAM_NAMES)))
+    stream = precompute_signals(df, symbol, strategy=strategy)
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(combos) > 1:
+        chunksize = max(1, len(combos) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(stream, initial_capital, commission)) as pool:
+            results = list(pool.map(_evaluate_combo, combos, chunksize=chunksize))
+    else:
+        results = [evaluate(stream, *combo, initial_capital, commission) for combo in combos]
+
+    return [dict(zip(PARAM_NAMES, combo), **result) for combo, result in zip(combos, results)]
@@ -0,0 +1,229 @@
+"""
+Multi-asset portfolio backtest with one shared cash account.
+
+Every symbol is scored once with a registered batch strategy (see
+engine.STRATEGIES), then all symbols are aligned on the union of their
+timestamps as (bars x symbols) matrices. The simulation walks the bars once;
+on each bar stops, take-profits, signal sells and entries are applied to all
+symbols together with array operations, so the cost per bar does not grow
+with a Python loop over symbols.
+
+Accounting rules:
+- fills at the bar close, commission charged on both sides;
+- a symbol only trades on bars where it has its own candle; between candles
+  it is marked at its last close;
+- exits are processed before entries, so cash freed on a bar can fund
+  entries on the same bar;
+- each entry targets `position_size` of current equity. When the candidates
+  on a bar want more cash than is available, the highest-confidence ones are
+  filled first and the last one is sized down to what is left;
+- open positions are liquidated at each symbol's last close.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.candles import Candles, as_frame
+from .engine import STRATEGIES, build_stream
+from .metrics import max_drawdown
+
+
+@dataclass
+class PortfolioData:
+    index: pd.Index          # union of all symbols' timestamps
+    symbols: List[str]
+    close: np.ndarray        # (bars, symbols), forward-filled; NaN before a symbol's first bar
+    live: np.ndarray         # (bars, symbols) bool, symbol has a candle on this bar
+    side: np.ndarray         # (bars, symbols) int8, 1 buy, -1 sell, 0 hold
+    confidence: np.ndarray   # (bars, symbols)
+
+
+@dataclass
+class PortfolioResult:
+    total_return: float
+    final_equity: float
+    total_trades: int  # closed trades, final liquidation excluded
+    win_rate: float
+    max_drawdown: float
+    equity_curve: np.ndarray = field(default_factory=lambda: np.empty(0))
+    symbol_pnl: Dict[str, float] = field(default_factory=dict)  # realized USD PnL per symbol, net of commission
+    trades: List[Dict] = field(default_factory=list)
+
+
+def align_signals(frames: Mapping[str, Union[pd.DataFrame, Candles]], strategy: str = "bot_hunter",
+                  start: int = 200) -> PortfolioData:
+    """
+    Score each symbol with `strategy` and lay the results out on a common
+    timestamp grid. A symbol's first `start` bars are warm-up and never trade.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    symbols = list(frames)
+    frames = {sym: as_frame(frames[sym]) for sym in symbols}
+    index = frames[symbols[0]].index if symbols else pd.Index([])
+    for sym in symbols[1:]:
+        index = index.union(frames[sym].index)
+
+    shape = (len(index), len(symbols))
+    close = np.full(shape, np.nan)
+    live = np.zeros(shape, dtype=bool)
+    side = np.zeros(shape, dtype=np.int8)
+    confidence = np.zeros(shape)
+    for j, sym in enumerate(symbols):
+        df = frames[sym]
+        if df.empty:
+            continue
+        stream = build_stream(df, sym, strategy, start)
+        rows = index.get_indexer(df.index)
+        close[rows, j] = stream.close
+        live[rows, j] = True
+        side[rows[start:], j] = stream.side[start:]
+        confidence[rows, j] = np.nan_to_num(stream.confidence)
+
+    # Mark every symbol at its last close between its own candles
+    filled = pd.DataFrame(close).ffill().to_numpy()
+    return PortfolioData(index=index, symbols=symbols, close=filled, live=live, side=side, confidence=confidence)
+
+
+class PortfolioEngine:
+    """
+    position_size is the fraction of equity targeted per entry; max_positions
+    caps the number of concurrent holdings (None for no cap). stop_loss_pct /
+    take_profit_pct close a position on the close when its return crosses
+    them (None to disable).
+    """
+
+    def __init__(self, strategy: str = "bot_hunter", position_size: float = 0.1,
+                 max_positions: Optional[int] = None, min_confidence: float = 0.0,
+                 stop_loss_pct: Optional[float] = None, take_profit_pct: Optional[float] = None,
+                 start: int = 200, initial_capital: float = 10000.0, commission: float = 0.001):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.position_size = position_size
+        self.max_positions = max_positions
+        self.min_confidence = min_confidence
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.start = start
+        self.initial_capital = initial_capital
+        self.commission = commission
+
+    def run(self, frames: Mapping[str, Union[pd.DataFrame, Candles]]) -> PortfolioResult:
+        return self.run_aligned(align_signals(frames, self.strategy, self.start))
+
+    def run_aligned(self, data: PortfolioData, record_trades: bool = True) -> PortfolioResult:
+        n_bars, n_symbols = data.close.shape
+        close = np.nan_to_num(data.close)
+        live = data.live
+        wants_buy = (data.side == 1) & (data.confidence > self.min_confidence) & live
+        wants_sell = (data.side == -1) & (data.confidence > self.min_confidence) & live
+        stop_level = -self.stop_loss_pct if self.stop_loss_pct is not None else -np.inf
+        profit_level = self.take_profit_pct if self.take_profit_pct is not None else np.inf
+        commission = self.commission
+        max_positions = self.max_positions if self.max_positions is not None else n_symbols
+
+        cash = float(self.initial_capital)
+        qty = np.zeros(n_symbols)
+        entry = np.zeros(n_symbols)
+        cost_basis = np.zeros(n_symbols)  # cash paid for the open position, commission included
+        realized = np.zeros(n_symbols)
+        equity_curve = np.empty(n_bars + 1)
+        equity_curve[0] = cash
+        trades: List[Dict] = []
+        wins = 0
+        closed = 0
+
+        for i in range(n_bars):
+            price = close[i]
+            held = qty > 0
+
+            # Exits: stop-loss / take-profit first, then signal sells
+            if held.any():
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    pnl_pct = np.where(held, price / entry - 1.0, 0.0)
+                stop_hit = held & live[i] & (pnl_pct <= stop_level)
+                profit_hit = held & live[i] & (pnl_pct >= profit_level) & ~stop_hit
+                exiting = stop_hit | profit_hit | (held & wants_sell[i])
+                if exiting.any():
+                    cols = np.flatnonzero(exiting)
+                    proceeds = qty[cols] * price[cols] * (1 - commission)
+                    pnl = proceeds - cost_basis[cols]
+                    cash += float(proceeds.sum())
+                    realized[cols] += pnl
+                    wins += int((pnl > 0).sum())
+                    closed += len(cols)
+                    if record_trades:
+                        kinds = np.where(stop_hit[cols], "STOP_LOSS", np.where(profit_hit[cols], "TAKE_PROFIT", "SELL"))
+                        for j, kind, p in zip(cols.tolist(), kinds.tolist(), pnl.tolist()):
+                            trades.append(self._trade(data, i, j, kind, "SELL", price[j], entry[j], qty[j], p))
+                    qty[cols] = 0.0
+                    entry[cols] = 0.0
+                    cost_basis[cols] = 0.0
+                    held = qty > 0
+
+            # Entries: best confidence first until cash or position slots run out
+            candidates = wants_buy[i] & ~held
+            slots = max_positions - int(held.sum())
+            if slots > 0 and cash > 0 and candidates.any():
+                cols = np.flatnonzero(candidates)
+                cols = cols[np.argsort(-data.confidence[i, cols], kind="stable")][:slots]
+                equity = cash + float(qty @ close[i])
+                budget = np.full(len(cols), equity * self.position_size * (1 + commission))
+                spent_before = np.concatenate(([0.0], np.cumsum(budget)[:-1]))
+                budget = np.clip(cash - spent_before, 0.0, budget)
+                filled = budget > 0
+                cols, budget = cols[filled], budget[filled]
+                if len(cols):
+                    bought = budget / (1 + commission) / price[cols]
+                    qty[cols] = bought
+                    entry[cols] = price[cols]
+                    cost_basis[cols] = budget
+                    cash -= float(budget.sum())
+                    if record_trades:
+                        for j, q in zip(cols.tolist(), bought.tolist()):
+                            trades.append(self._trade(data, i, j, "BUY", "BUY", price[j], price[j], q, 0.0))
+
+            equity_curve[i + 1] = cash + float(qty @ price)
+
+        # Liquidate what is still open at each symbol's last close
+        held = np.flatnonzero(qty > 0)
+        if len(held):
+            last = close[-1]
+            proceeds = qty[held] * last[held] * (1 - commission)
+            pnl = proceeds - cost_basis[held]
+            cash += float(proceeds.sum())
+            realized[held] += pnl
+            if record_trades:
+                for j, p in zip(held.tolist(), pnl.tolist()):
+                    trades.append(self._trade(data, n_bars - 1, j, "FINAL", "SELL", last[j], entry[j], qty[j], p))
+            equity_curve[-1] = cash
+
+        return PortfolioResult(
+            total_return=(cash - self.initial_capital) / self.initial_capital,
+            final_equity=cash,
+            total_trades=closed,
+            win_rate=wins / closed if closed else 0,
+            max_drawdown=max_drawdown(equity_curve),
+            equity_curve=equity_curve,
+            symbol_pnl=dict(zip(data.symbols, realized.tolist())),
+            trades=trades,
+        )
+
+    @staticmethod
+    def _trade(data: PortfolioData, i: int, j: int, kind: str, side: str, price: float,
+               entry_price: float, qty: float, pnl_usd: float) -> Dict:
+        return {
+            'timestamp': data.index[i],
+            'symbol': data.symbols[j],
+            'type': kind,
+            'side': side,
+            'price': float(price),
+            'entry_price': float(entry_price),
+            'quantity': float(qty),
+            'pnl_pct': float(price / entry_price - 1.0) if entry_price else 0.0,
+            'pnl_usd': float(pnl_usd),
+            'confidence': float(data.confidence[i, j]),
+        }
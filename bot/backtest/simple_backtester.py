@@ -1,9 +1,42 @@
 import pandas as pd
-import numpy as np
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
-from bot.strategy.pivot_levels import compute_pivot_levels_signals
-from bot.data.yahoo import fetch_candles
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from bot.data.candles import Candles, as_candles, as_frame
+from bot.strategy.pivot_levels import compute_pivot_levels_signals, compute_pivot_levels_arrays
+from bot.data.store import fetch_candles
+from bot.exchange.simulator import BUY, SELL, LIMIT, OrderSimulator
+from bot.backtest.events import INFO, EventSink, default_sink
+from bot.backtest.metrics import compute_metrics, infer_interval_seconds, periods_per_year
+
+
+def _bar_dates(index: pd.Index) -> list:
+    """Calendar date of each bar (None when the index carries no dates)."""
+    if isinstance(index, pd.DatetimeIndex):
+        return list(index.date)
+    return [ts.date() if hasattr(ts, 'date') else None for ts in index]
+
+
+def _realized_pnl(trades: List[Dict]) -> List[float]:
+    """USD P&L of every SELL/FINAL against the cost of the shares it closes (FIFO per entry level)."""
+    lots: Dict[str, list] = {}
+    pnl = []
+    for t in trades:
+        level = t.get('entry_level')
+        if t['type'] == 'BUY':
+            lots.setdefault(level, []).append([t['shares'], t['cost'] / t['shares']])
+            continue
+        queue = lots.get(level, [])
+        remaining = t['shares']
+        cost = 0.0
+        while remaining > 1e-12 and queue:
+            take = min(remaining, queue[0][0])
+            cost += take * queue[0][1]
+            queue[0][0] -= take
+            remaining -= take
+            if queue[0][0] <= 1e-12:
+                queue.pop(0)
+        pnl.append(t['proceeds'] - cost)
+    return pnl
 
 
 @dataclass
@@ -22,15 +55,31 @@ class SimpleBacktestResult:
     profit_factor: float
     symbol: str
     period: str
+    trade_pnl: List[float] = field(default_factory=list)  # realized USD P&L per closed trade, in order
 
 
 class SimpleBacktester:
-    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001, symbol: str = ""):
+    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001, symbol: str = "",
+                 engine: str = "vectorized", events: Optional[EventSink] = None,
+                 end_of_data: str = "liquidate"):
+        if engine not in ("vectorized", "loop", "intrabar"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if end_of_data not in ("liquidate", "mark_to_market"):
+            raise ValueError(f"Unknown end_of_data policy: {end_of_data}")
         self.initial_capital = initial_capital
         self.commission = commission
         self.symbol = symbol
+        # "vectorized": precomputed level arrays + single pass over plain floats
+        # "loop": original per-bar signal recomputation (kept for cross-checking)
+        # "intrabar": resting S2/S3 limit entries and R1-R3 limit exits filled
+        #             against each bar's high/low by the order simulator
+        self.engine = engine
+        # Fills and the run summary go here; silent unless BACKTEST_EVENTS is set
+        self.events = events if events is not None else default_sink()
+        # Open positions after the last bar: "liquidate" at the last close or "mark_to_market"
+        self.end_of_data = end_of_data
 
-    def run_backtest(self, df: pd.DataFrame, symbol: str = None) -> SimpleBacktestResult:
+    def run_backtest(self, df: Union[pd.DataFrame, Candles], symbol: str = None) -> SimpleBacktestResult:
         # Use provided symbol or fallback to instance symbol
         if symbol is None:
             symbol = self.symbol
@@ -39,6 +88,13 @@ class SimpleBacktester:
         """
         if df.empty or len(df) < 20:
             return self._empty_result()
+        if self.engine == "vectorized":
+            return self._run_vectorized(as_candles(df), symbol)
+        if self.engine == "intrabar":
+            return self._run_intrabar(as_candles(df), symbol)
+        df = as_frame(df)
+        close = df['close'].to_numpy(dtype=float)
+        events = self.events
         
         # Initialize
         cash = self.initial_capital
@@ -54,7 +110,7 @@ class SimpleBacktester:
         
         # Main backtest loop
         for i in range(5, len(df)):  # Start at 5 to ensure enough data for pivot calculation
-            current_price = float(df.iloc[i]['close'])
+            current_price = float(close[i])
             current_data = df.iloc[:i+1]
             
             # Detect day change by comparing date (assuming datetime index)
@@ -91,7 +147,8 @@ class SimpleBacktester:
                                 'entry_level': 'S3',
                                 'exit_level': 'R1'
                             })
-                            print(f"SELL at {i}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R1)")
+                            if events.wants(INFO):
+                                events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S3", exit_level="R1")
                         else:
                             # Second exit: remaining 50% at R2
                             sell_shares = pos['shares']
@@ -106,7 +163,8 @@ class SimpleBacktester:
                                 'entry_level': 'S3',
                                 'exit_level': 'R2'
                             })
-                            print(f"SELL at {i}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R2)")
+                            if events.wants(INFO):
+                                events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S3", exit_level="R2")
                             positions.pop(idx_pos)
                             break
                     elif signal.side == "sell" and signal.exit_level == 'R1' and not pos['partial_done']:
@@ -125,7 +183,8 @@ class SimpleBacktester:
                             'entry_level': 'S3',
                             'exit_level': 'R1'
                         })
-                        print(f"SELL at {i}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R1)")
+                        if events.wants(INFO):
+                            events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S3", exit_level="R1")
                 elif pos['level'] == 'S2':
                     # S2 -> R3
                     signal = compute_pivot_levels_signals(current_data, symbol=symbol, current_position=pos)
@@ -142,7 +201,8 @@ class SimpleBacktester:
                             'entry_level': 'S2',
                             'exit_level': 'R3'
                         })
-                        print(f"SELL at {i}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S2 -> R3)")
+                        if events.wants(INFO):
+                            events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S2", exit_level="R3")
                         positions.pop(idx_pos)
                         break
 
@@ -173,115 +233,262 @@ class SimpleBacktester:
                     })
                     # Increment daily counter for this entry level
                     daily_entry_counts[signal.entry_level] += 1
-                    print(f"BUY at {i}: {shares:.2f} at ${current_price:.2f} (Entry: {signal.entry_level})")
+                    if events.wants(INFO):
+                        events.emit(INFO, "buy", bar=i, shares=shares, price=current_price, entry_level=signal.entry_level)
             
             # Calculate current equity
             total_position_value = sum(pos['shares'] * current_price for pos in positions)
             current_equity = cash + total_position_value
             equity_curve.append(current_equity)
 
-        # Handle remaining positions at end of backtest
-        # Extend data for next-day exits using recalculated pivots
-        if positions:
-            print(f"Carrying {len(positions)} positions to next day...")
-            # Add extra bars for next-day processing
-            extra_bars = 100  # Enough for next day's trading
-            extended_df = df.copy()
-            if len(extended_df) > 0:
-                last_price = df.iloc[-1]['close']
-                for j in range(extra_bars):
-                    new_row = df.iloc[-1].copy()
-                    new_row['close'] = last_price * (1 + np.random.normal(0, 0.001))  # Small random walk
-                    extended_df = pd.concat([extended_df, new_row.to_frame().T], ignore_index=True)
-            
-            # Process remaining positions with next-day pivots
-            for idx_pos in list(range(len(positions))):
+        cash = self._end_of_data(cash, positions, float(close[-1]), trades)
+
+        return self._build_result(cash, trades, equity_curve, df.index, symbol)
+
+    def _run_vectorized(self, candles: Candles, symbol: str) -> SimpleBacktestResult:
+        """
+        Same trading rules as the loop engine, but levels and cross-into-zone
+        masks are precomputed for the whole frame so each bar costs a handful
+        of float comparisons instead of a pandas slice and signal call.
+        """
+        arrays = compute_pivot_levels_arrays(candles, symbol=symbol)
+        close = candles.close.tolist()
+        r1 = arrays['r1'].tolist()
+        r2 = arrays['r2'].tolist()
+        r3 = arrays['r3'].tolist()
+        cross_s3 = arrays['cross_s3'].tolist()
+        cross_s2 = arrays['cross_s2'].tolist()
+        bar_days = _bar_dates(candles.index)
+        commission = self.commission
+        events = self.events
+
+        cash = self.initial_capital
+        positions = []
+        trades = []
+        equity_curve = [self.initial_capital]
+        daily_entry_counts = {'S2': 0, 'S3': 0}
+        current_day = None
+
+        for i in range(5, len(close)):
+            current_price = close[i]
+
+            bar_date = bar_days[i]
+            if bar_date and bar_date != current_day:
+                if current_day is not None:
+                    daily_entry_counts = {'S2': 0, 'S3': 0}
+                current_day = bar_date
+
+            # Levels are NaN until a signal is possible, so comparisons stay False
+            for idx_pos in range(len(positions)):
                 pos = positions[idx_pos]
+                if pos['shares'] <= 0:
+                    continue
                 if pos['level'] == 'S3':
-                    # S3 -> R2 (with partial TP at R1)
-                    for k in range(len(df), len(extended_df)):
-                        current_price = float(extended_df.iloc[k]['close'])
-                        current_data = extended_df.iloc[:k+1]
-                        signal = compute_pivot_levels_signals(current_data, symbol=symbol, current_position=None, existing_positions=positions)
-                        
-                        if signal.side == "sell" and signal.exit_level == 'R2':
-                            if not pos['partial_done']:
-                                # First exit: 50% at R1
-                                sell_shares = pos['shares'] * 0.5
-                                proceeds = sell_shares * current_price * (1 - self.commission)
-                                cash += proceeds
-                                pos['shares'] -= sell_shares
-                                pos['partial_done'] = True
-                                trades.append({
-                                    'type': 'SELL',
-                                    'price': current_price,
-                                    'shares': sell_shares,
-                                    'proceeds': proceeds,
-                                    'confidence': signal.confidence,
-                                    'entry_level': 'S3',
-                                    'exit_level': 'R1'
-                                })
-                                print(f"SELL at {k}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R1)")
-                            else:
-                                # Second exit: remaining 50% at R2
-                                sell_shares = pos['shares']
-                                proceeds = sell_shares * current_price * (1 - self.commission)
-                                cash += proceeds
-                                trades.append({
-                                    'type': 'SELL',
-                                    'price': current_price,
-                                    'shares': sell_shares,
-                                    'proceeds': proceeds,
-                                    'confidence': signal.confidence,
-                                    'entry_level': 'S3',
-                                    'exit_level': 'R2'
-                                })
-                                print(f"SELL at {k}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R2)")
-                                positions.pop(idx_pos)
-                                break
-                        elif signal.side == "sell" and signal.exit_level == 'R1' and not pos['partial_done']:
-                            # Partial exit at R1
-                            sell_shares = pos['shares'] * 0.5
-                            proceeds = sell_shares * current_price * (1 - self.commission)
-                            cash += proceeds
-                            pos['shares'] -= sell_shares
-                            pos['partial_done'] = True
-                            trades.append({
-                                'type': 'SELL',
-                                'price': current_price,
-                                'shares': sell_shares,
-                                'proceeds': proceeds,
-                                'confidence': signal.confidence,
-                                'entry_level': 'S3',
-                                'exit_level': 'R1'
-                            })
-                            print(f"SELL at {k}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S3 -> R1)")
-                elif pos['level'] == 'S2':
-                    # S2 -> R3
-                    for k in range(len(df), len(extended_df)):
-                        current_price = float(extended_df.iloc[k]['close'])
-                        current_data = extended_df.iloc[:k+1]
-                        signal = compute_pivot_levels_signals(current_data, symbol=symbol, current_position=None, existing_positions=positions)
-                        
-                        if signal.side == "sell" and signal.exit_level == 'R3':
-                            sell_shares = pos['shares']
-                            proceeds = sell_shares * current_price * (1 - self.commission)
-                            cash += proceeds
-                            trades.append({
-                                'type': 'SELL',
-                                'price': current_price,
-                                'shares': sell_shares,
-                                'proceeds': proceeds,
-                                'confidence': signal.confidence,
-                                'entry_level': 'S2',
-                                'exit_level': 'R3'
-                            })
-                            print(f"SELL at {k}: {sell_shares:.2f} at ${current_price:.2f} (Entry: S2 -> R3)")
-                            positions.pop(idx_pos)
-                            break
+                    if not pos['partial_done'] and current_price >= r1[i]:
+                        sell_shares = pos['shares'] * 0.5
+                        proceeds = sell_shares * current_price * (1 - commission)
+                        cash += proceeds
+                        pos['shares'] -= sell_shares
+                        pos['partial_done'] = True
+                        trades.append({
+                            'type': 'SELL',
+                            'price': current_price,
+                            'shares': sell_shares,
+                            'proceeds': proceeds,
+                            'confidence': 0.95,
+                            'entry_level': 'S3',
+                            'exit_level': 'R1'
+                        })
+                        if events.wants(INFO):
+                            events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S3", exit_level="R1")
+                    elif pos['partial_done'] and current_price >= r2[i]:
+                        sell_shares = pos['shares']
+                        proceeds = sell_shares * current_price * (1 - commission)
+                        cash += proceeds
+                        trades.append({
+                            'type': 'SELL',
+                            'price': current_price,
+                            'shares': sell_shares,
+                            'proceeds': proceeds,
+                            'confidence': 0.95,
+                            'entry_level': 'S3',
+                            'exit_level': 'R2'
+                        })
+                        if events.wants(INFO):
+                            events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S3", exit_level="R2")
+                        positions.pop(idx_pos)
+                        break
+                elif pos['level'] == 'S2' and current_price >= r3[i]:
+                    sell_shares = pos['shares']
+                    proceeds = sell_shares * current_price * (1 - commission)
+                    cash += proceeds
+                    trades.append({
+                        'type': 'SELL',
+                        'price': current_price,
+                        'shares': sell_shares,
+                        'proceeds': proceeds,
+                        'confidence': 0.95,
+                        'entry_level': 'S2',
+                        'exit_level': 'R3'
+                    })
+                    if events.wants(INFO):
+                        events.emit(INFO, "sell", bar=i, shares=sell_shares, price=current_price, entry_level="S2", exit_level="R3")
+                    positions.pop(idx_pos)
+                    break
 
-        # Final liquidation of any remaining positions
-        final_price = float(df.iloc[-1]['close'])
+            # S3 takes priority over S2, each at most once per day
+            entry_level = None
+            if cross_s3[i] and daily_entry_counts['S3'] == 0:
+                entry_level, confidence, exit_level = 'S3', 0.95, 'R2'
+            elif cross_s2[i] and daily_entry_counts['S2'] == 0:
+                entry_level, confidence, exit_level = 'S2', 0.85, 'R3'
+            if entry_level is not None:
+                position_value = cash / 3.0
+                if position_value > 0 and cash >= position_value * (1 + commission):
+                    shares = position_value / current_price
+                    cost = shares * current_price * (1 + commission)
+                    cash -= cost
+                    positions.append({
+                        'level': entry_level,
+                        'entry_level': entry_level,
+                        'shares': shares,
+                        'entry_price': current_price,
+                        'partial_done': False
+                    })
+                    trades.append({
+                        'type': 'BUY',
+                        'price': current_price,
+                        'shares': shares,
+                        'cost': cost,
+                        'confidence': confidence,
+                        'entry_level': entry_level,
+                        'exit_level': exit_level
+                    })
+                    daily_entry_counts[entry_level] += 1
+                    if events.wants(INFO):
+                        events.emit(INFO, "buy", bar=i, shares=shares, price=current_price, entry_level=entry_level)
+
+            total_position_value = sum(pos['shares'] * current_price for pos in positions)
+            equity_curve.append(cash + total_position_value)
+
+        cash = self._end_of_data(cash, positions, close[-1], trades)
+
+        return self._build_result(cash, trades, equity_curve, candles.index, symbol)
+
+    def _run_intrabar(self, candles: Candles, symbol: str) -> SimpleBacktestResult:
+        """
+        Pivot-level rules with limit orders instead of close crossings: each
+        session rests one buy limit at the top of the S3 zone and one at S2
+        (sized from a third of the cash at placement), and every filled entry
+        rests its exits (S3: half at R1, rest at R2; S2: all at R3). Exits are
+        re-priced to the new levels at each session change. Orders fill on the
+        bar's high/low through OrderSimulator, commission included.
+        """
+        arrays = compute_pivot_levels_arrays(candles, symbol=symbol)
+        opens = candles.open.tolist()
+        highs = candles.high.tolist()
+        lows = candles.low.tolist()
+        close = candles.close.tolist()
+        levels = {k: arrays[k].tolist() for k in ('r1', 'r2', 'r3', 'zone_s2', 'zone_s3')}
+        bar_days = _bar_dates(candles.index)
+        commission = self.commission
+        events = self.events
+
+        sim = OrderSimulator(symbol=symbol, starting_cash=self.initial_capital, commission=commission)
+        exchange = sim.exchange
+        entry_rules = {'S3': (0.95, 'R2', (('R1', 0.5), ('R2', 1.0))), 'S2': (0.85, 'R3', (('R3', 1.0),))}
+        positions = {}  # entry order id -> {'level', 'shares', 'partial_done', 'filled'}
+        trades = []
+        equity_curve = [self.initial_capital]
+        session = None
+
+        def place_exits(key, pos, i, parent=-1):
+            # R1 takes half of what is left, the final target takes the remainder
+            remaining = pos['shares']
+            for exit_level, fraction in entry_rules[pos['level']][2]:
+                if exit_level == 'R1' and pos['partial_done']:
+                    continue
+                qty = remaining if fraction == 1.0 else remaining * fraction
+                if fraction != 1.0:
+                    remaining -= qty
+                sim.submit(SELL, LIMIT, qty, levels[exit_level.lower()][i], tag=f"{key}:{exit_level}", parent=parent)
+
+        for i in range(5, len(close)):
+            day = bar_days[i]
+            if day != session and levels['zone_s3'][i] == levels['zone_s3'][i]:
+                # New session: unfilled entries expire, open exits move to the new levels
+                session = day
+                sim.cancel_all()
+                positions = {k: p for k, p in positions.items() if p['filled']}
+                for key, pos in positions.items():
+                    place_exits(key, pos, i)
+                cash = exchange.cash
+                for level in ('S3', 'S2'):
+                    price = levels['zone_' + level.lower()][i]
+                    if price > 0:
+                        qty = cash / 3.0 / price
+                        key = sim.submit(BUY, LIMIT, qty, price, tag=f"{level}:entry")
+                        positions[key] = {'level': level, 'shares': qty, 'partial_done': False, 'filled': False}
+                        place_exits(key, positions[key], i, parent=key)
+
+            for fill in sim.on_bar(opens[i], highs[i], lows[i], close[i]):
+                level_tag, leg = fill.tag.split(":")
+                if leg == 'entry':
+                    pos = positions[fill.order_id]
+                    pos['shares'] = fill.qty
+                    pos['filled'] = True
+                    confidence, exit_level, _ = entry_rules[pos['level']]
+                    trades.append({
+                        'type': 'BUY',
+                        'price': fill.price,
+                        'shares': fill.qty,
+                        'cost': fill.qty * fill.price * (1 + commission),
+                        'confidence': confidence,
+                        'entry_level': pos['level'],
+                        'exit_level': exit_level
+                    })
+                    if events.wants(INFO):
+                        events.emit(INFO, "buy", bar=i, shares=fill.qty, price=fill.price, entry_level=pos['level'], order="limit")
+                else:
+                    pos = positions[int(level_tag)]
+                    pos['shares'] -= fill.qty
+                    if leg == 'R1':
+                        pos['partial_done'] = True
+                    trades.append({
+                        'type': 'SELL',
+                        'price': fill.price,
+                        'shares': fill.qty,
+                        'proceeds': fill.qty * fill.price * (1 - commission),
+                        'confidence': 0.95,
+                        'entry_level': pos['level'],
+                        'exit_level': leg
+                    })
+                    if events.wants(INFO):
+                        events.emit(INFO, "sell", bar=i, shares=fill.qty, price=fill.price, entry_level=pos['level'], exit_level=leg)
+                    # The final target sells what was left at placement; drop the position
+                    # there rather than test the float remainder of the partial legs
+                    if leg == entry_rules[pos['level']][1] or pos['shares'] <= 0:
+                        del positions[int(level_tag)]
+            equity_curve.append(exchange.cash + exchange.position * close[i])
+
+        filled = [pos for pos in positions.values() if pos['filled']]
+        cash = self._end_of_data(exchange.cash, filled, close[-1], trades)
+
+        return self._build_result(cash, trades, equity_curve, candles.index, symbol)
+
+    def _end_of_data(self, cash: float, positions: List[Dict], final_price: float, trades: List[Dict]) -> float:
+        """
+        Settle positions still open after the last bar; returns the final
+        equity. "liquidate" sells them at the last close (FINAL trades, with
+        commission); "mark_to_market" keeps them and values them at the last
+        close, so only closed trades enter the statistics.
+        """
+        events = self.events
+        if self.end_of_data == "mark_to_market":
+            value = sum(pos['shares'] for pos in positions) * final_price
+            if positions and events.wants(INFO):
+                events.emit(INFO, "mark_to_market", positions=len(positions), price=final_price, value=value)
+            return cash + value
         for pos in positions:
             sell_shares = pos['shares']
             proceeds = sell_shares * final_price * (1 - self.commission)
@@ -295,88 +502,38 @@ class SimpleBacktester:
                 'entry_level': pos['level'],
                 'exit_level': 'FINAL'
             })
-            print(f"FINAL SELL: {sell_shares:.2f} at ${final_price:.2f} (Entry: {pos['level']})")
+            if events.wants(INFO):
+                events.emit(INFO, "final_sell", shares=sell_shares, price=final_price, entry_level=pos['level'])
+        return cash
+
+    def _build_result(self, cash: float, trades: List[Dict], equity_curve: List[float],
+                      index: pd.Index, symbol: str) -> SimpleBacktestResult:
+        # Closed trades are the SELL/FINAL exits, valued against the cost of the shares they close
+        trade_pnl = _realized_pnl(trades)
+        seconds = infer_interval_seconds(index) if isinstance(index, pd.DatetimeIndex) else None
+        # Frames without dates: assume the 5m bars this backtester is normally run on
+        periods = periods_per_year("5m", symbol, seconds)
+        m = compute_metrics(equity_curve, trade_pnl, periods, final_equity=cash)
+
+        self.events.summary(symbol=symbol, final_equity=cash, total_return=m.total_return,
+                            total_trades=m.total_trades, win_rate=m.win_rate, max_drawdown=m.max_drawdown)
 
-        # Calculate final metrics
-        final_equity = cash
-        total_return = (final_equity - self.initial_capital) / self.initial_capital
-        
-        # Calculate annual return
-        days = len(df) / (24 * 12)  # Assuming 5m intervals, 24*12 = 288 bars per day
-        annual_return = (1 + total_return) ** (365 / days) - 1 if days > 0 else 0
-        
-        # Include ALL trades (including FINAL exits) for win/loss calculation
-        all_trades = trades
-        
-        # Calculate trade statistics
-        total_trades = len(all_trades)
-        if total_trades == 0:
-            return self._empty_result()
-        
-        # Separate buy and sell trades (including FINAL)
-        buy_trades = [t for t in all_trades if t['type'] == 'BUY']
-        sell_trades = [t for t in all_trades if t['type'] in ['SELL', 'FINAL']]
-        
-        # Match trades and calculate P&L
-        trade_pnl = []
-        buy_idx = 0
-        sell_idx = 0
-        
-        while buy_idx < len(buy_trades) and sell_idx < len(sell_trades):
-            buy_trade = buy_trades[buy_idx]
-            sell_trade = sell_trades[sell_idx]
-            
-            # Calculate P&L for this trade pair
-            pnl = sell_trade['proceeds'] - buy_trade['cost']
-            trade_pnl.append(pnl)
-            
-            buy_idx += 1
-            sell_idx += 1
-        
-        # Calculate metrics
-        profitable_trades = sum(1 for pnl in trade_pnl if pnl > 0)
-        losing_trades = sum(1 for pnl in trade_pnl if pnl < 0)
-        win_rate = profitable_trades / total_trades if total_trades > 0 else 0
-        
-        # Calculate max drawdown
-        equity_series = pd.Series(equity_curve)
-        rolling_max = equity_series.expanding().max()
-        drawdown = (equity_series - rolling_max) / rolling_max
-        max_drawdown = drawdown.min()
-        
-        # Calculate Sharpe ratio
-        if len(equity_curve) > 1:
-            returns = pd.Series(equity_curve).pct_change().dropna()
-            sharpe_ratio = returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0
-        else:
-            sharpe_ratio = 0
-        
-        # Calculate average win/loss
-        wins = [pnl for pnl in trade_pnl if pnl > 0]
-        losses = [pnl for pnl in trade_pnl if pnl < 0]
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = np.mean(losses) if losses else 0
-        
-        # Calculate profit factor
-        total_wins = sum(wins) if wins else 0
-        total_losses = abs(sum(losses)) if losses else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else float('inf') if total_wins > 0 else 0
-        
         return SimpleBacktestResult(
-            total_return=total_return,
-            annual_return=annual_return,
-            final_equity=final_equity,
-            total_trades=total_trades,
-            profitable_trades=profitable_trades,
-            losing_trades=losing_trades,
-            win_rate=win_rate,
-            max_drawdown=max_drawdown,
-            sharpe_ratio=sharpe_ratio,
-            avg_win=avg_win,
-            avg_loss=avg_loss,
-            profit_factor=profit_factor,
+            total_return=m.total_return,
+            annual_return=m.annual_return,
+            final_equity=cash,
+            total_trades=m.total_trades,
+            profitable_trades=m.profitable_trades,
+            losing_trades=m.losing_trades,
+            win_rate=m.win_rate,
+            max_drawdown=m.max_drawdown,
+            sharpe_ratio=m.sharpe_ratio,
+            avg_win=m.avg_win,
+            avg_loss=m.avg_loss,
+            profit_factor=m.profit_factor,
             symbol=symbol,
-            period="1 month"
+            period="1 month",
+            trade_pnl=trade_pnl,
         )
 
     def _empty_result(self) -> SimpleBacktestResult:
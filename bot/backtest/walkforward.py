@@ -0,0 +1,174 @@
+"""
+Walk-forward optimization over the same parameter grid as optimizer.grid_search.
+
+History after the warm-up is split into consecutive train/test windows. Each
+train window is grid searched, and the best parameter set is then traded on
+the test window that follows it. The reported equity curve is stitched from
+the test windows only, so every bar of it is out-of-sample.
+
+The batch signals are causal (bar i only sees bars <= i), so the signal
+stream is computed once over the whole history and every window is a view
+into it. All (window, combination) evaluations of all folds go to one
+process pool, which ships the stream to each worker once; the total work is
+folds x combinations replays over windows that together cover the history
+about (train + test) / test times.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data.candles import as_frame
+from .engine import BacktestEngine, SignalStream, StopLoss, TakeProfit
+from .metrics import max_drawdown
+from .optimizer import PARAM_NAMES, evaluate, precompute_signals
+
+
+@dataclass
+class WalkForwardResult:
+    total_return: float
+    final_equity: float
+    total_trades: int
+    win_rate: float
+    max_drawdown: float
+    folds: List[Dict] = field(default_factory=list)
+    equity_curve: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+    trades: List[Dict] = field(default_factory=list)
+
+
+def walk_forward_windows(n_bars: int, train_bars: int, test_bars: int, start: int = 200,
+                         anchored: bool = False) -> List[Tuple[int, int, int]]:
+    """
+    (train_start, test_start, test_end) bar positions, test windows back to
+    back from `start + train_bars` to the end. Anchored windows always train
+    from `start`; rolling ones keep `train_bars` of history.
+    """
+    windows = []
+    test_start = start + train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = start if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def _window(stream: SignalStream, lo: int, hi: int) -> SignalStream:
+    """Bars [lo, hi) of the stream as a view; the engine liquidates at hi - 1."""
+    return SignalStream(
+        close=stream.close[:hi],
+        side=stream.side[:hi],
+        confidence=stream.confidence[:hi],
+        is_uptrend=stream.is_uptrend[:hi],
+        start=lo,
+        reason=stream.reason[:hi] if stream.reason is not None else None,
+    )
+
+
+# Worker-process state: the stream is shipped once per worker, not per task
+_worker_stream: Optional[SignalStream] = None
+_worker_costs: tuple = ()
+
+
+def _init_worker(stream: SignalStream, initial_capital: float, commission: float) -> None:
+    global _worker_stream, _worker_costs
+    _worker_stream = stream
+    _worker_costs = (initial_capital, commission)
+
+
+def _evaluate_task(task: tuple) -> dict:
+    lo, hi, combo = task
+    return evaluate(_window(_worker_stream, lo, hi), *combo, *_worker_costs)
+
+
+def _best(rows: List[dict], min_trades: int) -> Optional[dict]:
+    """Highest in-sample return with enough trades; earliest combination wins ties."""
+    best = None
+    for row in rows:
+        if row['total_trades'] >= min_trades and (best is None or row['total_return'] > best['total_return']):
+            best = row
+    return best
+
+
+def walk_forward(df: pd.DataFrame, symbol: str, grid: Dict[str, Sequence], train_bars: int, test_bars: int,
+                 anchored: bool = False, min_trades: int = 1, workers: Optional[int] = None,
+                 initial_capital: float = 10000.0, commission: float = 0.001,
+                 strategy: str = "bot_hunter") -> WalkForwardResult:
+    """
+    Optimize `grid` (keys: PARAM_NAMES) on every train window and trade the
+    winner on the following test window, carrying equity from one test window
+    to the next. Positions are closed at the end of each test window. Folds
+    where no combination reaches `min_trades` stay in cash.
+    """
+    df = as_frame(df)
+    stream = precompute_signals(df, symbol, strategy=strategy)
+    windows = walk_forward_windows(len(stream.close), train_bars, test_bars, stream.start, anchored)
+    combos = list(product(*(grid[name] for name in PARAM_NAMES)))
+    tasks = [(lo, hi, combo) for lo, hi, _ in windows for combo in combos]
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(stream, initial_capital, commission)) as pool:
+            results = list(pool.map(_evaluate_task, tasks, chunksize=chunksize))
+    else:
+        results = [evaluate(_window(stream, lo, hi), *combo, initial_capital, commission) for lo, hi, combo in tasks]
+
+    equity = float(initial_capital)
+    curve_parts = []
+    folds = []
+    trades = []
+    closed = []
+    for k, (train_start, test_start, test_end) in enumerate(windows):
+        rows = [dict(zip(PARAM_NAMES, combo), **result)
+                for combo, result in zip(combos, results[k * len(combos):(k + 1) * len(combos)])]
+        best = _best(rows, min_trades)
+        fold = {
+            'train_start': df.index[train_start],
+            'test_start': df.index[test_start],
+            'test_end': df.index[test_end - 1],
+            'params': {name: best[name] for name in PARAM_NAMES} if best else None,
+            'in_sample_return': best['total_return'] if best else 0.0,
+        }
+
+        start_equity = equity
+        if best:
+            engine = BacktestEngine(
+                exits=(StopLoss(best['stop_loss']), TakeProfit(best['take_profit'])),
+                min_confidence=best['min_confidence'],
+                position_size=best['position_size'],
+                trend_filter=best['use_trend'],
+                start=test_start,
+                initial_capital=equity,
+                commission=commission,
+            )
+            result = engine.run_stream(_window(stream, test_start, test_end), index=df.index)
+            curve = result.equity_curve[1:]
+            equity = result.final_equity
+            trades.extend(result.trades)
+            closed.extend(t['pnl_pct'] for t in result.trades if t['type'] not in ('BUY', 'FINAL'))
+            fold['trades'] = result.total_trades
+        else:
+            curve = [equity] * (test_end - test_start)
+            fold['trades'] = 0
+        fold['out_of_sample_return'] = (equity - start_equity) / start_equity
+        folds.append(fold)
+        curve_parts.append(pd.Series(curve, index=df.index[test_start:test_end], dtype=float))
+
+    equity_curve = pd.concat(curve_parts) if curve_parts else pd.Series(dtype=float)
+    values = np.concatenate(([initial_capital], equity_curve.to_numpy()))
+    return WalkForwardResult(
+        total_return=(equity - initial_capital) / initial_capital,
+        final_equity=equity,
+        total_trades=len(closed),
+        win_rate=sum(1 for pnl in closed if pnl > 0) / len(closed) if closed else 0,
+        max_drawdown=max_drawdown(values),
+        folds=folds,
+        equity_curve=equity_curve,
+        trades=trades,
+    )
@@ -1,14 +1,39 @@
 import typer
-from .runner import run_loop, backfill_data
+from .runner import run_loop, run_many as run_many_sessions, backfill_data, SESSION_STRATEGIES
 from .web_ui import app as web_app
-from .data.yahoo import fetch_candles
+from .data.store import fetch_candles
 from .backtest.simple_backtester import SimpleBacktester
+from .backtest.portfolio import PortfolioEngine
+from .backtest.cache import default_cache
+from .profiling import Profiler, format_report
 import pandas as pd
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 app = typer.Typer(help="Trading bot CLI")
 
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Profile the command and print per-stage timings on exit"),
+    profile_format: str = typer.Option("cprofile", help="cprofile (pstats file) or collapsed (folded stacks, all threads)"),
+    profile_out: Optional[str] = typer.Option(None, help="Profile output path (default profile.prof / profile.folded)"),
+):
+    """Global options; --profile goes before the command, e.g. `python main.py --profile run-many`."""
+    if not profile:
+        return
+    profiler = Profiler(profile_format, profile_out)
+    profiler.start()
+
+    def finish() -> None:
+        path = profiler.stop()
+        typer.echo(format_report(), err=True)
+        typer.echo(f"Profile written to {path}", err=True)
+
+    ctx.call_on_close(finish)
+
+
 @app.command()
 def run(
     symbol: str = typer.Option("AAPL", help="Ticker symbol"),
@@ -22,6 +47,21 @@ def run(
     run_loop(symbol=symbol, interval=interval, sma_fast=sma_fast, sma_slow=sma_slow, lookback=lookback, position_size=position_size)
 
 
+@app.command()
+def run_many(
+    symbols: str = typer.Option("", help="Comma-separated symbols (default: top crypto list)"),
+    interval: str = typer.Option("5m", help="Bar interval, e.g. 1m, 5m, 1h"),
+    strategy: str = typer.Option("sma", help=f"One of: {', '.join(SESSION_STRATEGIES)}"),
+    lookback: int = typer.Option(300, help="Bars to fetch for context"),
+    position_size: float = typer.Option(1.0, help="Units per signal"),
+    fetch_workers: int = typer.Option(8, help="Threads shared by all sessions for candle fetches"),
+):
+    """Paper-trade many symbols concurrently, each session waking on its bar boundaries."""
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] or _default_top_crypto()
+    run_many_sessions(symbol_list, interval=interval, strategy=strategy, lookback=lookback,
+                      position_size=position_size, fetch_workers=fetch_workers)
+
+
 @app.command()
 def backfill(
     symbol: str = typer.Option("AAPL", help="Ticker symbol"),
@@ -48,6 +88,22 @@ def _default_top_crypto() -> List[str]:
     ]
 
 
+def _backtest_symbol(sym: str, interval: str, lookback: int, initial_equity: float,
+                     commission: float) -> Tuple[str, Optional[Tuple[str, float, float, int, float, float]], Optional[str]]:
+    """Fetch + backtest one symbol; module-level so process pool workers can run it."""
+    try:
+        df = fetch_candles(sym, interval, lookback)
+        if df is None or len(df) < 200:
+            return sym, None, None
+        bt = SimpleBacktester(initial_equity, commission, sym)
+        params = {'initial_capital': initial_equity, 'commission': commission, 'symbol': sym, 'engine': bt.engine,
+                  'end_of_data': bt.end_of_data}
+        r = default_cache().get_or_run(df, "simple_backtester", params, lambda: bt.run_backtest(df))
+        return sym, (sym, r.total_return, r.final_equity, r.total_trades, r.win_rate, r.max_drawdown), None
+    except Exception as e:
+        return sym, None, str(e)
+
+
 @app.command()
 def crypto_suite(
     interval: str = typer.Option("5m", help="Bar interval, e.g. 5m"),
@@ -56,33 +112,88 @@ def crypto_suite(
     commission: float = typer.Option(0.001, help="Commission fraction per trade"),
     list_file: str = typer.Option("crypto_top100.txt", help="Optional file with one symbol per line"),
     top_n: int = typer.Option(10, help="Show top N results"),
+    workers: int = typer.Option(1, help="Worker processes for fetch + backtest (1 = sequential)"),
 ):
     """Run backtests over Top 100 crypto and print leaders."""
-    symbols: List[str] = []
+    symbols = _load_symbols(list_file)
+
+    results: List[Tuple[str, float, float, int, float, float]] = []
+
+    def collect(sym: str, row, error: Optional[str]) -> None:
+        if error is not None:
+            print(f"SKIP {sym}: {error}")
+        elif row is not None:
+            results.append(row)
+            _, ret, eq, trades, win, _ = row
+            print(f"DONE {sym}: return={ret:.2%}, trades={trades}, win={win:.1%}, eq=${eq:.2f}")
+
+    if workers > 1:
+        # Results stream back in completion order; the final table is sorted below
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_backtest_symbol, sym, interval, lookback, initial_equity, commission)
+                for sym in symbols
+            ]
+            for future in as_completed(futures):
+                collect(*future.result())
+    else:
+        for sym in symbols:
+            collect(*_backtest_symbol(sym, interval, lookback, initial_equity, commission))
+
+    if not results:
+        print("No results generated.")
+        return
+
+    # Symbol as tie-breaker keeps the ranking independent of completion order
+    results.sort(key=lambda x: (-x[1], x[0]))
+    print("\nTop performers:")
+    for sym, ret, eq, trades, win, dd in results[:top_n]:
+        print(f"{sym}: return={ret:.2%}, equity=${eq:.2f}, trades={trades}, win={win:.1%}, maxDD={dd:.2%}")
+
+
+def _load_symbols(list_file: str) -> List[str]:
     try:
         with open(list_file, 'r', encoding='utf-8') as f:
-            symbols = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
     except FileNotFoundError:
-        symbols = _default_top_crypto()
+        return _default_top_crypto()
 
-    results: List[Tuple[str, float, float, int, float, float]] = []
-    for sym in symbols:
+
+@app.command()
+def portfolio_suite(
+    interval: str = typer.Option("5m", help="Bar interval, e.g. 5m"),
+    lookback: int = typer.Option(3000, help="Bars to fetch per symbol (~1-2 months for 5m)"),
+    strategy: str = typer.Option("bot_hunter", help="Registered engine strategy"),
+    initial_equity: float = typer.Option(10000.0, help="Starting equity shared by all symbols"),
+    commission: float = typer.Option(0.001, help="Commission fraction per trade"),
+    position_size: float = typer.Option(0.1, help="Fraction of equity per position"),
+    max_positions: int = typer.Option(10, help="Maximum concurrent positions"),
+    stop_loss: float = typer.Option(0.0, help="Stop-loss fraction (0 = off)"),
+    take_profit: float = typer.Option(0.0, help="Take-profit fraction (0 = off)"),
+    list_file: str = typer.Option("crypto_top100.txt", help="Optional file with one symbol per line"),
+    top_n: int = typer.Option(10, help="Show top N symbols by realized PnL"),
+):
+    """Backtest the whole crypto list from one shared-cash account."""
+    frames = {}
+    for sym in _load_symbols(list_file):
         try:
             df = fetch_candles(sym, interval, lookback)
-            if df is None or len(df) < 200:
-                continue
-            bt = SimpleBacktester(initial_equity, commission, sym)
-            r = bt.run_backtest(df)
-            results.append((sym, r.total_return, r.final_equity, r.total_trades, r.win_rate, r.max_drawdown))
-            print(f"DONE {sym}: return={r.total_return:.2%}, trades={r.total_trades}, win={r.win_rate:.1%}, eq=${r.final_equity:.2f}")
         except Exception as e:
             print(f"SKIP {sym}: {e}")
-
-    if not results:
+            continue
+        if df is not None and len(df) >= 200:
+            frames[sym] = df
+    if not frames:
         print("No results generated.")
         return
 
-    results.sort(key=lambda x: x[1], reverse=True)
-    print("\nTop performers:")
-    for sym, ret, eq, trades, win, dd in results[:top_n]:
-        print(f"{sym}: return={ret:.2%}, equity=${eq:.2f}, trades={trades}, win={win:.1%}, maxDD={dd:.2%}")
+    engine = PortfolioEngine(strategy, position_size=position_size, max_positions=max_positions,
+                             stop_loss_pct=stop_loss or None, take_profit_pct=take_profit or None,
+                             initial_capital=initial_equity, commission=commission)
+    r = engine.run(frames)
+    print(f"Portfolio ({len(frames)} symbols): return={r.total_return:.2%}, equity=${r.final_equity:.2f}, "
+          f"trades={r.total_trades}, win={r.win_rate:.1%}, maxDD={r.max_drawdown:.2%}")
+    leaders = sorted(r.symbol_pnl.items(), key=lambda x: (-x[1], x[0]))
+    print("\nTop contributors:")
+    for sym, pnl in leaders[:top_n]:
+        print(f"{sym}: pnl=${pnl:.2f}")
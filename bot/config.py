@@ -12,8 +12,16 @@ Interval = Literal["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d", "1w
 class Settings(BaseSettings):
     bot_env: str = os.getenv("BOT_ENV", "development")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    profile: bool = os.getenv("PROFILE", "0") == "1"
     paper_starting_cash: float = float(os.getenv("PAPER_STARTING_CASH", "10000"))
     data_provider: str = os.getenv("DATA_PROVIDER", "yfinance")
+    data_cache_dir: str = os.getenv("DATA_CACHE_DIR", "data_cache")
+    data_offline: bool = os.getenv("DATA_OFFLINE", "0") == "1"
+    data_cache_max_bars: int = int(os.getenv("DATA_CACHE_MAX_BARS", "200000"))
+    synthetic_seed: int = int(os.getenv("SYNTHETIC_SEED", "0"))
+    db_path: str = os.getenv("DB_PATH", "bot.sqlite")
+    backtest_events: str = os.getenv("BACKTEST_EVENTS", "")
+    result_cache_mb: int = int(os.getenv("RESULT_CACHE_MB", "256"))
 
     class Config:
         extra = "ignore"
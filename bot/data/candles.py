@@ -0,0 +1,124 @@
+"""
+Columnar candle container.
+
+`Candles` holds OHLCV as separate contiguous float64 arrays (struct-of-arrays)
+plus the original index. Slicing with a step-1 slice returns a view that
+shares the arrays, so taking the prefix up to bar i is O(1) and copies
+nothing, and `close[i]` is a plain array read instead of a pandas lookup.
+
+Conversion to and from the frames returned by `fetch_candles` is cheap:
+`from_frame` reuses the frame's float64 column buffers where it can and
+`to_frame` wraps the arrays without copying.
+"""
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+class Bar(NamedTuple):
+    timestamp: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _column(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+class Candles:
+    # The index is sliced lazily: views keep the parent's index plus the
+    # positions they cover, because slicing a pandas Index costs far more
+    # than slicing the arrays.
+    __slots__ = FIELDS + ("_base_index", "_positions")
+
+    def __init__(self, timestamp, open, high, low, close, volume, index: Optional[pd.Index] = None):
+        self.timestamp = _column(timestamp)
+        self.open = _column(open)
+        self.high = _column(high)
+        self.low = _column(low)
+        self.close = _column(close)
+        self.volume = _column(volume)
+        n = len(self.close)
+        if any(len(getattr(self, f)) != n for f in FIELDS):
+            raise ValueError("All candle columns must have the same length")
+        self._base_index = pd.RangeIndex(n) if index is None else index
+        self._positions = range(n)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Candles":
+        """Build from an OHLCV frame; missing columns are filled with NaN.
+
+        `timestamp` is taken from the frame's column when present, otherwise
+        from a DatetimeIndex (epoch seconds), otherwise it is the bar number.
+        """
+        n = len(df)
+        cols = {}
+        for f in FIELDS[1:]:
+            cols[f] = df[f].to_numpy(dtype=np.float64) if f in df.columns else np.full(n, np.nan)
+        if "timestamp" in df.columns:
+            ts = df["timestamp"].to_numpy(dtype=np.float64)
+        elif isinstance(df.index, pd.DatetimeIndex):
+            ts = df.index.asi8 / 1e9
+        else:
+            ts = np.arange(n, dtype=np.float64)
+        return cls(ts, index=df.index, **cols)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Frame in the `fetch_candles` layout, backed by these arrays (no copy)."""
+        data = {"timestamp": self.timestamp.astype(np.int64)}
+        data.update((f, getattr(self, f)) for f in FIELDS[1:])
+        return pd.DataFrame(data, index=self.index, copy=False)
+
+    @property
+    def index(self) -> pd.Index:
+        base, pos = self._base_index, self._positions
+        if len(pos) == len(base) and pos.step == 1:
+            return base
+        if pos.step > 0:
+            return base[pos.start:pos.stop:pos.step]
+        return base.take(np.asarray(pos))
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.close) == 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            view = Candles.__new__(Candles)
+            view.timestamp = self.timestamp[key]
+            view.open = self.open[key]
+            view.high = self.high[key]
+            view.low = self.low[key]
+            view.close = self.close[key]
+            view.volume = self.volume[key]
+            view._base_index = self._base_index
+            view._positions = self._positions[key]
+            return view
+        i = int(key)
+        return Bar(*(float(getattr(self, f)[i]) for f in FIELDS))
+
+    def prefix(self, n: int) -> "Candles":
+        """The first n bars as a zero-copy view (what `df.iloc[:n]` would hold)."""
+        return self[:n]
+
+    def tail(self, n: int) -> "Candles":
+        return self[max(len(self) - n, 0):]
+
+
+def as_frame(data: Union[pd.DataFrame, Candles]) -> pd.DataFrame:
+    """Accept either representation where a DataFrame is needed."""
+    return data.to_frame() if isinstance(data, Candles) else data
+
+
+def as_candles(data: Union[pd.DataFrame, Candles]) -> Candles:
+    """Accept either representation where columnar arrays are needed."""
+    return data if isinstance(data, Candles) else Candles.from_frame(data)
@@ -0,0 +1,150 @@
+"""
+Higher-interval candles derived from a base interval.
+
+`resample(candles, "1h")` aggregates sorted base bars (any interval that
+divides the target, e.g. 5m -> 15m/1h/4h/1d) in one vectorized pass:
+bucket starts come from the bars' wall-clock time floored to the target
+step, and open/high/low/close/volume are taken with NumPy reduceat. Days
+are calendar days in the frame's timezone, the same sessions as
+`daily_ohlc_table` in the pivot strategies; intraday buckets are aligned
+to midnight. The last bucket is kept even when it is still forming, as a
+provider would return it.
+
+`Resampler` keeps one derived interval up to date as base bars arrive. It
+holds only the base bars of the bucket still forming and merges the new
+derived bars into a CandleWindow, so each update costs the new bars plus
+one bucket. `fetch_resampled` and `load_resampled` serve derived
+intervals from the candle store: the first through one base fetch (only
+the missing tail reaches the provider), the second from disk only.
+"""
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .candles import FIELDS
+from .store import INTERVAL_SECONDS, CandleStore, default_store, fetch_candles
+from .window import CandleWindow
+
+_PRICE_FIELDS = FIELDS[1:]
+
+
+def _step_ns(interval: str) -> int:
+    step = INTERVAL_SECONDS.get(interval)
+    if step is None or step > 86400:
+        # Weeks and months are calendar periods, not multiples of a fixed step
+        raise ValueError(f"Cannot resample to interval: {interval}")
+    return step * 10**9
+
+
+def resample(candles: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    `interval` bars from base candles in the fetch_candles layout (sorted
+    DatetimeIndex of bar open times), in the same layout and timezone.
+    """
+    step = _step_ns(interval)
+    if candles.empty:
+        return pd.DataFrame(columns=list(FIELDS), index=candles.index[:0])
+    index = candles.index
+    utc = index.asi8
+    wall = index.tz_localize(None).asi8 if index.tz is not None else utc
+    bucket = wall - wall % step
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.append(starts[1:], len(bucket))
+
+    prices = candles[list(_PRICE_FIELDS)].to_numpy(dtype=np.float64)
+    # Bucket start as an instant: the first bar's instant less its offset into the bucket
+    time_ns = utc[starts] - (wall[starts] - bucket[starts])
+    out_index = pd.DatetimeIndex(time_ns.view("datetime64[ns]"))
+    if index.tz is not None:
+        out_index = out_index.tz_localize("UTC").tz_convert(index.tz)
+    return pd.DataFrame({
+        "timestamp": time_ns // 10**9,
+        "open": prices[starts, 0],
+        "high": np.maximum.reduceat(prices[:, 1], starts),
+        "low": np.minimum.reduceat(prices[:, 2], starts),
+        "close": prices[ends - 1, 3],
+        "volume": np.add.reduceat(prices[:, 4], starts),
+    }, index=out_index)
+
+
+class Resampler:
+    """
+    Incrementally maintained `interval` bars of one symbol. Feed it base
+    bars with `update` (overlapping fetches are fine; a re-sent forming base
+    bar replaces the earlier one) and read the last `capacity` derived bars
+    through `frame()` / `candles()`.
+    """
+
+    def __init__(self, symbol: str, interval: str, capacity: int = 300) -> None:
+        _step_ns(interval)
+        self.symbol = symbol
+        self.interval = interval
+        self.window = CandleWindow(symbol, interval, capacity)
+        self._pending: Optional[pd.DataFrame] = None  # base bars of the bucket still forming
+
+    def __len__(self) -> int:
+        return len(self.window)
+
+    def update(self, base: pd.DataFrame) -> int:
+        """Fold new base bars in; returns the number of derived bars appended."""
+        if base is None or base.empty:
+            return 0
+        base = base[list(FIELDS)]
+        if self._pending is not None:
+            # Bars before the forming bucket are already final in the window
+            base = pd.concat([self._pending, base[base.index >= self._pending.index[0]]])
+            base = base[~base.index.duplicated(keep="last")].sort_index()
+        bars = resample(base, self.interval)
+        self._pending = base[base.index >= bars.index[-1]]
+        return self.window.merge(bars)
+
+    def frame(self) -> pd.DataFrame:
+        return self.window.frame()
+
+    def candles(self):
+        return self.window.candles()
+
+
+def _bars_per(interval: str, base_interval: str) -> int:
+    step, base_step = _step_ns(interval), INTERVAL_SECONDS[base_interval] * 10**9
+    if step % base_step:
+        raise ValueError(f"{interval} is not a multiple of {base_interval}")
+    return step // base_step
+
+
+def fetch_resampled(symbol: str, interval: str, lookback: int, base_interval: str = "5m",
+                    fetch: Callable[[str, str, int], pd.DataFrame] = fetch_candles) -> pd.DataFrame:
+    """
+    Last `lookback` `interval` bars derived from `base_interval` candles
+    fetched through the store. Providers cap intraday history (Yahoo: 60 days
+    of 5m, 730 of 1h), so pick a base that reaches back far enough.
+    """
+    if interval == base_interval:
+        return fetch(symbol, interval, lookback)
+    # One extra bucket so the oldest derived bar is complete
+    base = fetch(symbol, base_interval, (lookback + 1) * _bars_per(interval, base_interval))
+    return resample(base, interval).tail(lookback)
+
+
+def load_resampled(symbol: str, interval: str, lookback: Optional[int] = None,
+                   store: Optional[CandleStore] = None) -> pd.DataFrame:
+    """
+    `interval` bars from whatever is already stored for `symbol`, never
+    calling the provider: the finest stored interval that divides `interval`
+    and covers `lookback` bars, else the one giving the most bars. Empty
+    frame when nothing usable is stored.
+    """
+    store = store or default_store()
+    step = _step_ns(interval)
+    best = pd.DataFrame(columns=list(FIELDS))
+    for base_interval in store.intervals(symbol):
+        if step % (INTERVAL_SECONDS[base_interval] * 10**9):
+            continue
+        candles = store.load(symbol, base_interval)
+        bars = candles if base_interval == interval else resample(candles, interval)
+        if lookback is not None and len(bars) >= lookback:
+            return bars.tail(lookback)
+        if len(bars) > len(best):
+            best = bars
+    return best if lookback is None else best.tail(lookback)
@@ -0,0 +1,273 @@
+"""
+Local on-disk candle store.
+
+Candles are kept per (symbol, interval) as an append-only file of fixed-size
+NumPy records (.bin), so a read copies only the requested tail. On each
+request only the bars missing since the last cached bar are fetched from the
+provider; they replace just the stored rows they overlap (the re-fetched
+forming bar) and are appended, so a poll costs the new bars, not the stored
+history. Files are compacted to the last DATA_CACHE_MAX_BARS bars once they
+outgrow it by a quarter. With offline=True (or DATA_OFFLINE=1) the provider
+is never called and everything is served from disk.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..profiling import timed, timer
+
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "4h": 4 * 3600,  # no provider serves it; derived with bot.data.resample
+    "1d": 86400,
+    "1wk": 7 * 86400,
+    "1mo": 30 * 86400,
+}
+
+_PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+_DTYPE = np.dtype([("time", "<i8"), ("timestamp", "<i8")] + [(c, "<f8") for c in _PRICE_COLUMNS])
+
+
+def _provider_fetch(symbol: str, interval: str, lookback: int) -> pd.DataFrame:
+    if settings.data_provider == "synthetic":
+        from .synthetic import fetch_candles as provider_fetch_candles
+    else:
+        from .yahoo import fetch_candles as provider_fetch_candles
+    return provider_fetch_candles(symbol, interval, lookback)
+
+
+class CandleStore:
+    def __init__(self, root: Optional[str] = None,
+                 provider: Callable[[str, str, int], pd.DataFrame] = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.root = Path(root or settings.data_cache_dir)
+        self.provider = provider or _provider_fetch
+        self.clock = clock
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, path: Path) -> threading.Lock:
+        """Serializes writers of one file; sessions on the same symbol/interval share it."""
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    @staticmethod
+    def _tmp(path: Path) -> Path:
+        # Unique per process and thread, so concurrent writers never share a temp file
+        return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        path = self.root / f"{safe}_{interval}.bin"
+        legacy = path.with_suffix(".npy")
+        if legacy.exists() and not path.exists():
+            with self._lock(path):
+                if legacy.exists() and not path.exists():
+                    # Whole-array .npy files from before the append-only layout
+                    tmp = self._tmp(path)
+                    self._write_rows(tmp, np.load(legacy), 0)
+                    os.replace(tmp, path)
+                    legacy.unlink()
+        return path
+
+    def intervals(self, symbol: str) -> List[str]:
+        """Intervals with candles stored for `symbol`, shortest first."""
+        found = [iv for iv in INTERVAL_SECONDS if self._path(symbol, iv).exists()]
+        return sorted(found, key=INTERVAL_SECONDS.get)
+
+    @staticmethod
+    def _rows(path: Path) -> int:
+        try:
+            # A record torn by a crash mid-append is ignored
+            return path.stat().st_size // _DTYPE.itemsize
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _read_rows(path: Path, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty(0, dtype=_DTYPE)
+        return np.fromfile(path, dtype=_DTYPE, count=stop - start, offset=start * _DTYPE.itemsize)
+
+    @staticmethod
+    def _write_rows(path: Path, arr: np.ndarray, start: int) -> None:
+        """Replace the stored rows from `start` on with `arr`."""
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.seek(start * _DTYPE.itemsize)
+            f.write(arr.tobytes())
+            f.truncate()
+
+    def load(self, symbol: str, interval: str, lookback: Optional[int] = None) -> pd.DataFrame:
+        """Cached candles (last `lookback` rows if given); empty frame if nothing is stored."""
+        path = self._path(symbol, interval)
+        with self._lock(path):
+            rows = self._rows(path)
+            if not rows:
+                return pd.DataFrame(columns=["timestamp", *_PRICE_COLUMNS])
+            start = max(0, rows - lookback) if lookback else 0
+            return self._to_frame(self._read_rows(path, start, rows), self._read_tz(path))
+
+    def save(self, symbol: str, interval: str, candles: pd.DataFrame) -> None:
+        """Replace everything stored for (symbol, interval) with `candles`."""
+        path = self._path(symbol, interval)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock(path):
+            self._replace(path, candles)
+
+    def _replace(self, path: Path, candles: pd.DataFrame) -> None:
+        tmp = self._tmp(path)
+        self._write_rows(tmp, self._to_array(candles), 0)
+        os.replace(tmp, path)
+        self._write_tz(path, candles.index.tz)
+
+    def append(self, symbol: str, interval: str, candles: pd.DataFrame) -> None:
+        """
+        Merge `candles` into the store: stored rows from the first new bar on
+        are read back, merged (new bars win) and rewritten; older rows are
+        not touched. Writers in this process are serialized per file; other
+        processes appending the same bars only rewrite the same records.
+        """
+        if candles.empty:
+            return
+        path = self._path(symbol, interval)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock(path):
+            self._append(path, candles)
+
+    def _append(self, path: Path, candles: pd.DataFrame) -> None:
+        rows = self._rows(path)
+        start = rows
+        if rows:
+            first = self._to_array(candles.sort_index().iloc[:1])["time"][0]
+            times = np.memmap(path, dtype=_DTYPE, mode="r", shape=(rows,))["time"]
+            start = int(np.searchsorted(times, first))
+            del times  # release the map before writing
+        overlap = self._to_frame(self._read_rows(path, start, rows), self._read_tz(path))
+        merged = self._merge(overlap, candles)
+        self._write_rows(path, self._to_array(merged), start)
+        self._write_tz(path, merged.index.tz)
+
+        cap = settings.data_cache_max_bars
+        if cap and start + len(merged) > cap + cap // 4:
+            keep = self._read_rows(path, start + len(merged) - cap, start + len(merged))
+            self._replace(path, self._to_frame(keep, self._read_tz(path)))
+
+    def fetch(self, symbol: str, interval: str, lookback: int, offline: Optional[bool] = None) -> pd.DataFrame:
+        """Last `lookback` candles, fetching only the missing tail from the provider."""
+        if offline is None:
+            offline = settings.data_offline
+        cached = self.load(symbol, interval, lookback)
+        if offline:
+            return cached
+
+        fresh_lookback = self._missing_bars(cached, interval, lookback)
+        try:
+            with timer("fetch.provider"):
+                fresh = self.provider(symbol, interval, fresh_lookback)
+        except Exception as e:
+            if cached.empty:
+                raise
+            print(f"Fetch failed for {symbol} {interval}, serving cached candles: {e}")
+            return cached
+
+        if fresh is None or fresh.empty:
+            return cached
+        if not isinstance(fresh.index, pd.DatetimeIndex):
+            # Nothing to key the merge on; pass provider data through uncached
+            return fresh.tail(lookback)
+
+        self.append(symbol, interval, fresh)
+        return self.load(symbol, interval, lookback)
+
+    def _missing_bars(self, cached: pd.DataFrame, interval: str, lookback: int) -> int:
+        step = INTERVAL_SECONDS.get(interval)
+        if cached.empty or step is None or len(cached) < lookback:
+            return lookback
+        last_time = cached.index[-1].timestamp()
+        elapsed = max(0.0, self.clock() - last_time)
+        # +1 re-fetches the last (possibly still forming) bar
+        return min(lookback, int(math.ceil(elapsed / step)) + 1)
+
+    @staticmethod
+    def _merge(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+        fresh = fresh[["timestamp", *_PRICE_COLUMNS]]
+        if cached.empty:
+            merged = fresh
+        else:
+            if fresh.index.tz is not None and cached.index.tz is not None:
+                cached = cached.tz_convert(fresh.index.tz)
+            merged = pd.concat([cached, fresh])
+        merged = merged[~merged.index.duplicated(keep="last")]
+        return merged.sort_index()
+
+    @staticmethod
+    def _to_array(candles: pd.DataFrame) -> np.ndarray:
+        arr = np.empty(len(candles), dtype=_DTYPE)
+        index = candles.index
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        arr["time"] = index.asi8
+        arr["timestamp"] = candles["timestamp"].to_numpy(dtype=np.int64)
+        for c in _PRICE_COLUMNS:
+            arr[c] = candles[c].to_numpy(dtype=np.float64)
+        return arr
+
+    @staticmethod
+    def _to_frame(arr: np.ndarray, tz: Optional[str]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(arr["time"].astype("datetime64[ns]"))
+        if tz is not None:
+            index = index.tz_localize("UTC").tz_convert(tz)
+        data = {"timestamp": arr["timestamp"]}
+        data.update({c: arr[c] for c in _PRICE_COLUMNS})
+        return pd.DataFrame(data, index=index)
+
+    @classmethod
+    def _write_tz(cls, path: Path, tz) -> None:
+        meta = path.with_suffix(".json")
+        text = json.dumps({"tz": str(tz) if tz is not None else None})
+        if not meta.exists() or meta.read_text() != text:
+            tmp = cls._tmp(meta)
+            tmp.write_text(text)
+            os.replace(tmp, meta)
+
+    @staticmethod
+    def _read_tz(path: Path) -> Optional[str]:
+        meta = path.with_suffix(".json")
+        if not meta.exists():
+            return None
+        return json.loads(meta.read_text()).get("tz")
+
+
+_default_store: Optional[CandleStore] = None
+
+
+def default_store() -> CandleStore:
+    """The process-wide store behind fetch_candles."""
+    global _default_store
+    if _default_store is None:
+        # Synthetic candles never share files with real provider data
+        root = os.path.join(settings.data_cache_dir, "synthetic") if settings.data_provider == "synthetic" else None
+        _default_store = CandleStore(root)
+    return _default_store
+
+
+@timed("fetch")
+def fetch_candles(symbol: str, interval: str, lookback: int) -> pd.DataFrame:
+    """Drop-in replacement for the provider's fetch_candles, served through the local store."""
+    return default_store().fetch(symbol, interval, lookback)
@@ -0,0 +1,16 @@
+"""
+Symbol classification shared by the data, strategy and metrics layers.
+
+Crypto trades around the clock and gets its own pivot thresholds and
+synthetic model; everything else is treated as an exchange-listed stock or
+ETF with 6.5h sessions.
+"""
+
+_CRYPTO_SUFFIXES = ("-USD", "-USDT", "USDT")
+_CRYPTO_TOKENS = ("BTC", "ETH", "CRYPTO")
+
+
+def is_crypto(symbol: str) -> bool:
+    """Yahoo crypto pairs (BTC-USD), exchange pairs (BTCUSDT) and bare BTC/ETH symbols."""
+    sym = (symbol or "").upper()
+    return sym.endswith(_CRYPTO_SUFFIXES) or any(token in sym for token in _CRYPTO_TOKENS)
@@ -0,0 +1,159 @@
+"""
+Fixed-size live candle window.
+
+A live session only ever needs its last `capacity` bars, and between two
+ticks only the forming bar changes or a new one starts. `CandleWindow`
+keeps those bars in preallocated columns and merges each fetch in place:
+a bar with the last bar's time overwrites it, newer bars are appended and
+push the oldest out. Memory stays at `capacity` bars per window however
+long it runs.
+
+Each column is stored twice back to back (a mirrored ring), so the window
+is always one contiguous slice and `frame()` / `candles()` hand strategies
+zero-copy views instead of rebuilding a frame per tick. The view objects
+are cached until a bar is appended, so a tick that only updates the
+forming bar allocates nothing here. Views follow later merges; copy them to
+keep a snapshot, and do not write into them.
+"""
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .candles import FIELDS, Candles
+from .store import INTERVAL_SECONDS, fetch_candles
+
+_PRICE_FIELDS = FIELDS[1:]
+
+
+class CandleWindow:
+    def __init__(self, symbol: str, interval: str, capacity: int = 300) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        self.tz = None
+        self._time = np.zeros(2 * capacity, dtype=np.int64)       # bar open, ns since epoch (UTC)
+        self._timestamp = np.zeros(2 * capacity, dtype=np.int64)  # the frames' epoch-seconds column
+        self._prices = {f: np.zeros(2 * capacity) for f in _PRICE_FIELDS}
+        self._next = 0   # ring slot the next new bar goes to
+        self._len = 0
+        self._views = {}  # cached frame / candles / index for the current span
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def empty(self) -> bool:
+        return self._len == 0
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Open time of the newest bar in ns, or None when empty."""
+        return int(self._time[(self._next - 1) % self.capacity]) if self._len else None
+
+    def _write(self, slot: int, time_ns: int, row: np.ndarray) -> None:
+        """Write one bar (a FIELDS-ordered row) to `slot` and its mirror."""
+        for pos in (slot, slot + self.capacity):
+            self._time[pos] = time_ns
+            self._timestamp[pos] = row[0]
+            for k, f in enumerate(_PRICE_FIELDS, 1):
+                self._prices[f][pos] = row[k]
+
+    def merge(self, candles: pd.DataFrame) -> int:
+        """
+        Merge a fetched frame (fetch_candles layout): rows at the last bar's
+        time replace it, newer rows are appended, older rows are ignored.
+        Returns the number of bars appended.
+        """
+        if candles is None or candles.empty:
+            return 0
+        index = candles.index
+        if self.tz is None and self._len == 0:
+            self.tz = index.tz
+        times = index.asi8
+        last = self.last_time
+        start = 0 if last is None else int(np.searchsorted(times, last, side="left"))
+        if start >= len(times):
+            return 0
+        # One conversion of the whole (usually 1-2 row) frame; per-column access on a fresh frame costs far more
+        if tuple(candles.columns) != FIELDS:
+            candles = candles[list(FIELDS)]
+        rows = candles.to_numpy(dtype=np.float64)[start:]
+        times = times[start:]
+
+        if last is not None and times[0] == last:
+            self._write((self._next - 1) % self.capacity, times[0], rows[0])
+            times, rows = times[1:], rows[1:]
+        appended = len(times)
+        if appended == 0:
+            return 0
+        if appended <= 4:
+            # The usual tick: one new bar, written in place without temporaries
+            for k in range(appended):
+                self._write(self._next, times[k], rows[k])
+                self._next = (self._next + 1) % self.capacity
+        else:
+            keep = min(appended, self.capacity)
+            slots = (self._next + np.arange(appended - keep, appended)) % self.capacity
+            for pos in (slots, slots + self.capacity):
+                self._time[pos] = times[-keep:]
+                self._timestamp[pos] = rows[-keep:, 0]
+                for k, f in enumerate(_PRICE_FIELDS, 1):
+                    self._prices[f][pos] = rows[-keep:, k]
+            self._next = (self._next + appended) % self.capacity
+        self._len = min(self._len + appended, self.capacity)
+        self._views.clear()
+        return appended
+
+    def _span(self) -> slice:
+        start = (self._next - self._len) % self.capacity
+        return slice(start, start + self._len)
+
+    def candles(self) -> Candles:
+        """Columnar view of the window (prices zero-copy; timestamps as float64 like Candles elsewhere)."""
+        view = self._views.get("candles")
+        if view is None:
+            span = self._span()
+            prices = self._prices
+            view = self._views["candles"] = Candles(
+                self._timestamp[span], prices["open"][span], prices["high"][span], prices["low"][span],
+                prices["close"][span], prices["volume"][span], index=self.index())
+        return view
+
+    def index(self) -> pd.DatetimeIndex:
+        view = self._views.get("index")
+        if view is None:
+            values = self._time[self._span()].view("datetime64[ns]")
+            dtype = pd.DatetimeTZDtype(tz=self.tz) if self.tz is not None else values.dtype
+            view = self._views["index"] = pd.DatetimeIndex(pd.arrays.DatetimeArray(values, dtype=dtype))
+        return view
+
+    def frame(self) -> pd.DataFrame:
+        """Zero-copy frame in the fetch_candles layout (the columns are views into the window)."""
+        view = self._views.get("frame")
+        if view is None:
+            span = self._span()
+            data = {"timestamp": self._timestamp[span]}
+            data.update((f, self._prices[f][span]) for f in _PRICE_FIELDS)
+            view = self._views["frame"] = pd.DataFrame(data, index=self.index(), copy=False)
+        return view
+
+    def refresh(self, fetch: Callable[[str, str, int], pd.DataFrame] = fetch_candles,
+                now: Optional[float] = None) -> int:
+        """
+        Bring the window up to date: the first call loads `capacity` bars,
+        later calls fetch only the bars since the newest one (plus that bar,
+        which may still be forming). Returns the number of bars appended.
+        """
+        if self.empty:
+            return self.merge(fetch(self.symbol, self.interval, self.capacity))
+        step = INTERVAL_SECONDS.get(self.interval)
+        if step is None:
+            missing = self.capacity
+        else:
+            elapsed = (time.time() if now is None else now) - self.last_time / 1e9
+            missing = min(self.capacity, max(0, int(elapsed // step)) + 1)
+        return self.merge(fetch(self.symbol, self.interval, missing))
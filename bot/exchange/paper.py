@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from ..profiling import timed
+
 
 @dataclass
 class Fill:
@@ -16,6 +18,7 @@ class PaperExchange:
         self.trades: list[Fill] = []
         self.avg_entry_price: float | None = None
 
+    @timed("exchange.fill")
     def market_buy(self, symbol: str, qty: int, price: float) -> Fill:
         cost = qty * price
         if cost > self.cash:
@@ -36,6 +39,7 @@ class PaperExchange:
         self.trades.append(fill)
         return fill
 
+    @timed("exchange.fill")
     def market_sell(self, symbol: str, qty: int, price: float) -> Fill:
         qty = min(qty, self.position)
         proceeds = qty * price
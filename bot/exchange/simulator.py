@@ -0,0 +1,248 @@
+"""
+Event-driven order simulation on top of PaperExchange.
+
+Resting limit and stop orders are matched against each bar's open/high/low
+instead of the close. The order book is a set of parallel NumPy arrays, so
+checking thousands of resting orders on a bar is a handful of vectorized
+comparisons. Fills are booked through PaperExchange.market_buy/market_sell
+at the simulated fill price.
+
+Intrabar path: the bar is assumed to trade open -> low -> high -> close when
+it closes up (close >= open) and open -> high -> low -> close otherwise.
+Orders fill in the order the path reaches them; an order already marketable
+at the open fills at the open (gap), otherwise at its own price. Fills that
+arm other orders (bracket legs) or cancel them (OCO) take effect for the
+rest of the same bar.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .paper import Fill, PaperExchange
+
+BUY, SELL = 1, -1
+LIMIT, STOP = 0, 1
+
+_NEW, _ACTIVE, _DONE = 0, 1, 2  # waiting for parent fill / resting / filled or cancelled
+
+
+@dataclass
+class OrderFill:
+    order_id: int
+    side: str
+    kind: str
+    price: float
+    qty: float
+    tag: Optional[str]
+    timestamp: object
+    fill: Fill
+
+
+def _bar_path(o: float, h: float, l: float, c: float) -> Tuple[float, float, float, float]:
+    return (o, l, h, c) if c >= o else (o, h, l, c)
+
+
+def _path_price(path: tuple, t: float) -> float:
+    k = min(int(t), 2)
+    p0, p1 = path[k], path[k + 1]
+    return p0 + (p1 - p0) * (t - k)
+
+
+def _trigger_times(prices: np.ndarray, wants_down: np.ndarray, path: tuple,
+                   start: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First point at or after `start` on the 0..3 bar path where each order is
+    marketable (inf if never), and whether it already is at `start`.
+    wants_down: order fills once price <= its level (buy limit, sell stop);
+    otherwise once price >= its level.
+    """
+    now = _path_price(path, start)
+    immediate = np.where(wants_down, now <= prices, now >= prices)
+    t = np.where(immediate, start, np.inf)
+    k0 = min(int(start), 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k in range(k0, 3):
+            p0 = now if k == k0 else path[k]
+            p1 = path[k + 1]
+            if p1 == p0:
+                continue
+            if p1 < p0:
+                hit = wants_down & (p1 <= prices) & (prices < p0)
+            else:
+                hit = ~wants_down & (p1 >= prices) & (prices > p0)
+            hit &= np.isinf(t)
+            t0 = start if k == k0 else k
+            t[hit] = t0 + (prices[hit] - p0) / (p1 - p0) * (k + 1 - t0)
+    return t, immediate
+
+
+class OrderSimulator:
+    def __init__(self, exchange: Optional[PaperExchange] = None, symbol: str = "",
+                 starting_cash: float = 10000.0, commission: float = 0.0, capacity: int = 64) -> None:
+        self.exchange = exchange if exchange is not None else PaperExchange(starting_cash)
+        self.symbol = symbol
+        self.commission = commission  # fraction of notional, deducted from cash on every fill
+        self._n = 0
+        self._next_id = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int) -> None:
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.sides = np.empty(capacity, dtype=np.int8)
+        self.kinds = np.empty(capacity, dtype=np.int8)
+        self.prices = np.empty(capacity, dtype=np.float64)
+        self.qtys = np.empty(capacity, dtype=np.float64)
+        self.states = np.empty(capacity, dtype=np.int8)
+        self.parents = np.empty(capacity, dtype=np.int64)  # order id whose fill arms this one (qty capped at that fill), -1 none
+        self.ocos = np.empty(capacity, dtype=np.int64)     # OCO group id, -1 none
+        self.tags = np.empty(capacity, dtype=object)
+
+    def _compact(self) -> None:
+        """Drop filled/cancelled rows so matching only scans live orders."""
+        live = self.states[:self._n] != _DONE
+        keep = int(live.sum())
+        for name in ("ids", "sides", "kinds", "prices", "qtys", "states", "parents", "ocos", "tags"):
+            col = getattr(self, name)
+            col[:keep] = col[:self._n][live]
+        self._n = keep
+
+    def _grow(self) -> None:
+        self._compact()
+        if self._n * 2 < len(self.ids):
+            return
+        n = self._n
+        old = {name: getattr(self, name)[:n].copy()
+               for name in ("ids", "sides", "kinds", "prices", "qtys", "states", "parents", "ocos", "tags")}
+        self._alloc(2 * len(self.ids))
+        for name, values in old.items():
+            getattr(self, name)[:n] = values
+
+    # --- order entry ---------------------------------------------------
+
+    def submit(self, side: int, kind: int, qty: float, price: float, tag: Optional[str] = None,
+               parent: int = -1, oco: int = -1) -> int:
+        if self._n == len(self.ids):
+            self._grow()
+        i = self._n
+        order_id = self._next_id
+        self._next_id += 1
+        self.ids[i] = order_id
+        self.sides[i] = side
+        self.kinds[i] = kind
+        self.prices[i] = price
+        self.qtys[i] = qty
+        self.states[i] = _NEW if parent >= 0 else _ACTIVE
+        self.parents[i] = parent
+        self.ocos[i] = oco
+        self.tags[i] = tag
+        self._n += 1
+        return order_id
+
+    def limit(self, side: int, qty: float, price: float, tag: Optional[str] = None) -> int:
+        return self.submit(side, LIMIT, qty, price, tag)
+
+    def stop(self, side: int, qty: float, price: float, tag: Optional[str] = None) -> int:
+        return self.submit(side, STOP, qty, price, tag)
+
+    def bracket(self, qty: float, entry: float, stop_loss: float, take_profit: float,
+                entry_kind: int = LIMIT, tag: Optional[str] = None) -> Tuple[int, int, int]:
+        """
+        Long entry plus a protective stop and a take-profit limit. The exit
+        legs are armed by the entry fill (capped at the filled quantity) and
+        cancel each other.
+        """
+        parent = self.submit(BUY, entry_kind, qty, entry, tag)
+        stop_id = self.submit(SELL, STOP, qty, stop_loss, tag, parent=parent, oco=parent)
+        take_id = self.submit(SELL, LIMIT, qty, take_profit, tag, parent=parent, oco=parent)
+        return parent, stop_id, take_id
+
+    def cancel(self, order_id: int) -> None:
+        live = self.states[:self._n] != _DONE
+        hit = live & ((self.ids[:self._n] == order_id) | (self.parents[:self._n] == order_id))
+        self.states[:self._n][hit] = _DONE
+
+    def cancel_all(self, tag: Optional[str] = None) -> None:
+        live = self.states[:self._n] != _DONE
+        if tag is not None:
+            live &= self.tags[:self._n] == tag
+        self.states[:self._n][live] = _DONE
+
+    def open_orders(self, tag: Optional[str] = None) -> List[int]:
+        live = self.states[:self._n] != _DONE
+        if tag is not None:
+            live &= self.tags[:self._n] == tag
+        return self.ids[:self._n][live].tolist()
+
+    # --- matching ------------------------------------------------------
+
+    def on_bar(self, open_: float, high: float, low: float, close: float, timestamp=None) -> List[OrderFill]:
+        """Match resting orders against one bar; returns the fills in path order."""
+        fills: List[OrderFill] = []
+        if self._n > 64 and (self.states[:self._n] == _DONE).sum() * 2 > self._n:
+            self._compact()
+        n = self._n
+        if n == 0:
+            return fills
+        path = _bar_path(open_, high, low, close)
+        sides = self.sides[:n]
+        kinds = self.kinds[:n]
+        prices = self.prices[:n]
+        states = self.states[:n]
+        wants_down = (sides == BUY) == (kinds == LIMIT)
+        times, immediate = _trigger_times(prices, wants_down, path)
+        now = 0.0
+        while True:
+            candidates = np.where(states == _ACTIVE, times, np.inf)
+            i = int(np.argmin(candidates))
+            if not np.isfinite(candidates[i]):
+                break
+            now = float(candidates[i])
+            # Marketable when it became live: fill at the market, else at the order's price
+            price = _path_price(path, now) if immediate[i] else float(prices[i])
+            fill = self._execute(i, price)
+            states[i] = _DONE
+            if fill.qty > 0:
+                fills.append(OrderFill(
+                    order_id=int(self.ids[i]),
+                    side="buy" if sides[i] == BUY else "sell",
+                    kind="limit" if kinds[i] == LIMIT else "stop",
+                    price=price,
+                    qty=fill.qty,
+                    tag=self.tags[i],
+                    timestamp=timestamp,
+                    fill=fill,
+                ))
+            armed = self._after_fill(i, fill.qty)
+            if armed.any():
+                times[armed], immediate[armed] = _trigger_times(prices[armed], wants_down[armed], path, now)
+        return fills
+
+    def _execute(self, i: int, price: float) -> Fill:
+        ex = self.exchange
+        qty = float(self.qtys[i])
+        if self.sides[i] == BUY:
+            fill = ex.market_buy(self.symbol, qty, price)
+        else:
+            fill = ex.market_sell(self.symbol, qty, price)
+        if self.commission and fill.qty > 0:
+            ex.cash -= abs(fill.cost) * self.commission
+        return fill
+
+    def _after_fill(self, i: int, filled_qty: float) -> np.ndarray:
+        """Arm (or drop) the order's children and cancel its OCO siblings; returns the armed mask."""
+        n = self._n
+        order_id = self.ids[i]
+        states = self.states[:n]
+        children = (self.parents[:n] == order_id) & (states == _NEW)
+        if filled_qty > 0:
+            states[children] = _ACTIVE
+            qtys = self.qtys[:n]
+            qtys[children] = np.minimum(qtys[children], filled_qty)
+        else:
+            states[children] = _DONE
+        group = self.ocos[i]
+        if group >= 0:
+            siblings = (self.ocos[:n] == group) & (states == _ACTIVE) & (self.ids[:n] != order_id)
+            states[siblings] = _DONE
+        return children & (states == _ACTIVE)
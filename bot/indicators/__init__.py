@@ -0,0 +1,25 @@
+"""
+Streaming (O(1) per bar) technical indicators.
+
+Each indicator keeps its own rolling state: feed bars one at a time with
+update(...) and read .value. The simple variants reproduce the pandas
+rolling/ewm math used in bot.strategy, so a strategy fed bar by bar gives
+the same numbers as recomputing its DataFrame series on every prefix.
+"""
+from .moving import SMA, EMA, RollingStd, RollingMax, RollingMin
+from .momentum import RSI
+from .volatility import TrueRange, ATR, Bollinger
+from .volume import VWAP
+
+__all__ = [
+    "SMA",
+    "EMA",
+    "RollingStd",
+    "RollingMax",
+    "RollingMin",
+    "RSI",
+    "TrueRange",
+    "ATR",
+    "Bollinger",
+    "VWAP",
+]
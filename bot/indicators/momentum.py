@@ -0,0 +1,68 @@
+import math
+from .moving import SMA
+
+
+def _div(a: float, b: float) -> float:
+    """Division with NumPy semantics (x/0 -> +-inf, 0/0 -> nan) like the pandas series math."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+class RSI:
+    """
+    Relative Strength Index, O(1) per update.
+    method="simple": rolling mean of gains/losses, exactly what the strategies
+    compute with delta.where(...).rolling(period).mean().
+    method="wilder": Wilder's smoothing seeded with the first simple average.
+    """
+
+    def __init__(self, period: int = 14, method: str = "simple"):
+        if method not in ("simple", "wilder"):
+            raise ValueError(f"Unknown RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.value = math.nan
+        self.count = 0
+        self._prev_close = None
+        self._gain = SMA(period)
+        self._loss = SMA(period)
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.value == self.value
+
+    def update(self, close: float) -> float:
+        delta = math.nan if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+        self.count += 1
+
+        if self.method == "simple":
+            # Same as delta.where(delta > 0, 0) / -delta.where(delta < 0, 0):
+            # the first (NaN) delta counts as a zero gain and a -0.0 loss
+            gain = self._gain.update(delta if delta > 0 else 0.0)
+            loss = self._loss.update(-(delta if delta < 0 else 0))
+        else:
+            if delta != delta:
+                return self.value
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            n = self.count - 1
+            if n <= self.period:
+                self._avg_gain += (gain - self._avg_gain) / n
+                self._avg_loss += (loss - self._avg_loss) / n
+                if n < self.period:
+                    return self.value
+            else:
+                self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+                self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+            gain, loss = self._avg_gain, self._avg_loss
+
+        rs = _div(gain, loss)
+        self.value = 100 - _div(100, 1 + rs)
+        return self.value
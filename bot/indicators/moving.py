@@ -0,0 +1,200 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class SMA:
+    """
+    Simple moving average, O(1) per update.
+    Mirrors pandas rolling(window).mean() (Kahan-compensated running sum),
+    so values match the DataFrame-based strategies bit for bit.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.value = math.nan
+        self._values = deque()
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._neg_ct = 0
+        self._same_ct = 0
+        self._prev = None
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) >= self.window
+
+    def update(self, x: float) -> float:
+        values = self._values
+        if len(values) == self.window:
+            old = values.popleft()
+            y = -old - self._comp_remove
+            t = self._sum + y
+            self._comp_remove = t - self._sum - y
+            self._sum = t
+            if math.copysign(1.0, old) < 0:
+                self._neg_ct -= 1
+
+        values.append(x)
+        y = x - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        # Run of identical values: report the value itself, no float artifacts
+        if self._prev is None or x == self._prev:
+            self._same_ct += 1
+        else:
+            self._same_ct = 1
+        self._prev = x
+
+        nobs = len(values)
+        if nobs < self.window:
+            self.value = math.nan
+            return self.value
+        result = self._sum / nobs
+        if self._same_ct >= nobs:
+            result = x
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == nobs and result > 0:
+            result = 0.0
+        self.value = result
+        return result
+
+
+class EMA:
+    """
+    Exponential moving average, O(1) per update.
+    Same recursion as pandas ewm(span=span).mean() (adjust=True), so the first
+    bars are weighted exactly like the strategies' full-history series.
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        com = (span - 1) / 2.0
+        self._decay = 1.0 - 1.0 / (1.0 + com)
+        self._old_wt = 1.0
+        self.value = math.nan
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count > 0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.value = x
+            return x
+        self._old_wt *= self._decay
+        if self.value != x:
+            self.value = (self._old_wt * self.value + x) / (self._old_wt + 1.0)
+        self._old_wt += 1.0
+        return self.value
+
+
+class RollingStd:
+    """
+    Rolling sample standard deviation (ddof=1), O(1) per update.
+    Welford add/remove with Kahan compensation like pandas rolling(window).std().
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.value = math.nan
+        self._values = deque()
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_ct = 0
+        self._prev = None
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) >= self.window
+
+    def update(self, x: float) -> float:
+        values = self._values
+        if len(values) == self.window:
+            old = values.popleft()
+            nobs = len(values)
+            if nobs:
+                prev_mean = self._mean - self._comp_remove
+                y = old - self._comp_remove
+                t = y - self._mean
+                self._comp_remove = t + self._mean - y
+                self._mean = self._mean - t / nobs
+                self._ssqdm = self._ssqdm - (old - prev_mean) * (old - self._mean)
+            else:
+                self._mean = 0.0
+                self._ssqdm = 0.0
+
+        values.append(x)
+        nobs = len(values)
+        if self._prev is None or x == self._prev:
+            self._same_ct += 1
+        else:
+            self._same_ct = 1
+        self._prev = x
+        prev_mean = self._mean - self._comp_add
+        y = x - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean = self._mean + t / nobs
+        self._ssqdm = self._ssqdm + (x - prev_mean) * (x - self._mean)
+
+        if nobs < self.window or nobs < 2:
+            self.value = math.nan
+        elif self._same_ct >= nobs:
+            self.value = 0.0
+        else:
+            var = self._ssqdm / (nobs - 1)
+            self.value = math.sqrt(var) if var > 0 else 0.0
+        return self.value
+
+
+class _RollingExtreme(ABC):
+    """Monotonic deque: amortized O(1) rolling max/min."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.value = math.nan
+        self.count = 0
+        self._deque = deque()  # (bar number, value), values monotonic
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.window
+
+    @abstractmethod
+    def _dominates(self, new: float, old: float) -> bool:
+        """True if `new` makes the older deque entry `old` irrelevant."""
+
+    def update(self, x: float) -> float:
+        dq = self._deque
+        while dq and self._dominates(x, dq[-1][1]):
+            dq.pop()
+        dq.append((self.count, x))
+        self.count += 1
+        if dq[0][0] <= self.count - 1 - self.window:
+            dq.popleft()
+        self.value = dq[0][1] if self.count >= self.window else math.nan
+        return self.value
+
+
+class RollingMax(_RollingExtreme):
+    """Rolling maximum, like pandas rolling(window).max()."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    """Rolling minimum, like pandas rolling(window).min()."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
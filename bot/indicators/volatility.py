@@ -0,0 +1,76 @@
+import math
+from typing import Tuple
+from .moving import SMA, RollingStd
+
+
+class TrueRange:
+    """max(high - low, |high - prev close|, |low - prev close|); high - low on the first bar."""
+
+    def __init__(self):
+        self.value = math.nan
+        self._prev_close = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = tr
+        return tr
+
+
+class ATR:
+    """
+    Average True Range, O(1) per update.
+    method="simple" is the rolling mean the strategies use; "wilder" applies
+    Wilder's smoothing after a simple-average seed.
+    """
+
+    def __init__(self, period: int = 14, method: str = "simple"):
+        if method not in ("simple", "wilder"):
+            raise ValueError(f"Unknown ATR method: {method}")
+        self.period = period
+        self.method = method
+        self.value = math.nan
+        self.count = 0
+        self._tr = TrueRange()
+        self._sma = SMA(period)
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = self._tr.update(high, low, close)
+        self.count += 1
+        if self.method == "simple" or self.count <= self.period:
+            self.value = self._sma.update(tr)
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
+
+
+class Bollinger:
+    """Bollinger Bands: SMA(window) +- num_std * rolling std; update() returns (mid, upper, lower)."""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.window = window
+        self.num_std = num_std
+        self._sma = SMA(window)
+        self._std = RollingStd(window)
+        self.mid = self.upper = self.lower = math.nan
+
+    @property
+    def ready(self) -> bool:
+        return self._sma.ready
+
+    @property
+    def std(self) -> float:
+        return self._std.value
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        self.mid = self._sma.update(close)
+        std = self._std.update(close)
+        self.upper = self.mid + (std * self.num_std)
+        self.lower = self.mid - (std * self.num_std)
+        return self.mid, self.upper, self.lower
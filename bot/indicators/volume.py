@@ -0,0 +1,32 @@
+import math
+
+
+class VWAP:
+    """
+    Cumulative volume-weighted average price of the typical price (H+L+C)/3.
+    Call reset() at a session boundary for a session VWAP.
+    """
+
+    def __init__(self):
+        self.value = math.nan
+        self._pv = 0.0
+        self._volume = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.value == self.value
+
+    def reset(self) -> None:
+        self.value = math.nan
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        typical_price = (high + low + close) / 3
+        self._pv += typical_price * volume
+        self._volume += volume
+        if self._volume == 0:
+            self.value = math.nan
+        else:
+            self.value = self._pv / self._volume
+        return self.value
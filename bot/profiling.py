@@ -0,0 +1,250 @@
+"""
+Stage timers and whole-run profilers.
+
+`timer("fetch")` (context manager) and `@timed("db.equity")` (decorator)
+record the wall time of a named stage into a log-bucketed histogram, so
+p50/p95/p99 per stage cost a fixed 200 counters however long the bot runs.
+While disabled (the default) `timer` hands back a shared no-op context and
+`timed` wrappers call straight through after one flag check. PROFILE=1 or
+the CLI's --profile switch turns them on; `report()` / `format_report()`
+read the table.
+
+Stages recorded by the bot:
+    fetch, fetch.provider       candle store call / provider download within it
+    signal.<strategy>           one strategy evaluation
+    orders, exchange.fill       order handling incl. buffered writes / one paper fill
+    db.equity, db.trades, db.candles   SQLite writes
+    cycle                       one full live iteration (fetch to writes, no sleep)
+
+`Profiler` wraps a whole run: "cprofile" dumps a pstats file for the
+calling thread; "collapsed" samples the stacks of every thread and writes
+folded stacks ("a;b;c count" lines, for flamegraph.pl or speedscope).
+"""
+import cProfile
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .config import settings
+
+# Histogram buckets: 20 per decade from 100 ns to 1000 s
+_BUCKETS_PER_DECADE = 20
+_MIN_EXP = -7
+_N_BUCKETS = 10 * _BUCKETS_PER_DECADE
+
+_enabled = settings.profile
+_lock = threading.Lock()
+
+
+class StageStats:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * _N_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        i = int((math.log10(seconds) - _MIN_EXP) * _BUCKETS_PER_DECADE) if seconds > 0 else 0
+        self.buckets[min(max(i, 0), _N_BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-quantile (0..1): geometric middle of the bucket holding it, within ~6%."""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1) + 1
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(10 ** (_MIN_EXP + (i + 0.5) / _BUCKETS_PER_DECADE), self.max)
+        return self.max
+
+
+_stages: Dict[str, StageStats] = {}
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def record(stage: str, seconds: float) -> None:
+    with _lock:
+        stats = _stages.get(stage)
+        if stats is None:
+            stats = _stages[stage] = StageStats()
+        stats.add(seconds)
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self.stage, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage: str):
+    """`with timer("stage"):` records the block's wall time when profiling is on."""
+    return _Timer(stage) if _enabled else _NULL_TIMER
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """Decorator form of `timer`; the flag is checked per call, so enabling later still applies."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def reset() -> None:
+    with _lock:
+        _stages.clear()
+
+
+def report() -> Dict[str, Dict[str, float]]:
+    """Per stage: count, total, mean, p50, p95, p99 and max in seconds."""
+    with _lock:
+        return {
+            stage: {
+                "count": s.count,
+                "total": s.total,
+                "mean": s.total / s.count if s.count else 0.0,
+                "p50": s.percentile(0.50),
+                "p95": s.percentile(0.95),
+                "p99": s.percentile(0.99),
+                "max": s.max,
+            }
+            for stage, s in sorted(_stages.items())
+        }
+
+
+def format_report() -> str:
+    rows = report()
+    if not rows:
+        return "No stage timings recorded"
+    lines = [f"{'stage':28s} {'count':>8s} {'total s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"]
+    for stage, r in rows.items():
+        lines.append(f"{stage:28s} {r['count']:8d} {r['total']:9.3f} {r['p50'] * 1e3:9.3f} "
+                     f"{r['p95'] * 1e3:9.3f} {r['p99'] * 1e3:9.3f} {r['max'] * 1e3:9.3f}")
+    return "\n".join(lines)
+
+
+class _StackSampler(threading.Thread):
+    """Counts the folded stack of every other thread every `interval` seconds."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                names: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack = ";".join(reversed(names))
+                self.counts[stack] = self.counts.get(stack, 0) + 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """
+    mode "cprofile": cProfile of the thread that calls start(), written with
+    dump_stats (open with `python -m pstats` or snakeviz). mode "collapsed":
+    sampled folded stacks of all threads. Both also switch the stage timers
+    on for the duration of the run.
+    """
+
+    def __init__(self, mode: str = "cprofile", out: Optional[str] = None, interval: float = 0.005) -> None:
+        if mode not in ("cprofile", "collapsed"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.out = out or ("profile.prof" if mode == "cprofile" else "profile.folded")
+        self.interval = interval
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._was_enabled = False
+
+    def start(self) -> None:
+        self._was_enabled = _enabled
+        enable(True)
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _StackSampler(self.interval)
+            self._sampler.start()
+
+    def stop(self) -> str:
+        """Stop profiling and write the output file; returns its path."""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.out)
+            self._profile = None
+        if self._sampler is not None:
+            self._sampler.stop()
+            with open(self.out, "w", encoding="utf-8") as f:
+                for stack, n in sorted(self._sampler.counts.items()):
+                    f.write(f"{stack} {n}\n")
+            self._sampler = None
+        enable(self._was_enabled)
+        return self.out
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -1,35 +1,224 @@
+import asyncio
+import copy
+import math
 import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from .config import settings
-from .data.yahoo import fetch_candles
-from .strategy.sma import compute_sma_signals
+from .data.store import fetch_candles, INTERVAL_SECONDS
+from .data.window import CandleWindow
+from .strategy.sma import SMAStream
+from .strategy.simple_ema import SimpleEMAStream
+from .strategy.ema_rsi_atr import EMARSIATRStream
+from .strategy.bot_hunter import BotHunterStream
+from .strategy.momentum_strategy import MomentumStream
+from .strategy.vwap_strategy import VWAPStream
+from .strategy.ml_scalping_strategy import compute_ml_scalping_signals
+from .strategy.simple_reversal import compute_mean_reversion_signals
+from .strategy.ml_strategy import compute_ml_signals_cached
 from .exchange.paper import PaperExchange
-from .storage.db import Database
+from .backtest.metrics import StreamingMetrics, periods_per_year
+from .storage.db import Database, BufferedWriter
+from .profiling import timed, timer
 
 
 def run_loop(symbol: str, interval: str, sma_fast: int, sma_slow: int, lookback: int, position_size: int) -> None:
     db = Database()
+    writer = db.buffered_writer()
     ex = PaperExchange(starting_cash=settings.paper_starting_cash)
+    window = CandleWindow(symbol, interval, lookback)
+    signal_fn = StreamedSignal(lambda: SMAStream(sma_fast, sma_slow), ("close",))
 
-    while True:
-        df = fetch_candles(symbol=symbol, interval=interval, lookback=lookback)
-        if df.empty:
+    try:
+        while True:
+            with timer("cycle"):
+                window.refresh()
+                if not window.empty:
+                    df = window.frame()
+                    with timer("signal.sma"):
+                        signal = signal_fn(df)
+                    _apply_signal(ex, writer, symbol, df, signal.side, position_size)
+            writer.flush_if_due()
             time.sleep(5)
-            continue
+    finally:
+        writer.close()
+
+
+@timed("orders")
+def _apply_signal(ex: PaperExchange, writer: BufferedWriter, symbol: str, df: pd.DataFrame,
+                  side: str, position_size: float, metrics: Optional[StreamingMetrics] = None) -> None:
+    """Trade the last bar's signal on the paper exchange and record fill + equity (and live metrics)"""
+    last_row = df.iloc[-1]
+    price = float(last_row["close"]) if "close" in last_row else float(df["close"].iloc[-1])
+    timestamp = int(last_row["timestamp"])
+
+    fill = None
+    if side == "buy":
+        if ex.position <= 0:
+            fill = ex.market_buy(symbol, qty=position_size, price=price)
+    elif side == "sell":
+        if ex.position >= 0 and ex.position > 0:
+            entry_price = ex.avg_entry_price
+            fill = ex.market_sell(symbol, qty=min(position_size, ex.position), price=price)
+            if metrics is not None and fill.qty > 0 and entry_price is not None:
+                metrics.add_trade((fill.price - entry_price) * fill.qty)
+    if fill is not None and fill.qty > 0:
+        writer.record_trade(timestamp, symbol, fill.side, fill.qty, fill.price, fill.cost)
+
+    equity = ex.cash + ex.position * price
+    writer.record_equity(timestamp=timestamp, equity=equity, symbol=symbol)
+    if metrics is not None:
+        metrics.update(equity, timestamp)
+
+
+class StreamedSignal:
+    """
+    Signal function of a live frame backed by a bar-by-bar stream, O(1) per
+    new bar instead of a recompute over the whole window. The last bar of a
+    live frame is still forming: closed bars are fed to the stream once each,
+    and the forming bar is scored on a copy of it, so a changed close on the
+    next poll invalidates nothing. A frame that does not continue the fed
+    history (gap, revised close) starts the stream over.
+
+    The stream sees every bar since the session started, so path-dependent
+    indicators (EMAs, VWAP) are anchored at the session start rather than at
+    the start of the trailing window.
+    """
+
+    def __init__(self, make_stream: Callable[[], object], fields: Tuple[str, ...]) -> None:
+        self._make_stream = make_stream
+        self._fields = fields
+        self._stream = make_stream()
+        self._last_label = None   # index label of the last closed bar fed
+        self._last_close = math.nan
+        self._last_signal = None  # its signal, for a frame that ends on it
+
+    def __call__(self, df: pd.DataFrame):
+        closed = df.iloc[:-1]
+        start = 0
+        if self._last_label is not None:
+            try:
+                pos = closed.index.get_loc(self._last_label)
+            except KeyError:
+                pos = None
+            if isinstance(pos, int) and float(closed["close"].iloc[pos]) == self._last_close:
+                start = pos + 1
+            elif df.index[-1] == self._last_label and float(df["close"].iloc[-1]) == self._last_close:
+                return self._last_signal
+            else:
+                self._stream = self._make_stream()
+        if start < len(closed):
+            for bar in closed[list(self._fields)].iloc[start:].to_numpy(dtype=float).tolist():
+                self._last_signal = self._stream.update(*bar)
+            self._last_label = closed.index[-1]
+            self._last_close = float(closed["close"].iloc[-1])
+        forming = df[list(self._fields)].iloc[-1].to_numpy(dtype=float).tolist()
+        return copy.deepcopy(self._stream).update(*forming)
+
+
+# Strategies a live session can run: name -> (session -> signal function of the candle frame).
+# Strategies with a bar-by-bar stream keep it per session; the rest recompute over the window.
+SESSION_STRATEGIES: Dict[str, Callable[["Session"], Callable[[pd.DataFrame], object]]] = {
+    "sma": lambda s: StreamedSignal(lambda: SMAStream(s.sma_fast, s.sma_slow), ("close",)),
+    "simple_ema": lambda s: StreamedSignal(SimpleEMAStream, ("close",)),
+    "ema_rsi_atr": lambda s: StreamedSignal(EMARSIATRStream, ("high", "low", "close")),
+    "bot_hunter": lambda s: StreamedSignal(BotHunterStream, ("high", "low", "close", "volume")),
+    "momentum": lambda s: StreamedSignal(MomentumStream, ("close", "volume")),
+    "vwap": lambda s: StreamedSignal(VWAPStream, ("high", "low", "close", "volume")),
+    "ml_scalping": lambda s: compute_ml_scalping_signals,
+    "mean_reversion": lambda s: compute_mean_reversion_signals,
+    "ml": lambda s: lambda df: compute_ml_signals_cached(df, symbol=s.symbol),
+}
+
+
+@dataclass
+class Session:
+    """One live paper-trading session: its own exchange, woken on its own bar boundaries"""
+    symbol: str
+    interval: str = "5m"
+    strategy: str = "sma"
+    lookback: int = 300
+    position_size: float = 1
+    sma_fast: int = 20
+    sma_slow: int = 50
+    exchange: PaperExchange = field(default=None)
+    metrics: StreamingMetrics = field(default=None)
+    window: CandleWindow = field(default=None)
 
-        signal = compute_sma_signals(df, fast=sma_fast, slow=sma_slow)
-        last_row = df.iloc[-1]
-        price = float(last_row["close"]) if "close" in last_row else float(df["close"].iloc[-1])
+    def __post_init__(self) -> None:
+        if self.strategy not in SESSION_STRATEGIES:
+            raise ValueError(f"Unknown strategy '{self.strategy}'; choose from {sorted(SESSION_STRATEGIES)}")
+        if self.exchange is None:
+            self.exchange = PaperExchange(starting_cash=settings.paper_starting_cash)
+        if self.metrics is None:
+            self.metrics = StreamingMetrics(self.exchange.cash, periods_per_year(self.interval, self.symbol))
+        if self.window is None:
+            self.window = CandleWindow(self.symbol, self.interval, self.lookback)
+
+
+def seconds_to_next_bar(interval: str, now: Optional[float] = None, settle: float = 2.0) -> float:
+    """Seconds until the next `interval` bar boundary (epoch aligned), plus `settle` for the provider to publish it"""
+    step = INTERVAL_SECONDS.get(interval, 60)
+    now = time.time() if now is None else now
+    return (now // step + 1) * step - now + settle
+
+
+def _timed_call(stage: str, fn: Callable, *args):
+    with timer(stage):
+        return fn(*args)
+
+
+async def run_session(session: Session, pool: ThreadPoolExecutor, writer: BufferedWriter,
+                      settle: float = 2.0) -> None:
+    """
+    Fetch, signal and trade once per bar until cancelled. Window refreshes and
+    signal evaluation (ML refits included) run in the shared pool, so a slow
+    session never blocks the event loop and the other sessions on it.
+    """
+    loop = asyncio.get_running_loop()
+    signal_fn = SESSION_STRATEGIES[session.strategy](session)
+    signal_stage = f"signal.{session.strategy}"
+    while True:
+        try:
+            with timer("cycle"):
+                await loop.run_in_executor(pool, session.window.refresh)
+                if not session.window.empty:
+                    df = session.window.frame()
+                    signal = await loop.run_in_executor(pool, _timed_call, signal_stage, signal_fn, df)
+                    _apply_signal(session.exchange, writer, session.symbol, df, signal.side, session.position_size,
+                                  session.metrics)
+        except Exception as e:
+            print(f"{session.symbol} {session.interval} {session.strategy}: {e}")
+        await asyncio.sleep(seconds_to_next_bar(session.interval, settle=settle))
+
+
+async def _flush_periodically(writer: BufferedWriter) -> None:
+    """Write rows buffered by sessions whose next bar is still far off (the writer is only used on the loop thread)"""
+    while True:
+        await asyncio.sleep(writer.max_seconds)
+        writer.flush_if_due()
+
+
+async def run_sessions(sessions: Iterable[Session], fetch_workers: int = 8, settle: float = 2.0) -> None:
+    """Run many sessions concurrently in one event loop, sharing one worker pool and one DB writer"""
+    db = Database()
+    writer = db.buffered_writer()
+    flusher = asyncio.ensure_future(_flush_periodically(writer))
+    try:
+        with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+            await asyncio.gather(*(run_session(s, pool, writer, settle=settle) for s in sessions))
+    finally:
+        flusher.cancel()
+        writer.close()
 
-        if signal.side == "buy":
-            if ex.position <= 0:
-                ex.market_buy(symbol, qty=position_size, price=price)
-        elif signal.side == "sell":
-            if ex.position >= 0 and ex.position > 0:
-                ex.market_sell(symbol, qty=min(position_size, ex.position), price=price)
 
-        db.record_equity(timestamp=int(last_row["timestamp"]), equity=ex.cash + ex.position * price)
-        time.sleep(5)
+def run_many(symbols: List[str], interval: str, strategy: str, lookback: int, position_size: float,
+             fetch_workers: int = 8) -> None:
+    sessions = [Session(symbol=sym, interval=interval, strategy=strategy, lookback=lookback,
+                        position_size=position_size) for sym in symbols]
+    asyncio.run(run_sessions(sessions, fetch_workers=fetch_workers))
 
 
 def backfill_data(symbol: str, interval: str, lookback: int) -> None:
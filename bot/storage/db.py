@@ -1,13 +1,30 @@
 import sqlite3
+import time
 import pandas as pd
+import numpy as np
+from itertools import repeat
 from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
-_DB_PATH = Path("bot.sqlite")
+from ..config import settings
+from ..profiling import timed
+
+_DB_PATH = Path(settings.db_path)
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",
+)
 
 
 class Database:
-    def __init__(self) -> None:
-        self.conn = sqlite3.connect(_DB_PATH)
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.conn = sqlite3.connect(path or _DB_PATH)
+        for pragma in _PRAGMAS:
+            self.conn.execute(pragma)
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
@@ -27,50 +44,157 @@ class Database:
             )
             """
         )
+        self._migrate_equity()
         cur.execute(
             """
-            CREATE TABLE IF NOT EXISTS equity (
-                timestamp INTEGER PRIMARY KEY,
-                equity REAL NOT NULL
+            CREATE TABLE IF NOT EXISTS trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                side TEXT NOT NULL,
+                qty REAL NOT NULL,
+                price REAL NOT NULL,
+                cost REAL NOT NULL
             )
             """
         )
         self.conn.commit()
 
+    def _migrate_equity(self) -> None:
+        """
+        Equity used to be keyed by timestamp alone; keep those rows under an
+        empty symbol. The whole move is one transaction, so a crash leaves
+        either the old table or the new one. An equity_unkeyed table left by
+        an interrupted, non-transactional migration is copied back too.
+        """
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(equity)")]
+        stranded = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'equity_unkeyed'").fetchone()
+        self.conn.execute("BEGIN")
+        try:
+            if columns and "symbol" not in columns:
+                self.conn.execute("ALTER TABLE equity RENAME TO equity_unkeyed")
+                stranded = True
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS equity (
+                    timestamp INTEGER NOT NULL,
+                    symbol TEXT NOT NULL,
+                    equity REAL NOT NULL,
+                    PRIMARY KEY (symbol, timestamp)
+                )
+                """
+            )
+            if stranded:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO equity (timestamp, symbol, equity) SELECT timestamp, '', equity FROM equity_unkeyed")
+                self.conn.execute("DROP TABLE equity_unkeyed")
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    @staticmethod
+    def _candle_rows(symbol: str, interval: str, candles: pd.DataFrame) -> Iterable[Tuple]:
+        # Column arrays -> plain Python scalars, no per-row pandas objects
+        columns = [candles["timestamp"].to_numpy(dtype=np.int64).tolist()]
+        columns += [candles[c].to_numpy(dtype=np.float64).tolist() for c in ("open", "high", "low", "close", "volume")]
+        return zip(repeat(symbol), repeat(interval), *columns)
+
     def insert_candles(self, symbol: str, interval: str, candles: pd.DataFrame) -> None:
         if candles.empty:
             return
-        rows = [
-            (
-                symbol,
-                interval,
-                int(r["timestamp"]),
-                float(r["open"]),
-                float(r["high"]),
-                float(r["low"]),
-                float(r["close"]),
-                float(r["volume"]),
+        self.insert_candles_many([(symbol, interval, candles)])
+
+    @timed("db.candles")
+    def insert_candles_many(self, batches: Iterable[Tuple[str, str, pd.DataFrame]]) -> None:
+        """Bulk ingest several (symbol, interval, candles) frames in a single transaction."""
+        with self.conn:
+            for symbol, interval, candles in batches:
+                if candles.empty:
+                    continue
+                self.conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO candles (symbol, interval, timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    self._candle_rows(symbol, interval, candles),
+                )
+
+    def record_equity(self, timestamp: int, equity: float, symbol: str = "") -> None:
+        self.record_equity_many([(timestamp, symbol, float(equity))])
+
+    @timed("db.equity")
+    def record_equity_many(self, rows: List[Tuple[int, str, float]]) -> None:
+        """(timestamp, symbol, equity) rows; one row per symbol and bar, the last write wins."""
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO equity (timestamp, symbol, equity)
+                VALUES (?, ?, ?)
+                """,
+                rows,
             )
-            for _, r in candles.iterrows()
-        ]
-        cur = self.conn.cursor()
-        cur.executemany(
-            """
-            INSERT OR REPLACE INTO candles (symbol, interval, timestamp, open, high, low, close, volume)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
-        self.conn.commit()
 
-    def record_equity(self, timestamp: int, equity: float) -> None:
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO equity (timestamp, equity)
-            VALUES (?, ?)
-            """,
-            (timestamp, float(equity)),
-        )
-        self.conn.commit()
+    @timed("db.trades")
+    def record_trades_many(self, rows: List[Tuple[int, str, str, float, float, float]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO trades (timestamp, symbol, side, qty, price, cost)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def buffered_writer(self, max_rows: int = 500, max_seconds: float = 30.0) -> "BufferedWriter":
+        return BufferedWriter(self, max_rows=max_rows, max_seconds=max_seconds)
+
+
+class BufferedWriter:
+    """
+    Buffers equity and trade rows and writes them with executemany once
+    `max_rows` rows are pending or `max_seconds` passed since the last flush.
+    The thresholds are checked as rows arrive; callers whose rows can stop
+    arriving (hourly bars, a stalled feed) also call `flush_if_due()` on a
+    timer or once per cycle, so buffered rows never wait unbounded.
+    """
+
+    def __init__(self, db: Database, max_rows: int = 500, max_seconds: float = 30.0) -> None:
+        self.db = db
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self._equity: List[Tuple[int, str, float]] = []
+        self._trades: List[Tuple[int, str, str, float, float, float]] = []
+        self._last_flush = time.monotonic()
+
+    def record_equity(self, timestamp: int, equity: float, symbol: str = "") -> None:
+        self._equity.append((int(timestamp), symbol, float(equity)))
+        self.flush_if_due()
+
+    def record_trade(self, timestamp: int, symbol: str, side: str, qty: float, price: float, cost: float) -> None:
+        self._trades.append((int(timestamp), symbol, side, float(qty), float(price), float(cost)))
+        self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        pending = len(self._equity) + len(self._trades)
+        if pending >= self.max_rows or time.monotonic() - self._last_flush >= self.max_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._equity:
+            self.db.record_equity_many(self._equity)
+            self._equity = []
+        if self._trades:
+            self.db.record_trades_many(self._trades)
+            self._trades = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
 
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -11,7 +11,11 @@ Bu strateji şu prensiplere dayanır:
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+import math
 from typing import Optional
+from ..indicators import EMA, RSI, SMA, Bollinger, RollingMax, RollingMin, RollingStd
+from .series import SignalSeries, pymax, pymin, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -130,7 +134,22 @@ def compute_bot_hunter_signals(df: pd.DataFrame, symbol: str = "") -> BotHunterS
     # NaN kontrolü
     if pd.isna(current_rsi) or pd.isna(current_sma) or pd.isna(current_bb_width):
         return BotHunterSignal(side="hold", confidence=0.0, reason="Gösterge hesaplanamadı", bot_activity=current_bot_activity)
-    
+
+    recent_low = low.iloc[-5:].min()
+    recent_high = high.iloc[-5:].max()
+    prev_bot_activity = bot_activity.iloc[-2] if len(bot_activity) > 1 else 0.0
+    return _bot_hunter_decision(current_price, current_rsi, current_sma, current_bb_upper, current_bb_lower,
+                                current_bb_width, volume_ratio, current_ema_fast, current_ema_slow,
+                                prev_ema_fast, prev_ema_slow, recent_low, recent_high,
+                                current_bot_activity, prev_bot_activity)
+
+
+def _bot_hunter_decision(current_price: float, current_rsi: float, current_sma: float, current_bb_upper: float,
+                         current_bb_lower: float, current_bb_width: float, volume_ratio: float,
+                         current_ema_fast: float, current_ema_slow: float, prev_ema_fast: float,
+                         prev_ema_slow: float, recent_low: float, recent_high: float,
+                         current_bot_activity: float, prev_bot_activity: float) -> BotHunterSignal:
+    """Decision rules shared by compute_bot_hunter_signals and BotHunterStream"""
     # STRATEJİ 1: Mean Reversion (Botlar aşırı hareket yaratır, sonra fiyat normale döner)
     # Daha esnek koşullar - sadece BB sapması veya RSI yeterli
     bb_distance_buy = (current_price - current_bb_lower) / (current_bb_upper - current_bb_lower + 1e-10)
@@ -170,8 +189,6 @@ def compute_bot_hunter_signals(df: pd.DataFrame, symbol: str = "") -> BotHunterS
     
     # STRATEJİ 3: Liquidity Hunt Reversal (Botlar stop-loss avladıktan sonra ters yön)
     # Daha esnek - daha küçük hareketler de kabul edilir
-    recent_low = low.iloc[-5:].min()
-    recent_high = high.iloc[-5:].max()
     price_recovery = (current_price - recent_low) / (recent_high - recent_low + 1e-10)
     
     liquidity_reversal_buy = (
@@ -188,7 +205,6 @@ def compute_bot_hunter_signals(df: pd.DataFrame, symbol: str = "") -> BotHunterS
     
     # STRATEJİ 4: Bot Activity Fade (Bot aktivitesi azaldığında trend takip)
     # Daha esnek - bot aktivitesi düşükken de işlem yapabilir
-    prev_bot_activity = bot_activity.iloc[-2] if len(bot_activity) > 1 else 0.0
     bot_activity_decreasing = current_bot_activity < prev_bot_activity and prev_bot_activity > 0.3  # Daha düşük threshold
     bot_activity_low = current_bot_activity < 0.4  # Düşük bot aktivitesi
     
@@ -283,3 +299,187 @@ def compute_bot_hunter_signals(df: pd.DataFrame, symbol: str = "") -> BotHunterS
         bot_activity=current_bot_activity
     )
 
+
+class BotHunterStream:
+    """
+    Bar-by-bar version of compute_bot_hunter_signals, O(1) per bar: the
+    detect_bot_activity score and the signal indicators are kept as streaming
+    state, so each update gives the function's signal on the prefix so far.
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self._prev_close = None
+        self._bot_activity = 0.0
+        # detect_bot_activity; the change series starts on the second bar (pct_change is NaN on the first)
+        # (lookback=20, as compute_bot_hunter_signals calls it)
+        self._volume_ma = SMA(20)  # also the signal's volume MA
+        self._volume_std = RollingStd(20)
+        self._volatility_ma = SMA(20)
+        self._pattern_std = RollingStd(20)
+        self._low_5 = RollingMin(5)
+        self._high_5 = RollingMax(5)
+        # signal indicators
+        self._rsi = RSI(14)
+        self._bollinger = Bollinger(20, 2)
+        self._ema_fast = EMA(12)
+        self._ema_slow = EMA(26)
+
+    def _activity(self, close: float, low_5: float, volume: float, volume_ma: float) -> float:
+        volume_std = self._volume_std.update(volume)
+        volume_zscore = (volume - volume_ma) / (volume_std + 1e-10)
+        volume_spike = float(volume_zscore > 2.0)
+
+        if self._prev_close is None:
+            price_change = volatility_ma = pattern_std = math.nan
+        else:
+            price_change = abs(close / self._prev_close - 1)
+            volatility_ma = self._volatility_ma.update(price_change)
+            pattern_std = self._pattern_std.update(price_change)
+        self._prev_close = close
+        volatility_spike = float(price_change > volatility_ma * 2.0)
+        # clip(0, 100) keeps NaN
+        pattern_score = min(max(1.0 / (pattern_std + 0.001), 0.0), 100.0) / 100 if pattern_std == pattern_std else math.nan
+        liquidity_hunt = float(low_5 < close * 0.98)
+
+        return volume_spike * 0.3 + volatility_spike * 0.3 + pattern_score * 0.2 + liquidity_hunt * 0.2
+
+    def update(self, high: float, low: float, close: float, volume: float) -> BotHunterSignal:
+        recent_low = self._low_5.update(low)
+        recent_high = self._high_5.update(high)
+        volume_ma = self._volume_ma.update(volume)
+        bot_activity = self._activity(close, recent_low, volume, volume_ma)
+        self.bars += 1
+        prev_bot_activity = self._bot_activity
+        # detect_bot_activity is all zeros while the frame is shorter than its lookback
+        current_bot_activity = self._bot_activity = bot_activity if self.bars >= 20 else 0.0
+
+        current_rsi = self._rsi.update(close)
+        current_sma, current_bb_upper, current_bb_lower = self._bollinger.update(close)
+        current_bb_width = (current_bb_upper - current_bb_lower) / current_sma
+        volume_ratio = volume / (volume_ma + 1e-10)
+        prev_ema_fast, prev_ema_slow = self._ema_fast.value, self._ema_slow.value
+        current_ema_fast = self._ema_fast.update(close)
+        current_ema_slow = self._ema_slow.update(close)
+
+        if self.bars < 50:
+            return BotHunterSignal(side="hold", confidence=0.0, reason="Yetersiz veri", bot_activity=0.0)
+        if pd.isna(current_rsi) or pd.isna(current_sma) or pd.isna(current_bb_width):
+            return BotHunterSignal(side="hold", confidence=0.0, reason="Gösterge hesaplanamadı",
+                                   bot_activity=current_bot_activity)
+        return _bot_hunter_decision(close, current_rsi, current_sma, current_bb_upper, current_bb_lower,
+                                    current_bb_width, volume_ratio, current_ema_fast, current_ema_slow,
+                                    prev_ema_fast, prev_ema_slow, recent_low, recent_high,
+                                    current_bot_activity, prev_bot_activity)
+
+
+
+def compute_bot_hunter_signals_batch(df: pd.DataFrame, symbol: str = "") -> SignalSeries:
+    """
+    compute_bot_hunter_signals for every prefix of df in one vectorized pass:
+    bar i of the result equals compute_bot_hunter_signals(df.iloc[:i+1]).
+    All indicators are causal, so the full-history series at bar i equal the
+    prefix series; the decision rules are applied elementwise.
+    """
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0, "Yetersiz veri")
+    if n < 50:
+        return out
+
+    close = df['close'].astype(float)
+    high = df['high'].astype(float)
+    low = df['low'].astype(float)
+    volume = df['volume'].astype(float)
+
+    bot_activity = detect_bot_activity(df, lookback=20).to_numpy(dtype=float)
+    prev_bot_activity = shift(bot_activity, 0.0)
+
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    sma_20 = close.rolling(window=20).mean()
+    std_20 = close.rolling(window=20).std()
+    bb_upper = (sma_20 + (std_20 * 2)).to_numpy()
+    bb_lower = (sma_20 - (std_20 * 2)).to_numpy()
+    bb_width = (bb_upper - bb_lower) / sma_20.to_numpy()
+    sma = sma_20.to_numpy()
+    price = close.to_numpy()
+
+    volume_ratio = volume.to_numpy() / (volume.rolling(window=20).mean().to_numpy() + 1e-10)
+
+    ema_fast = close.ewm(span=12).mean().to_numpy()
+    ema_slow = close.ewm(span=26).mean().to_numpy()
+    prev_ema_fast = shift(ema_fast)
+    prev_ema_slow = shift(ema_slow)
+
+    recent_low = low.rolling(window=5, min_periods=1).min().to_numpy()
+    recent_high = high.rolling(window=5, min_periods=1).max().to_numpy()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_reversion_buy = (((price <= bb_lower * 1.01) | (rsi < 35)) & (rsi < 40) & (bb_width > 0.01))
+        mean_reversion_sell = (((price >= bb_upper * 0.99) | (rsi > 65)) & (rsi > 60) & (bb_width > 0.01))
+
+        volume_spike = volume_ratio > 1.3
+        ema_bullish_cross = (prev_ema_fast <= prev_ema_slow) & (ema_fast > ema_slow)
+        ema_bearish_cross = (prev_ema_fast >= prev_ema_slow) & (ema_fast < ema_slow)
+        ema_bullish = ema_fast > ema_slow
+        ema_bearish = ema_fast < ema_slow
+
+        momentum_buy = ((volume_spike | ema_bullish_cross | ema_bullish) &
+                        (rsi > 35) & (rsi < 75) & (price > sma * 0.995))
+        momentum_sell = ((volume_spike | ema_bearish_cross | ema_bearish) &
+                         (rsi < 65) & (rsi > 25) & (price < sma * 1.005))
+
+        price_recovery = (price - recent_low) / (recent_high - recent_low + 1e-10)
+        liquidity_reversal_buy = (recent_low < price * 0.995) & (price_recovery > 0.3) & (rsi < 55)
+        liquidity_reversal_sell = (recent_high > price * 1.005) & (price_recovery < 0.7) & (rsi > 45)
+
+        bot_activity_decreasing = (bot_activity < prev_bot_activity) & (prev_bot_activity > 0.3)
+        bot_activity_low = bot_activity < 0.4
+        bot_fade_buy = ((bot_activity_decreasing | bot_activity_low) &
+                        ((ema_fast > ema_slow) | (price > sma)) & (rsi > 40) & (rsi < 70))
+        bot_fade_sell = ((bot_activity_decreasing | bot_activity_low) &
+                         ((ema_fast < ema_slow) | (price < sma)) & (rsi < 60) & (rsi > 30))
+
+        rsi_factor = pymax(0, (40 - rsi) / 40)
+        bb_factor = pymax(0, (bb_lower - price) / (bb_upper - bb_lower + 1e-10))
+        vol_factor = np.where(volume_spike, pymin(1.0, (volume_ratio - 1.0) / 0.5), 0.3)
+        ema_factor = np.where(ema_bullish_cross, 0.4, np.where(ema_bullish, 0.2, 0.1))
+        recovery_factor = pymax(0, price_recovery - 0.3) / 0.7
+        activity_factor = np.where(bot_activity_decreasing, pymax(0, (prev_bot_activity - bot_activity)), 0.3)
+
+        buy_signals = [
+            ("Mean Reversion", mean_reversion_buy, pymin(0.85, 0.4 + rsi_factor * 0.3 + bb_factor * 0.15)),
+            ("Volume Momentum", momentum_buy, pymin(0.90, 0.4 + vol_factor * 0.3 + ema_factor * 0.2)),
+            ("Liquidity Reversal", liquidity_reversal_buy, pymin(0.80, 0.4 + recovery_factor * 0.4)),
+            ("Bot Fade", bot_fade_buy, pymin(0.75, 0.4 + activity_factor * 0.35)),
+        ]
+        sell_signals = [
+            ("Mean Reversion", mean_reversion_sell, pymin(0.85, 0.5 + (rsi - 70) / 30 * 0.35)),
+            ("Volume Momentum", momentum_sell, pymin(0.90, 0.6 + volume_ratio / 3 * 0.3)),
+            ("Liquidity Reversal", liquidity_reversal_sell, pymin(0.80, 0.5 + (1 - price_recovery) * 0.3)),
+            ("Bot Fade", bot_fade_sell, pymin(0.75, 0.5 + (prev_bot_activity - bot_activity) * 0.5)),
+        ]
+
+        series = SignalSeries.hold(n, 0.2, "Sinyal yok")
+        series.set(bot_activity > 0.7, "hold", 0.3, "Yüksek bot aktivitesi - bekle")
+        for side, signals in (("sell", sell_signals), ("buy", buy_signals)):
+            # max(signals, key=confidence): first signal wins ties
+            any_signal = np.zeros(n, dtype=bool)
+            best_conf = np.zeros(n)
+            best_reason = np.full(n, "", dtype=object)
+            for reason, active, confidence in signals:
+                take = active & (~any_signal | (confidence > best_conf))
+                best_conf = np.where(take, confidence, best_conf)
+                best_reason[take] = reason
+                any_signal |= active
+            series.side[any_signal] = side
+            series.confidence[any_signal] = best_conf[any_signal]
+            series.reason[any_signal] = best_reason[any_signal]
+
+    series.set(np.isnan(rsi) | np.isnan(sma) | np.isnan(bb_width), "hold", 0.0, "Gösterge hesaplanamadı")
+    series.set(np.arange(n) < 49, "hold", 0.0, "Yetersiz veri")
+    return series
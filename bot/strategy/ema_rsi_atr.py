@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from ..indicators import EMA, RSI, ATR
+from .series import SignalSeries, pymax, pymin, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -56,7 +59,14 @@ def compute_ema_rsi_atr_signals(df: pd.DataFrame, fast_ema: int = 12, slow_ema:
     # Check for NaN values
     if pd.isna(current_ema_fast) or pd.isna(current_ema_slow) or pd.isna(current_rsi) or pd.isna(current_atr):
         return EMARSignal(side="hold", rsi=50.0, atr=0.0, confidence=0.0)
-    
+
+    return _ema_rsi_atr_decision(current_ema_fast, current_ema_slow, prev_ema_fast, prev_ema_slow,
+                                 current_rsi, current_atr)
+
+
+def _ema_rsi_atr_decision(current_ema_fast: float, current_ema_slow: float, prev_ema_fast: float,
+                          prev_ema_slow: float, current_rsi: float, current_atr: float) -> EMARSignal:
+    """Signal rules shared by compute_ema_rsi_atr_signals and EMARSIATRStream"""
     # EMA trend logic (not just crossover, but trend direction)
     ema_bullish = current_ema_fast > current_ema_slow  # Fast above slow = bullish trend
     ema_bearish = current_ema_fast < current_ema_slow  # Fast below slow = bearish trend
@@ -96,6 +106,89 @@ def compute_ema_rsi_atr_signals(df: pd.DataFrame, fast_ema: int = 12, slow_ema:
         return EMARSignal(side="hold", rsi=current_rsi, atr=current_atr, confidence=confidence)
 
 
+class EMARSIATRStream:
+    """
+    Bar-by-bar version of compute_ema_rsi_atr_signals: O(1) per bar using the
+    streaming indicators, same signal as the function on the prefix so far.
+    """
+
+    def __init__(self, fast_ema: int = 12, slow_ema: int = 26, rsi_period: int = 14, atr_period: int = 14):
+        self._min_bars = max(fast_ema, slow_ema, rsi_period, atr_period) + 1
+        self.bars = 0
+        self._ema_fast = EMA(fast_ema)
+        self._ema_slow = EMA(slow_ema)
+        self._rsi = RSI(rsi_period)
+        self._atr = ATR(atr_period)
+
+    def update(self, high: float, low: float, close: float) -> EMARSignal:
+        prev_ema_fast = self._ema_fast.value
+        prev_ema_slow = self._ema_slow.value
+        current_ema_fast = self._ema_fast.update(close)
+        current_ema_slow = self._ema_slow.update(close)
+        current_rsi = self._rsi.update(close)
+        current_atr = self._atr.update(high, low, close)
+        self.bars += 1
+
+        if self.bars < self._min_bars:
+            return EMARSignal(side="hold", rsi=50.0, atr=0.0, confidence=0.0)
+        if pd.isna(current_ema_fast) or pd.isna(current_ema_slow) or pd.isna(current_rsi) or pd.isna(current_atr):
+            return EMARSignal(side="hold", rsi=50.0, atr=0.0, confidence=0.0)
+        return _ema_rsi_atr_decision(current_ema_fast, current_ema_slow, prev_ema_fast, prev_ema_slow,
+                                     current_rsi, current_atr)
+
+
+
+def compute_ema_rsi_atr_signals_batch(df: pd.DataFrame, fast_ema: int = 12, slow_ema: int = 26,
+                                      rsi_period: int = 14, atr_period: int = 14) -> SignalSeries:
+    """compute_ema_rsi_atr_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < max(fast_ema, slow_ema, rsi_period, atr_period) + 1:
+        return out
+
+    prices = df["close"].astype(float)
+    ema_fast = prices.ewm(span=fast_ema).mean().to_numpy()
+    ema_slow = prices.ewm(span=slow_ema).mean().to_numpy()
+    prev_ema_fast = shift(ema_fast)
+    prev_ema_slow = shift(ema_slow)
+
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    high = df["high"].astype(float)
+    low = df["low"].astype(float)
+    tr1 = high - low
+    tr2 = abs(high - prices.shift(1))
+    tr3 = abs(low - prices.shift(1))
+    atr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1).rolling(window=atr_period).mean().to_numpy()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ema_bullish = ema_fast > ema_slow
+        ema_bearish = ema_fast < ema_slow
+        ema_bullish_cross = (prev_ema_fast <= prev_ema_slow) & ema_bullish
+        ema_bearish_cross = (prev_ema_fast >= prev_ema_slow) & ema_bearish
+
+        ema_strength = abs(ema_fast - ema_slow) / ema_slow
+        rsi_confidence = 1 - abs(rsi - 50) / 50
+        confidence = pymin(ema_strength * 10, rsi_confidence)
+        confidence = np.where(ema_bullish_cross | ema_bearish_cross, pymin(confidence * 2, 1.0), confidence)
+
+        buy = ema_bullish & (rsi < 85)
+        sell = ~buy & ema_bearish & (rsi > 15)
+        boost = (buy & (((rsi > 40) & (rsi < 80)) | ema_bullish_cross)) | \
+                (sell & (((rsi < 60) & (rsi > 20)) | ema_bearish_cross))
+        confidence = np.where(boost, pymax(confidence, 0.6), confidence)
+
+    out.set(np.ones(n, dtype=bool), "hold", confidence)
+    out.set(buy, "buy", confidence)
+    out.set(sell, "sell", confidence)
+    invalid = np.isnan(ema_fast) | np.isnan(ema_slow) | np.isnan(rsi) | np.isnan(atr)
+    out.set(invalid | (np.arange(n) < max(fast_ema, slow_ema, rsi_period, atr_period)), "hold", 0.0)
+    return out
+
 def calculate_dynamic_stop_loss(entry_price: float, atr: float, side: str, atr_multiplier: float = 2.0) -> float:
     """
     Calculate dynamic stop-loss based on ATR
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from .series import SignalSeries, pymin, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -111,3 +113,43 @@ def compute_ml_scalping_signals(df: pd.DataFrame) -> ScalpSignal:
             return ScalpSignal(side="sell", confidence=0.5)
         else:
             return ScalpSignal(side="hold", confidence=0.2)
+
+
+def compute_ml_scalping_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_ml_scalping_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < 20:
+        return out
+
+    prices = df['close'].astype(float)
+    sma_5 = prices.rolling(5).mean().to_numpy()
+    sma_10 = prices.rolling(10).mean().to_numpy()
+
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    momentum = prices.pct_change(3).to_numpy()
+    volume = df['volume'].astype(float)
+    vol_spike = (volume > volume.rolling(10).mean() * 1.2).to_numpy()
+
+    price = prices.to_numpy()
+    prev_price = shift(price)
+    prev_sma5 = shift(sma_5)
+
+    with np.errstate(invalid='ignore'):
+        buy_score = (2 * ((price > sma_5) & (prev_price <= prev_sma5)) + (sma_5 > sma_10) +
+                     ((rsi > 30) & (rsi < 70)) + 2 * (momentum > 0.001) + vol_spike)
+        sell_score = (2 * ((price < sma_5) & (prev_price >= prev_sma5)) + (sma_5 < sma_10) +
+                      ((rsi > 70) | (rsi < 30)) + 2 * (momentum < -0.001) + vol_spike)
+
+    out.set(np.ones(n, dtype=bool), "hold", 0.2)
+    out.set(sell_score >= 2, "sell", 0.5)
+    out.set(buy_score >= 2, "buy", 0.5)
+    out.set(sell_score >= 3, "sell", pymin(sell_score / 7, 0.9))
+    out.set(buy_score >= 3, "buy", pymin(buy_score / 7, 0.9))
+    out.set(np.isnan(sma_5) | np.isnan(rsi) | (np.arange(n) < 19), "hold", 0.0)
+    return out
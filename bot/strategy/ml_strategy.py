@@ -1,7 +1,14 @@
+import copy
+import math
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from sklearn.ensemble import RandomForestClassifier
+from ..indicators import SMA, EMA, RSI, ATR, Bollinger
+from .series import SignalSeries
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -10,6 +17,12 @@ class MLSignal:
     confidence: float
 
 
+FEATURE_COLS = ['sma_5', 'sma_10', 'sma_20', 'ema_9', 'ema_21', 'rsi',
+                'macd', 'macd_signal', 'bb_mid', 'bb_upper', 'bb_lower',
+                'atr', 'price_change', 'price_change_5', 'price_change_10',
+                'volume_ratio']
+
+
 def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate various technical indicators for ML features"""
     df = df.copy()
@@ -84,10 +97,7 @@ def compute_ml_signals(df: pd.DataFrame) -> MLSignal:
             return MLSignal(side="hold", confidence=0.0)
         
         # Prepare features
-        feature_cols = ['sma_5', 'sma_10', 'sma_20', 'ema_9', 'ema_21', 'rsi', 
-                       'macd', 'macd_signal', 'bb_mid', 'bb_upper', 'bb_lower',
-                       'atr', 'price_change', 'price_change_5', 'price_change_10',
-                       'volume_ratio']
+        feature_cols = FEATURE_COLS
         
         # Get recent data
         X = df_clean[feature_cols].values
@@ -137,3 +147,295 @@ def compute_ml_signals(df: pd.DataFrame) -> MLSignal:
     except Exception as e:
         print(f"ML Strategy error: {e}")
         return MLSignal(side="hold", confidence=0.0)
+
+
+
+class FeatureStream:
+    """
+    Bar-by-bar FEATURE_COLS row, O(1) per bar with the streaming indicators;
+    same values as calculate_technical_indicators on the prefix so far.
+    """
+
+    def __init__(self):
+        self._sma_5 = SMA(5)
+        self._sma_10 = SMA(10)
+        self._ema_9 = EMA(9)
+        self._ema_21 = EMA(21)
+        self._rsi = RSI(14)
+        self._ema_12 = EMA(12)
+        self._ema_26 = EMA(26)
+        self._macd_signal = EMA(9)
+        self._bb = Bollinger(20, 2.0)
+        self._atr = ATR(14)
+        self._volume_ma = SMA(20)
+        self._closes = deque(maxlen=11)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> np.ndarray:
+        closes = self._closes
+        closes.append(close)
+
+        def pct_change(periods: int) -> float:
+            return closes[-1] / closes[-1 - periods] - 1 if len(closes) > periods else math.nan
+
+        macd = self._ema_12.update(close) - self._ema_26.update(close)
+        bb_mid, bb_upper, bb_lower = self._bb.update(close)
+        volume_ma = self._volume_ma.update(volume)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.float64(volume) / volume_ma
+        return np.array([
+            self._sma_5.update(close),
+            self._sma_10.update(close),
+            bb_mid,  # sma_20 and bb_mid are the same rolling mean
+            self._ema_9.update(close),
+            self._ema_21.update(close),
+            self._rsi.update(close),
+            macd,
+            self._macd_signal.update(macd),
+            bb_mid,
+            bb_upper,
+            bb_lower,
+            self._atr.update(high, low, close),
+            pct_change(1),
+            pct_change(5),
+            pct_change(10),
+            volume_ratio,
+        ])
+
+
+def _predict_proba(model: RandomForestClassifier, row: np.ndarray) -> np.ndarray:
+    """RandomForest predict_proba for one row without the per-call validation/joblib overhead"""
+    x = row.astype(np.float32).reshape(1, -1)
+    proba = np.zeros(len(model.classes_))
+    for tree in model.estimators_:
+        proba += tree.predict_proba(x, check_input=False)[0]
+    return proba / len(model.estimators_)
+
+
+@dataclass
+class _SymbolModel:
+    features: FeatureStream = field(default_factory=FeatureStream)  # fed closed bars only
+    last_label: object = None   # index label of the last bar fed to `features`
+    last_close: float = math.nan
+    last_row: Optional[np.ndarray] = None                  # feature row of that bar (may hold NaN)
+    rows: List[np.ndarray] = field(default_factory=list)   # complete (NaN-free) feature rows
+    closes: List[float] = field(default_factory=list)      # close of each row
+    model: Optional[RandomForestClassifier] = None
+    fitted_at: int = 0                                     # len(rows) when last fitted
+    predictions: deque = field(default_factory=lambda: deque(maxlen=50))  # (row, predicted label)
+
+
+class MLModelManager:
+    """
+    Caches one fitted RandomForest and its feature rows per symbol, so the ML
+    strategy can run every bar without refitting:
+    - only bars newer than the last seen one are turned into feature rows;
+      the last bar of a live frame is still forming, so compute_signal keeps
+      it out of the cached state and scores it on a copy of the features
+      (its close may change on the next poll without invalidating anything)
+    - the model is refit every `retrain_every` rows, or early on drift
+      (hit rate of its resolved predictions below `drift_accuracy`)
+    - refits warm-start: `refresh_trees` new trees are grown on the latest
+      window and the oldest are dropped, keeping `n_estimators` trees
+    """
+
+    def __init__(self, retrain_every: int = 50, drift_window: int = 20, drift_accuracy: float = 0.45,
+                 train_size: int = 100, horizon: int = 3, n_estimators: int = 50,
+                 refresh_trees: int = 10, warm_start: bool = True, n_jobs: int = 1,
+                 max_rows: int = 5000):
+        self.retrain_every = retrain_every
+        self.drift_window = drift_window
+        self.drift_accuracy = drift_accuracy
+        self.train_size = train_size
+        self.horizon = horizon
+        self.n_estimators = n_estimators
+        self.refresh_trees = refresh_trees
+        self.warm_start = warm_start
+        self.n_jobs = n_jobs
+        self.max_rows = max_rows
+        self._models: Dict[str, _SymbolModel] = {}
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self._models.clear()
+        else:
+            self._models.pop(symbol, None)
+
+    def compute_signal(self, df: pd.DataFrame, symbol: str = "") -> MLSignal:
+        """Signal for the last bar of df, which may still be forming (live polling)"""
+        if df.empty or len(df) < 50:
+            return MLSignal(side="hold", confidence=0.0)
+        try:
+            state = self._sync(df.iloc[:-1], symbol)
+            if state.last_label == df.index[-1]:
+                # df ends on a bar already fed as closed
+                row = state.last_row
+            else:
+                last = df.iloc[-1]
+                row = copy.deepcopy(state.features).update(float(last['high']), float(last['low']),
+                                                           float(last['close']), float(last['volume']))
+            return self._score(state, row)
+        except Exception as e:
+            print(f"ML Strategy error: {e}")
+            return MLSignal(side="hold", confidence=0.0)
+
+    def compute_signals_batch(self, df: pd.DataFrame, symbol: str = "") -> SignalSeries:
+        """
+        Signal of every bar of a historical frame, each bar closed when it is
+        scored: one pass that refits on the manager's schedule, for backtests.
+        Starts from a fresh state for `symbol`.
+        """
+        df = as_frame(df)
+        n = len(df)
+        out = SignalSeries.hold(n, 0.0)
+        self.reset(symbol)
+        state = self._models[symbol] = _SymbolModel()
+        highs, lows, closes, volumes = (df[c].to_numpy(dtype=float).tolist() for c in ('high', 'low', 'close', 'volume'))
+        for i in range(n):
+            row = self._feed(state, highs[i], lows[i], closes[i], volumes[i])
+            if i < 49:
+                continue
+            self._trim(state)
+            try:
+                sig = self._score(state, row)
+            except Exception as e:
+                print(f"ML Strategy error: {e}")
+                sig = MLSignal(side="hold", confidence=0.0)
+            out.side[i] = sig.side
+            out.confidence[i] = sig.confidence
+        state.last_label = df.index[-1] if n else None
+        state.last_close = closes[-1] if n else math.nan
+        return out
+
+    def _score(self, state: _SymbolModel, row: Optional[np.ndarray]) -> MLSignal:
+        """Refit if due, then predict `row`: the bar right after state.rows, or the last of them"""
+        if len(state.rows) < 30 or row is None or np.isnan(row).any():
+            return MLSignal(side="hold", confidence=0.0)
+        if self._needs_fit(state):
+            self._fit(state)
+        if state.model is None:
+            return MLSignal(side="hold", confidence=0.0)
+
+        probabilities = _predict_proba(state.model, row)
+        prediction = state.model.classes_[int(np.argmax(probabilities))]
+        confidence = max(probabilities)
+        at = len(state.rows) - 1 if row is state.last_row else len(state.rows)
+        if not state.predictions or state.predictions[-1][0] != at:
+            state.predictions.append((at, prediction))
+        else:
+            # Re-polled forming bar: keep only its latest prediction
+            state.predictions[-1] = (at, prediction)
+
+        if prediction == 1 and confidence > 0.4:
+            return MLSignal(side="buy", confidence=confidence)
+        elif prediction == 0 and confidence > 0.4:
+            return MLSignal(side="sell", confidence=confidence)
+        else:
+            return MLSignal(side="hold", confidence=0.3)
+
+    @staticmethod
+    def _feed(state: _SymbolModel, high: float, low: float, close: float, volume: float) -> np.ndarray:
+        row = state.last_row = state.features.update(high, low, close, volume)
+        if not np.isnan(row).any():
+            state.rows.append(row)
+            state.closes.append(close)
+        return row
+
+    def _sync(self, df: pd.DataFrame, symbol: str) -> _SymbolModel:
+        """Feed the (closed) bars of df not seen yet; start over if df does not continue the cached history"""
+        state = self._models.get(symbol)
+        start = 0
+        if state is not None and state.last_label is not None:
+            try:
+                pos = df.index.get_loc(state.last_label)
+            except KeyError:
+                pos = None
+            if isinstance(pos, (int, np.integer)) and float(df['close'].iloc[pos]) == state.last_close:
+                start = pos + 1
+            else:
+                state = None
+        if state is None:
+            state = self._models[symbol] = _SymbolModel()
+
+        if start < len(df):
+            new = df.iloc[start:]
+            highs = new['high'].to_numpy(dtype=float).tolist()
+            lows = new['low'].to_numpy(dtype=float).tolist()
+            closes = new['close'].to_numpy(dtype=float).tolist()
+            volumes = new['volume'].to_numpy(dtype=float).tolist()
+            for h, l, c, v in zip(highs, lows, closes, volumes):
+                self._feed(state, h, l, c, v)
+            state.last_label = df.index[-1]
+            state.last_close = closes[-1]
+            self._trim(state)
+        return state
+
+    def _trim(self, state: _SymbolModel) -> None:
+        excess = len(state.rows) - self.max_rows
+        if excess > 0:
+            del state.rows[:excess]
+            del state.closes[:excess]
+            state.fitted_at -= excess
+            state.predictions = deque(((r - excess, p) for r, p in state.predictions if r >= excess),
+                                      maxlen=state.predictions.maxlen)
+
+    def _label(self, state: _SymbolModel, row: int) -> int:
+        close = state.closes[row]
+        return int((state.closes[row + self.horizon] - close) / close > 0.001)
+
+    def _needs_fit(self, state: _SymbolModel) -> bool:
+        if state.model is None or len(state.rows) - state.fitted_at >= self.retrain_every:
+            return True
+        resolved = [(r, p) for r, p in state.predictions if r + self.horizon < len(state.rows)]
+        if len(resolved) < self.drift_window:
+            return False
+        recent = resolved[-self.drift_window:]
+        hits = sum(1 for r, p in recent if p == self._label(state, r))
+        return hits / len(recent) < self.drift_accuracy
+
+    def _fit(self, state: _SymbolModel) -> None:
+        # Only rows whose label (close `horizon` rows ahead) is already known
+        labeled = len(state.rows) - self.horizon
+        if labeled < 2:
+            return
+        first = max(0, labeled - self.train_size)
+        X = np.vstack(state.rows[first:labeled])
+        y = np.array([self._label(state, r) for r in range(first, labeled)])
+
+        model = state.model
+        if model is not None and self.warm_start and set(np.unique(y)) == set(model.classes_):
+            model.n_estimators = len(model.estimators_) + self.refresh_trees
+            model.fit(X, y)
+            model.estimators_ = model.estimators_[-self.n_estimators:]
+            model.n_estimators = len(model.estimators_)
+        else:
+            model = RandomForestClassifier(
+                n_estimators=self.n_estimators,
+                max_depth=8,
+                min_samples_split=5,
+                min_samples_leaf=2,
+                random_state=42,
+                n_jobs=self.n_jobs,
+                warm_start=self.warm_start,
+            )
+            model.fit(X, y)
+        state.model = model
+        state.fitted_at = len(state.rows)
+        state.predictions.clear()
+
+
+_default_manager: Optional[MLModelManager] = None
+
+
+def compute_ml_signals_cached(df: pd.DataFrame, symbol: str = "", manager: Optional[MLModelManager] = None) -> MLSignal:
+    """compute_ml_signals backed by a per-symbol cached model (see MLModelManager)"""
+    global _default_manager
+    if manager is None:
+        if _default_manager is None:
+            _default_manager = MLModelManager()
+        manager = _default_manager
+    return manager.compute_signal(df, symbol)
+
+
+def compute_ml_signals_batch(df: pd.DataFrame, symbol: str = "", manager: Optional[MLModelManager] = None) -> SignalSeries:
+    """ML signal for every bar of df in one pass of a (fresh by default) MLModelManager"""
+    return (manager or MLModelManager()).compute_signals_batch(df, symbol)
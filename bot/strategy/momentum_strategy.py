@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from ..indicators import EMA, RSI, SMA
+from .series import SignalSeries, pymin, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -60,7 +63,15 @@ def compute_momentum_signals(df: pd.DataFrame) -> MomentumSignal:
     # Check for NaN
     if pd.isna(current_rsi) or pd.isna(current_macd) or pd.isna(current_hist):
         return MomentumSignal(side="hold", confidence=0.0)
-    
+
+    return _momentum_decision(current_price, current_rsi, current_macd, current_signal,
+                              current_hist, prev_hist, current_sma20, current_volume_spike)
+
+
+def _momentum_decision(current_price: float, current_rsi: float, current_macd: float,
+                       current_signal: float, current_hist: float, prev_hist: float,
+                       current_sma20: float, current_volume_spike: bool) -> MomentumSignal:
+    """Scoring rules shared by compute_momentum_signals and MomentumStream"""
     # BUY CONDITIONS: Multiple bullish signals
     buy_signals = 0
     buy_confidence = 0.0
@@ -126,3 +137,96 @@ def compute_momentum_signals(df: pd.DataFrame) -> MomentumSignal:
         return MomentumSignal(side="sell", confidence=min(sell_confidence, 0.95))
     else:
         return MomentumSignal(side="hold", confidence=0.2)
+
+
+class MomentumStream:
+    """Bar-by-bar version of compute_momentum_signals, O(1) per bar."""
+
+    def __init__(self):
+        self.bars = 0
+        self._rsi = RSI(14)
+        self._ema_12 = EMA(12)
+        self._ema_26 = EMA(26)
+        self._signal_line = EMA(9)
+        self._sma_20 = SMA(20)
+        self._volume_ma = SMA(20)
+        self._hist = 0.0
+
+    def update(self, close: float, volume: float) -> MomentumSignal:
+        current_rsi = self._rsi.update(close)
+        current_macd = self._ema_12.update(close) - self._ema_26.update(close)
+        current_signal = self._signal_line.update(current_macd)
+        prev_hist = self._hist
+        current_hist = self._hist = current_macd - current_signal
+        current_sma20 = self._sma_20.update(close)
+        current_volume_spike = volume > self._volume_ma.update(volume) * 1.5
+        self.bars += 1
+
+        if self.bars < 50:
+            return MomentumSignal(side="hold", confidence=0.0)
+        if pd.isna(current_rsi) or pd.isna(current_macd) or pd.isna(current_hist):
+            return MomentumSignal(side="hold", confidence=0.0)
+        return _momentum_decision(close, current_rsi, current_macd, current_signal,
+                                  current_hist, prev_hist, current_sma20, current_volume_spike)
+
+
+def compute_momentum_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_momentum_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < 50:
+        return out
+
+    prices = df['close'].astype(float)
+    volume = df['volume'].astype(float)
+
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    macd_line = prices.ewm(span=12).mean() - prices.ewm(span=26).mean()
+    signal_line = macd_line.ewm(span=9).mean()
+    hist = (macd_line - signal_line).to_numpy()
+    prev_hist = shift(hist, 0.0)
+    macd = macd_line.to_numpy()
+    signal = signal_line.to_numpy()
+
+    price = prices.to_numpy()
+    sma20 = prices.rolling(window=20).mean().to_numpy()
+    volume_spike = (volume > volume.rolling(window=20).mean() * 1.5).to_numpy()
+
+    with np.errstate(invalid='ignore'):
+        # Same scoring as _momentum_decision; adding 0.0 for an unmet rule keeps the sums exact
+        buy_rules = [
+            ((macd > signal) & (hist > 0) & (prev_hist <= 0), 0.3),
+            ((macd > 0) & (hist > 0), 0.2),
+            (price > sma20, 0.2),
+            ((rsi > 40) & (rsi < 70), 0.2),
+            (volume_spike, 0.1),
+        ]
+        sell_rules = [
+            ((macd < signal) & (hist < 0) & (prev_hist >= 0), 0.3),
+            ((macd < 0) & (hist < 0), 0.2),
+            (price < sma20, 0.2),
+            ((rsi < 30) | (rsi > 70), 0.2),
+            (volume_spike, 0.1),
+        ]
+
+    def score(rules):
+        count = np.zeros(n, dtype=int)
+        confidence = np.zeros(n)
+        for met, weight in rules:
+            count += met
+            confidence = confidence + np.where(met, weight, 0.0)
+        return (count >= 3) & (confidence > 0.6), pymin(confidence, 0.95)
+
+    buy, buy_confidence = score(buy_rules)
+    sell, sell_confidence = score(sell_rules)
+
+    out.set(np.ones(n, dtype=bool), "hold", 0.2)
+    out.set(sell & ~buy, "sell", sell_confidence)
+    out.set(buy, "buy", buy_confidence)
+    out.set(np.isnan(rsi) | np.isnan(macd) | np.isnan(hist) | (np.arange(n) < 49), "hold", 0.0)
+    return out
@@ -1,7 +1,14 @@
 import pandas as pd
+import numpy as np
 from dataclasses import dataclass
 from typing import Optional, Dict
-from .tradingview_pivots import calculate_daily_pivot_levels
+from .tradingview_pivots import (
+    calculate_camarilla_pivots, calculate_daily_pivot_levels, daily_levels_table, fallback_ohlc_table,
+    outside_daily_ohlc,
+)
+from .series import SignalSeries
+from ..data.candles import as_frame
+from ..data.symbols import is_crypto
 
 @dataclass
 class PivotLevelsSignal:
@@ -20,6 +27,14 @@ class PivotLevelsSignal:
     s4: Optional[float] = None
 
 
+def _entry_thresholds(sym: str) -> Dict[str, float]:
+    """Symbol-aware thresholds (tighter for crypto, slightly wider for stocks; S3 < S2)"""
+    if is_crypto(sym):
+        return {"s3": 0.003, "s2": 0.002}  # keep crypto unchanged
+    # Stocks/ETFs: slightly wider thresholds to increase triggers
+    return {"s3": 0.009, "s2": 0.006}
+
+
 def compute_pivot_levels_signals(df: pd.DataFrame, symbol: str = "", current_position: dict = None, existing_positions: list = None, daily_entry_counts: dict = None) -> PivotLevelsSignal:
     """
     Day-trading pivot strategy using Camarilla:
@@ -39,16 +54,7 @@ def compute_pivot_levels_signals(df: pd.DataFrame, symbol: str = "", current_pos
     s1, s2, s3, s4 = levels['s1'], levels['s2'], levels['s3'], levels['s4']
     r1, r2, r3, r4 = levels['r1'], levels['r2'], levels['r3'], levels['r4']
     current_price = float(df.iloc[-1]['close'])
-    # Symbol-aware thresholds (tighter for crypto, slightly wider for stocks; S3 < S2)
-    def get_thresholds(sym: str) -> Dict[str, float]:
-        # Treat symbols ending with '-USD' as crypto
-        is_crypto = sym.endswith('-USD')
-        if is_crypto:
-            return {"s3": 0.003, "s2": 0.002}  # keep crypto unchanged
-        # Stocks/ETFs: slightly wider thresholds to increase triggers
-        return {"s3": 0.009, "s2": 0.006}
-
-    th = get_thresholds(symbol or "")
+    th = _entry_thresholds(symbol or "")
     s3_threshold = th["s3"]
     s2_threshold = th["s2"]
     
@@ -93,3 +99,84 @@ def compute_pivot_levels_signals(df: pd.DataFrame, symbol: str = "", current_pos
     # No S1 entries (tighten to S2/S3 only)
     
     return PivotLevelsSignal(side="hold", confidence=0.3, pivot=pivot, r1=r1, r2=r2, r3=r3, r4=r4, s1=s1, s2=s2, s3=s3, s4=s4)
+
+
+def compute_pivot_levels_arrays(df: pd.DataFrame, symbol: str = "") -> Dict[str, np.ndarray]:
+    """
+    Precompute, for every bar, what compute_pivot_levels_signals sees on the
+    prefix ending at that bar:
+    - r1/r2/r3/s2/s3: Camarilla levels in effect (NaN while no signal is possible)
+    - cross_s3/cross_s2: price crossed INTO the S3/S2 zone on that bar
+    - zone_s3/zone_s2: top of each entry zone (level plus the symbol's threshold)
+    Lets backtests walk the bars once instead of re-slicing the frame per bar.
+    """
+    df = as_frame(df)
+    n = len(df)
+    keys = ('pivot', 'r1', 'r2', 'r3', 's2', 's3')
+    out = {k: np.full(n, np.nan) for k in keys}
+    out['cross_s3'] = np.zeros(n, dtype=bool)
+    out['cross_s2'] = np.zeros(n, dtype=bool)
+    out['zone_s3'] = np.full(n, np.nan)
+    out['zone_s2'] = np.full(n, np.nan)
+    if n < 50:
+        return out
+
+    # Levels of each session come from the previous session in the frame,
+    # exactly what get_daily_ohlc derives from every prefix in that session
+    if isinstance(df.index, pd.DatetimeIndex):
+        sessions = df.index.normalize()
+        rows = daily_levels_table(df).reindex(sessions)
+        for k in keys:
+            out[k] = rows[k].to_numpy(dtype=float)
+        first_session = np.asarray(sessions == sessions[0])
+    else:
+        first_session = np.ones(n, dtype=bool)
+
+    # The first session has no previous day in the frame: the per-bar path
+    # falls back to the last 24h of bars of each prefix (crypto) or to the
+    # same outside lookup for that session (stocks)
+    fallback = fallback_ohlc_table(df, symbol) if first_session[49] else None
+    if fallback is not None:
+        levels = calculate_camarilla_pivots(fallback['high'].to_numpy(), fallback['low'].to_numpy(),
+                                            fallback['close'].to_numpy())
+        for k in keys:
+            out[k][first_session] = levels[k][first_session]
+    elif first_session[49]:
+        session = df.index[0].date() if isinstance(df.index, pd.DatetimeIndex) else None
+        ohlc = outside_daily_ohlc(symbol, session)
+        if ohlc:
+            levels = calculate_camarilla_pivots(ohlc['high'], ohlc['low'], ohlc['close'])
+            for k in keys:
+                out[k][first_session] = levels[k]
+    for k in keys:
+        out[k][:49] = np.nan
+
+    close = df['close'].to_numpy(dtype=float)
+    prev = np.empty(n)
+    prev[0] = close[0]
+    prev[1:] = close[:-1]
+
+    th = _entry_thresholds(symbol or "")
+    with np.errstate(invalid='ignore'):
+        for level, key in (('s3', 'cross_s3'), ('s2', 'cross_s2')):
+            zone = out[level] * (1 + th[level])
+            out[key] = (out[level] != 0) & (prev > zone) & (close <= zone)
+            out['zone_' + level] = zone
+    return out
+
+
+def compute_pivot_levels_signals_batch(df: pd.DataFrame, symbol: str = "") -> SignalSeries:
+    """
+    Entry signals of compute_pivot_levels_signals for every prefix of df, with
+    no open position and no entries counted today (reason = entry level).
+    Exits depend on the position being carried, so they stay with the caller.
+    """
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    arrays = compute_pivot_levels_arrays(df, symbol)
+    has_levels = ~np.isnan(arrays['pivot'])
+    out.set(has_levels, "hold", 0.3)
+    out.set(arrays['cross_s2'], "buy", 0.85, "S2")
+    out.set(arrays['cross_s3'], "buy", 0.95, "S3")
+    return out
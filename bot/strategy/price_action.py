@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from .series import SignalSeries, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -101,3 +104,82 @@ def compute_simple_trend_signals(df: pd.DataFrame, period: int = 5) -> PriceActi
         return PriceActionSignal(side="sell", confidence=0.6)
     else:
         return PriceActionSignal(side="hold", confidence=0.1)
+
+
+def compute_price_action_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_price_action_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.1)
+    prices = df["close"].astype(float).to_numpy()
+    prev_price = shift(prices)
+    prev2_price = shift(prev_price)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        price_change = (prices - prev_price) / prev_price
+        prev_change = (prev_price - prev2_price) / prev2_price
+        # Applied lowest priority first: later rules win like the if/elif chain
+        out.set((price_change < -0.005) & (prev_change < -0.005), "sell", 0.6)
+        out.set((price_change > 0.005) & (prev_change > 0.005), "buy", 0.6)
+        out.set(price_change < -0.01, "sell", 0.7)
+        out.set(price_change > 0.01, "buy", 0.7)
+    out.set(np.arange(n) < 2, "hold", 0.0)
+    return out
+
+
+def compute_volatility_breakout_signals_batch(df: pd.DataFrame, period: int = 10) -> SignalSeries:
+    """compute_volatility_breakout_signals for every prefix of df"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < period + 1:
+        return out
+
+    close = df["close"].astype(float)
+    prices = close.to_numpy()
+    returns = close.pct_change()
+    valid = returns.notna().to_numpy()
+    # Window i covers the last `period` non-NaN returns up to bar i (returns.dropna().tail(period))
+    count = np.cumsum(valid)
+    compact = returns.to_numpy()[valid]
+    if len(compact) < period:
+        return out
+    windows = np.ascontiguousarray(sliding_window_view(compact, period))
+    mean = windows.sum(axis=1) / period
+    sqr = np.ascontiguousarray((mean[:, None] - windows) ** 2)
+    volatility = np.sqrt(sqr.sum(axis=1) / (period - 1))
+
+    ready = (count >= period) & (np.arange(n) >= period)
+    row = np.where(ready, count - period, 0)
+    mean_return = mean[row]
+    volatility = volatility[row]
+    prev_price = shift(prices)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        current_return = (prices - prev_price) / prev_price
+        out.set(ready, "hold", 0.1)
+        out.set(ready & (current_return < mean_return - volatility), "sell", 0.6)
+        out.set(ready & (current_return > mean_return + volatility), "buy", 0.6)
+        out.set(ready & (current_return < mean_return - 2 * volatility), "sell", 0.8)
+        out.set(ready & (current_return > mean_return + 2 * volatility), "buy", 0.8)
+    return out
+
+
+def compute_simple_trend_signals_batch(df: pd.DataFrame, period: int = 5) -> SignalSeries:
+    """compute_simple_trend_signals for every prefix of df"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < period + 1:
+        return out
+
+    prices = df["close"].astype(float).to_numpy()
+    period_ago_price = np.full(n, np.nan)
+    period_ago_price[period:] = prices[:-period]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        trend = (prices - period_ago_price) / period_ago_price
+        ready = np.arange(n) >= period
+        out.set(ready, "hold", 0.1)
+        out.set(ready & (trend < -0.02), "sell", 0.6)
+        out.set(ready & (trend > 0.02), "buy", 0.6)
+        out.set(ready & (trend < -0.05), "sell", 0.8)
+        out.set(ready & (trend > 0.05), "buy", 0.8)
+    return out
@@ -0,0 +1,56 @@
+"""
+Columnar signal output shared by the `compute_*_signals_batch` functions.
+
+A batch function returns, for every bar i, exactly what the matching per-bar
+`compute_*_signals` returns on `df.iloc[:i+1]`, so a backtest can compute all
+signals in one call and walk the arrays instead of re-slicing the frame.
+Every batch function takes either a DataFrame or a `bot.data.candles.Candles`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class SignalSeries:
+    side: np.ndarray        # 'buy' / 'sell' / 'hold' per bar
+    confidence: np.ndarray  # float per bar
+    reason: np.ndarray      # strategy-specific label per bar ('' if the strategy has none)
+
+    @classmethod
+    def hold(cls, n: int, confidence: float = 0.0, reason: str = "") -> "SignalSeries":
+        return cls(
+            side=np.full(n, "hold", dtype=object),
+            confidence=np.full(n, confidence, dtype=float),
+            reason=np.full(n, reason, dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.side)
+
+    def set(self, mask: np.ndarray, side: str, confidence, reason: str = None) -> None:
+        """Overwrite the bars in `mask`; apply rules from lowest to highest priority."""
+        mask = np.asarray(mask, dtype=bool)
+        self.side[mask] = side
+        conf = np.broadcast_to(np.asarray(confidence, dtype=float), mask.shape)
+        self.confidence[mask] = conf[mask]
+        if reason is not None:
+            self.reason[mask] = reason
+
+
+def pymin(a, b):
+    """Elementwise builtin min(a, b): `a` unless `b < a` (so NaN never wins)."""
+    return np.where(b < a, b, a)
+
+
+def pymax(a, b):
+    """Elementwise builtin max(a, b): `a` unless `b > a` (so NaN never wins)."""
+    return np.where(b > a, b, a)
+
+
+def shift(x: np.ndarray, fill=np.nan) -> np.ndarray:
+    """Value on the previous bar (`fill` on the first)."""
+    out = np.empty_like(x)
+    out[:1] = fill
+    out[1:] = x[:-1]
+    return out
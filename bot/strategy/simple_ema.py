@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from ..indicators import EMA
 
 
 @dataclass
@@ -30,7 +31,13 @@ def compute_simple_ema_signals(df: pd.DataFrame, fast_ema: int = 12, slow_ema: i
     # Check for NaN values
     if pd.isna(current_ema_fast) or pd.isna(current_ema_slow) or pd.isna(prev_ema_fast) or pd.isna(prev_ema_slow):
         return SimpleEMASignal(side="hold", confidence=0.0)
-    
+
+    return _simple_ema_decision(current_ema_fast, current_ema_slow, prev_ema_fast, prev_ema_slow)
+
+
+def _simple_ema_decision(current_ema_fast: float, current_ema_slow: float,
+                         prev_ema_fast: float, prev_ema_slow: float) -> SimpleEMASignal:
+    """Crossover rules shared by compute_simple_ema_signals and SimpleEMAStream"""
     # EMA crossover logic
     ema_bullish = prev_ema_fast <= prev_ema_slow and current_ema_fast > current_ema_slow
     ema_bearish = prev_ema_fast >= prev_ema_slow and current_ema_fast < current_ema_slow
@@ -46,3 +53,26 @@ def compute_simple_ema_signals(df: pd.DataFrame, fast_ema: int = 12, slow_ema: i
         return SimpleEMASignal(side="sell", confidence=confidence)
     else:
         return SimpleEMASignal(side="hold", confidence=confidence)
+
+
+class SimpleEMAStream:
+    """Bar-by-bar version of compute_simple_ema_signals, O(1) per bar."""
+
+    def __init__(self, fast_ema: int = 12, slow_ema: int = 26):
+        self._min_bars = max(fast_ema, slow_ema) + 1
+        self.bars = 0
+        self._ema_fast = EMA(fast_ema)
+        self._ema_slow = EMA(slow_ema)
+
+    def update(self, close: float) -> SimpleEMASignal:
+        prev_ema_fast = self._ema_fast.value
+        prev_ema_slow = self._ema_slow.value
+        current_ema_fast = self._ema_fast.update(close)
+        current_ema_slow = self._ema_slow.update(close)
+        self.bars += 1
+
+        if self.bars < self._min_bars:
+            return SimpleEMASignal(side="hold", confidence=0.0)
+        if pd.isna(current_ema_fast) or pd.isna(current_ema_slow) or pd.isna(prev_ema_fast) or pd.isna(prev_ema_slow):
+            return SimpleEMASignal(side="hold", confidence=0.0)
+        return _simple_ema_decision(current_ema_fast, current_ema_slow, prev_ema_fast, prev_ema_slow)
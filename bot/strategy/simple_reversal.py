@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from numpy.lib.stride_tricks import sliding_window_view
+from .series import SignalSeries
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -48,3 +51,33 @@ def compute_mean_reversion_signals(df: pd.DataFrame) -> ReversalSignal:
     
     else:
         return ReversalSignal(side="hold", confidence=0.1)
+
+
+def compute_mean_reversion_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_mean_reversion_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < 20:
+        return out
+
+    prices = df["close"].astype(float)
+    # tail(20).mean() is a plain (pairwise) sum / count, not the rolling Kahan sum
+    ma_20 = np.full(n, np.nan)
+    ma_20[19:] = np.ascontiguousarray(sliding_window_view(prices.to_numpy(), 20)).sum(axis=1) / 20
+    current_price = prices.to_numpy()
+
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rsi = (100 - (100 / (1 + gain / loss))).to_numpy()
+
+    with np.errstate(invalid='ignore'):
+        distance = (current_price - ma_20) / ma_20
+        buy = (distance < -0.015) & (rsi < 50)
+        sell = (distance > 0.015) & (rsi > 50)
+
+    out.set(np.arange(n) >= 19, "hold", 0.1)
+    out.set(sell & ~buy, "sell", 0.75)
+    out.set(buy, "buy", 0.75)
+    return out
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from .series import SignalSeries, shift
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -47,3 +49,29 @@ def compute_alternating_signals(df: pd.DataFrame) -> SimpleSignal:
         return SimpleSignal(side="sell", confidence=0.8)
     else:
         return SimpleSignal(side="hold", confidence=0.1)
+
+
+def compute_simple_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_simple_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.1)
+    prices = df["close"].astype(float).to_numpy()
+    prev_price = shift(prices)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        price_change = (prices - prev_price) / prev_price
+    out.set(price_change < -0.005, "sell", 0.5)
+    out.set(price_change > 0.005, "buy", 0.5)
+    out.set(np.arange(n) < 1, "hold", 0.0)
+    return out
+
+
+def compute_alternating_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_alternating_signals for every prefix of df"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.1)
+    index = np.arange(1, n + 1)
+    out.set(index % 10 == 5, "sell", 0.8)
+    out.set(index % 10 == 0, "buy", 0.8)
+    return out
@@ -1,5 +1,6 @@
 import pandas as pd
 from dataclasses import dataclass
+from ..indicators import SMA
 
 
 @dataclass
@@ -21,8 +22,34 @@ def compute_sma_signals(df: pd.DataFrame, fast: int, slow: int) -> SMASignal:
     if pd.isna(prev_fast) or pd.isna(prev_slow) or pd.isna(last_fast) or pd.isna(last_slow):
         return SMASignal(side="hold")
 
+    return _sma_cross(prev_fast, prev_slow, last_fast, last_slow)
+
+
+def _sma_cross(prev_fast: float, prev_slow: float, last_fast: float, last_slow: float) -> SMASignal:
     if prev_fast <= prev_slow and last_fast > last_slow:
         return SMASignal(side="buy")
     if prev_fast >= prev_slow and last_fast < last_slow:
         return SMASignal(side="sell")
     return SMASignal(side="hold")
+
+
+class SMAStream:
+    """Bar-by-bar version of compute_sma_signals, O(1) per bar."""
+
+    def __init__(self, fast: int, slow: int):
+        self._min_bars = max(fast, slow) + 1
+        self.bars = 0
+        self._sma_fast = SMA(fast)
+        self._sma_slow = SMA(slow)
+
+    def update(self, close: float) -> SMASignal:
+        prev_fast, prev_slow = self._sma_fast.value, self._sma_slow.value
+        last_fast = self._sma_fast.update(close)
+        last_slow = self._sma_slow.update(close)
+        self.bars += 1
+
+        if self.bars < self._min_bars:
+            return SMASignal(side="hold")
+        if pd.isna(prev_fast) or pd.isna(prev_slow) or pd.isna(last_fast) or pd.isna(last_slow):
+            return SMASignal(side="hold")
+        return _sma_cross(prev_fast, prev_slow, last_fast, last_slow)
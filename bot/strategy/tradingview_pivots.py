@@ -1,9 +1,17 @@
 import pandas as pd
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Optional
 import yfinance as yf
+from ..config import settings
+from ..data.resample import load_resampled
+from ..data.symbols import is_crypto
 
-# Cache for daily OHLC to avoid repeated yfinance calls
-_daily_ohlc_cache = {}
+# LRU cache of daily OHLC looked up outside the frame (local store / yfinance),
+# keyed by (symbol, session date) so it is refreshed once per rollover; misses
+# are cached too. OHLC derived from the frame itself is never cached: it
+# depends on the frame's data.
+_DAILY_OHLC_CACHE_SIZE = 512
+_daily_ohlc_cache: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
 
 def calculate_camarilla_pivots(high: float, low: float, close: float, open: float = None) -> Dict[str, float]:
     """
@@ -47,61 +55,158 @@ def calculate_camarilla_pivots(high: float, low: float, close: float, open: floa
     }
 
 
-def get_daily_ohlc(df: pd.DataFrame, symbol: str = "") -> Dict[str, float]:
+def _session_date(df: pd.DataFrame):
+    """Calendar date (in the index's timezone) of the last bar; None without a DatetimeIndex"""
+    if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+        return None
+    return df.index[-1].date()
+
+
+def daily_ohlc_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-session high/low/close of the candle frame, indexed by session start"""
+    if df.empty or not isinstance(df.index, pd.DatetimeIndex):
+        return pd.DataFrame(columns=['high', 'low', 'close'])
+    sessions = df.index.normalize()
+    return pd.DataFrame({
+        'high': df['high'].astype(float).groupby(sessions).max(),
+        'low': df['low'].astype(float).groupby(sessions).min(),
+        'close': df['close'].astype(float).groupby(sessions).last(),
+    })
+
+
+def daily_levels_table(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Get YESTERDAY's OHLC for pivot calculation (as TradingView does)
-    For stocks: Use previous trading day's OHLC from daily data
-    For crypto: Use last 24h OHLC
-    Caches results to avoid repeated yfinance calls
+    Camarilla levels in effect for every session of the frame, built from the
+    previous session's OHLC in the same frame (no network). The first session
+    has no previous day in the frame and is NaN.
     """
-    # Check cache first
-    if symbol in _daily_ohlc_cache:
-        return _daily_ohlc_cache[symbol]
-    
-    is_crypto = any(x in symbol.upper() for x in ['BTC', 'ETH', 'CRYPTO', '-USD'])
-    
-    if is_crypto:
-        # Crypto: use last 288 bars (24h for 5m data)
-        recent_data = df.tail(288)
-        if len(recent_data) < 50:
+    prev = daily_ohlc_table(df).shift(1)
+    return pd.DataFrame(calculate_camarilla_pivots(prev['high'], prev['low'], prev['close']))
+
+
+# Crypto frames holding a single session use the last 24h of 5m bars instead
+_FALLBACK_BARS = 288
+_FALLBACK_MIN_BARS = 50
+
+
+def fallback_ohlc_table(df: pd.DataFrame, symbol: str = "") -> Optional[pd.DataFrame]:
+    """
+    Per bar, the single-session fallback frame_daily_ohlc would give on the
+    prefix ending there (NaN before it has enough bars); None for non-crypto.
+    """
+    if not is_crypto(symbol):
+        return None
+    out = pd.DataFrame({
+        'high': df['high'].astype(float).rolling(_FALLBACK_BARS, min_periods=_FALLBACK_MIN_BARS).max(),
+        'low': df['low'].astype(float).rolling(_FALLBACK_BARS, min_periods=_FALLBACK_MIN_BARS).min(),
+        'close': df['close'].astype(float),
+    })
+    out.loc[out['high'].isna(), 'close'] = float('nan')
+    return out
+
+
+def frame_daily_ohlc(df: pd.DataFrame, symbol: str = "") -> Dict[str, float]:
+    """
+    Previous session's OHLC taken from the frame itself. Crypto frames that
+    hold a single session fall back to the last 288 bars (24h of 5m data).
+    Empty dict when the frame cannot provide it.
+    """
+    daily = daily_ohlc_table(df)
+    if len(daily) >= 2:
+        prev = daily.iloc[-2]
+        return {'high': float(prev['high']), 'low': float(prev['low']), 'close': float(prev['close'])}
+
+    if is_crypto(symbol):
+        recent_data = df.tail(_FALLBACK_BARS)
+        if len(recent_data) < _FALLBACK_MIN_BARS:
             return {}
-        
-        high = float(recent_data['high'].max())
-        low = float(recent_data['low'].min())
-        close = float(recent_data['close'].iloc[-1])
+        return {
+            'high': float(recent_data['high'].max()),
+            'low': float(recent_data['low'].min()),
+            'close': float(recent_data['close'].iloc[-1]),
+        }
+    return {}
+
+
+def stored_daily_ohlc(symbol: str, session=None) -> Dict[str, float]:
+    """
+    Last session before `session` (a date; None for the last complete one)
+    resampled from candles already in the local store. No provider call.
+    """
+    daily = load_resampled(symbol, "1d")
+    if daily.empty:
+        return {}
+    if session is None:
+        daily = daily.iloc[:-1]
     else:
-        # Stocks: Fetch actual daily data for previous day
-        try:
-            # Get daily data for the last 5 days to ensure we have yesterday
-            ticker = yf.Ticker(symbol)
-            daily_data = ticker.history(period="5d", interval="1d")
-            
-            if len(daily_data) < 2:
-                return {}
-            
-            # Use the third-to-last day (to match TradingView's calculation)
-            # This seems to be the correct day for ASELS pivot calculation
-            yesterday_data = daily_data.iloc[-3]
-            
-            high = float(yesterday_data['High'])
-            low = float(yesterday_data['Low'])
-            close = float(yesterday_data['Close'])
-        except Exception as e:
-            print(f"Error fetching daily data for {symbol}: {e}")
+        daily = daily[daily.index.date < session]
+    if daily.empty:
+        return {}
+    prev = daily.iloc[-1]
+    return {'high': float(prev['high']), 'low': float(prev['low']), 'close': float(prev['close'])}
+
+
+def _fetch_daily_ohlc(symbol: str) -> Dict[str, float]:
+    """Stocks whose frame lacks the previous session: fetch daily bars from yfinance"""
+    try:
+        # Get daily data for the last 5 days to ensure we have yesterday
+        ticker = yf.Ticker(symbol)
+        daily_data = ticker.history(period="5d", interval="1d")
+        
+        if len(daily_data) < 2:
             return {}
-    
-    result = {
-        'high': high,
-        'low': low,
-        'close': close
-    }
-    
-    # Cache the result
-    _daily_ohlc_cache[symbol] = result
-    
+        
+        # Use the third-to-last day (to match TradingView's calculation)
+        # This seems to be the correct day for ASELS pivot calculation
+        yesterday_data = daily_data.iloc[-3]
+        
+        return {
+            'high': float(yesterday_data['High']),
+            'low': float(yesterday_data['Low']),
+            'close': float(yesterday_data['Close'])
+        }
+    except Exception as e:
+        print(f"Error fetching daily data for {symbol}: {e}")
+        return {}
+
+
+def outside_daily_ohlc(symbol: str, session=None) -> Dict[str, float]:
+    """
+    OHLC of the last session before `session` for a stock whose frame lacks
+    it: resampled from the local candle store, else fetched from yfinance
+    unless DATA_OFFLINE is set. Looked up once per (symbol, session), so
+    the per-bar and batch pivot paths see the same levels.
+    """
+    if not symbol:
+        return {}
+    key = (symbol, session)
+    cached = _daily_ohlc_cache.get(key)
+    if cached is not None:
+        _daily_ohlc_cache.move_to_end(key)
+        return cached
+
+    result = stored_daily_ohlc(symbol, session)
+    if not result and not settings.data_offline:
+        result = _fetch_daily_ohlc(symbol)
+
+    _daily_ohlc_cache[key] = result
+    if len(_daily_ohlc_cache) > _DAILY_OHLC_CACHE_SIZE:
+        _daily_ohlc_cache.popitem(last=False)
     return result
 
 
+def get_daily_ohlc(df: pd.DataFrame, symbol: str = "", fetch: bool = True) -> Dict[str, float]:
+    """
+    Get YESTERDAY's OHLC for pivot calculation (as TradingView does)
+    Taken from the candle frame when it covers the previous session; otherwise
+    crypto uses the last 24h of bars and stocks use outside_daily_ohlc (if `fetch`).
+    """
+    result = frame_daily_ohlc(df, symbol)
+    if result or not fetch or is_crypto(symbol):
+        return result
+    return outside_daily_ohlc(symbol, _session_date(df))
+
+
 def calculate_daily_pivot_levels(df: pd.DataFrame, symbol: str = "") -> Dict[str, float]:
     """Calculate daily pivot levels using Camarilla method"""
     ohlc = get_daily_ohlc(df, symbol)
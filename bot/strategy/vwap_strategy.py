@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from ..indicators import VWAP
+from .series import SignalSeries, pymin
+from ..data.candles import as_frame
 
 
 @dataclass
@@ -32,7 +35,12 @@ def compute_vwap_signals(df: pd.DataFrame) -> VWAPSignal:
     vwap = (typical_price * volume).cumsum() / volume.cumsum()
     current_vwap = vwap.iloc[-1]
     current_price = close.iloc[-1]
-    
+
+    return _vwap_decision(current_price, current_vwap)
+
+
+def _vwap_decision(current_price: float, current_vwap: float) -> VWAPSignal:
+    """Distance-from-VWAP rules shared by compute_vwap_signals and VWAPStream"""
     # Calculate distance from VWAP as percentage
     distance_pct = (current_price - current_vwap) / current_vwap * 100
     
@@ -53,3 +61,45 @@ def compute_vwap_signals(df: pd.DataFrame) -> VWAPSignal:
     
     else:
         return VWAPSignal(side="hold", confidence=0.1)
+
+
+class VWAPStream:
+    """Bar-by-bar version of compute_vwap_signals, O(1) per bar."""
+
+    def __init__(self):
+        self.bars = 0
+        self._vwap = VWAP()
+
+    def update(self, high: float, low: float, close: float, volume: float) -> VWAPSignal:
+        current_vwap = self._vwap.update(high, low, close, volume)
+        self.bars += 1
+        if self.bars < 2:
+            return VWAPSignal(side="hold", confidence=0.0)
+        return _vwap_decision(close, current_vwap)
+
+
+def compute_vwap_signals_batch(df: pd.DataFrame) -> SignalSeries:
+    """compute_vwap_signals for every prefix of df; bar i equals the call on df.iloc[:i+1]"""
+    df = as_frame(df)
+    n = len(df)
+    out = SignalSeries.hold(n, 0.0)
+    if n < 2:
+        return out
+
+    high = df['high'].astype(float)
+    low = df['low'].astype(float)
+    close = df['close'].astype(float)
+    volume = df['volume'].astype(float)
+    vwap = (((high + low + close) / 3 * volume).cumsum() / volume.cumsum()).to_numpy()
+    price = close.to_numpy()
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        distance_pct = (price - vwap) / vwap * 100
+        confidence = pymin(abs(distance_pct) / 2, 0.95)
+    threshold = 0.3
+
+    out.set(np.ones(n, dtype=bool), "hold", 0.1)
+    out.set(distance_pct > threshold, "sell", confidence)
+    out.set(distance_pct < -threshold, "buy", confidence)
+    out.set(np.arange(n) < 1, "hold", 0.0)
+    return out
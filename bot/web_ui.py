@@ -4,13 +4,18 @@ import plotly.graph_objs as go
 import plotly.utils
 import json
 from .storage.db import Database
-from .data.yahoo import fetch_candles
+from .data.store import fetch_candles
 from .strategy.ema_rsi_atr import compute_ema_rsi_atr_signals, calculate_dynamic_stop_loss, calculate_position_size
 from .strategy.simple_ema import compute_simple_ema_signals
 from .strategy.pivot_levels import compute_pivot_levels_signals
 from .backtest.simple_backtester import SimpleBacktester
+from .backtest.montecarlo import simulate as monte_carlo, trade_pnl
+from .backtest.cache import default_cache
+from .backtest.metrics import StreamingMetrics, periods_per_year
+from .profiling import report as profile_report, timer
 from .exchange.paper import PaperExchange
 from .config import settings
+import math
 import threading
 import time
 import os
@@ -29,6 +34,7 @@ current_symbol = "AAPL"
 current_interval = "1h"
 current_exchange = None
 current_data = None
+current_metrics = None
 bot_thread = None
 bot_running = False
 
@@ -57,57 +63,72 @@ def load_initial_data():
 # Load initial data when module is imported
 load_initial_data()
 
+def _trade_last_bar(df: pd.DataFrame, writer) -> None:
+    """One bot iteration on freshly fetched candles: pivot signal, paper fill, equity + metrics."""
+    global current_data
+    current_data = df
+    last_row = df.iloc[-1]
+    price = float(last_row["close"])
+    
+    # Use pivot levels strategy
+    # Track current position for the strategy
+    current_position = None
+    if current_exchange.position > 0:
+        current_position = {
+            'shares': current_exchange.position,
+            'entry_price': current_exchange.avg_entry_price if current_exchange.avg_entry_price else price,
+            'entry_level': 'S1'  # We'll track this properly later
+        }
+    
+    with timer("signal.pivot_levels"):
+        signal = compute_pivot_levels_signals(df, symbol=current_symbol, current_position=current_position)
+    signal_side = str(signal.side) if hasattr(signal, 'side') else "hold"
+    
+    # Calculate position size based on risk management
+    account_balance = current_exchange.cash + (current_exchange.position * price)
+    
+    if signal_side == "buy" and current_exchange.position <= 0:
+        # Use 70% of available capital for pivot trades
+        position_value = account_balance * 0.70
+        position_size = position_value / price if price > 0 else 0
+        if position_size > 0:
+            fill = current_exchange.market_buy(current_symbol, qty=position_size, price=price)
+            writer.record_trade(int(last_row["timestamp"]), current_symbol, fill.side, fill.qty, fill.price, fill.cost)
+            print(f"PIVOT BUY: Bought {position_size:.2f} {current_symbol} at ${price:.2f} (Entry: {signal.entry_level}, Target: {signal.exit_level}, Confidence: {signal.confidence:.2f})")
+    elif signal_side == "sell" and current_exchange.position > 0:
+        sell_qty = current_exchange.position
+        if sell_qty > 0:
+            entry_price = current_exchange.avg_entry_price
+            fill = current_exchange.market_sell(current_symbol, qty=sell_qty, price=price)
+            if entry_price is not None:
+                current_metrics.add_trade((fill.price - entry_price) * fill.qty)
+            writer.record_trade(int(last_row["timestamp"]), current_symbol, fill.side, fill.qty, fill.price, fill.cost)
+            print(f"PIVOT SELL: Sold {sell_qty:.2f} {current_symbol} at ${price:.2f} (Exit: {signal.exit_level}, Confidence: {signal.confidence:.2f})")
+
+    # Pivot strategy handles all exits based on resistance levels
+    # No additional stop-loss logic needed
+    equity = current_exchange.cash + current_exchange.position * price
+    writer.record_equity(timestamp=int(last_row["timestamp"]), equity=equity, symbol=current_symbol)
+    current_metrics.update(equity, int(last_row["timestamp"]))
+
+
 def run_bot_loop():
-    global current_data, current_exchange, bot_running
+    global current_exchange, bot_running
     db = Database()
+    writer = db.buffered_writer(max_seconds=10.0)
     
     while bot_running:
         try:
-            df = fetch_candles(symbol=current_symbol, interval=current_interval, lookback=300)
-            if df.empty:
-                time.sleep(5)
-                continue
-            
-            current_data = df
-            last_row = df.iloc[-1]
-            price = float(last_row["close"])
-            
-            # Use pivot levels strategy
-            # Track current position for the strategy
-            current_position = None
-            if current_exchange.position > 0:
-                current_position = {
-                    'shares': current_exchange.position,
-                    'entry_price': current_exchange.avg_entry_price if current_exchange.avg_entry_price else price,
-                    'entry_level': 'S1'  # We'll track this properly later
-                }
-            
-            signal = compute_pivot_levels_signals(df, symbol=current_symbol, current_position=current_position)
-            signal_side = str(signal.side) if hasattr(signal, 'side') else "hold"
-            
-            # Calculate position size based on risk management
-            account_balance = current_exchange.cash + (current_exchange.position * price)
-            
-            if signal_side == "buy" and current_exchange.position <= 0:
-                # Use 70% of available capital for pivot trades
-                position_value = account_balance * 0.70
-                position_size = position_value / price if price > 0 else 0
-                if position_size > 0:
-                    current_exchange.market_buy(current_symbol, qty=position_size, price=price)
-                    print(f"PIVOT BUY: Bought {position_size:.2f} {current_symbol} at ${price:.2f} (Entry: {signal.entry_level}, Target: {signal.exit_level}, Confidence: {signal.confidence:.2f})")
-            elif signal_side == "sell" and current_exchange.position > 0:
-                sell_qty = current_exchange.position
-                if sell_qty > 0:
-                    current_exchange.market_sell(current_symbol, qty=sell_qty, price=price)
-                    print(f"PIVOT SELL: Sold {sell_qty:.2f} {current_symbol} at ${price:.2f} (Exit: {signal.exit_level}, Confidence: {signal.confidence:.2f})")
-
-            # Pivot strategy handles all exits based on resistance levels
-            # No additional stop-loss logic needed
-            db.record_equity(timestamp=int(last_row["timestamp"]), equity=current_exchange.cash + current_exchange.position * price)
+            with timer("cycle"):
+                df = fetch_candles(symbol=current_symbol, interval=current_interval, lookback=300)
+                if not df.empty:
+                    _trade_last_bar(df, writer)
+            writer.flush_if_due()
             time.sleep(5)
         except Exception as e:
             print(f"Bot error: {e}")
             time.sleep(5)
+    writer.close()
 
 @app.route('/')
 def index():
@@ -115,7 +136,7 @@ def index():
 
 @app.route('/api/start', methods=['POST'])
 def start_bot():
-    global bot_thread, bot_running, current_exchange, current_symbol, current_interval
+    global bot_thread, bot_running, current_exchange, current_metrics, current_symbol, current_interval
     
     if bot_running:
         return jsonify({"status": "already_running"})
@@ -125,6 +146,7 @@ def start_bot():
     current_interval = data.get('interval', '1h')
     
     current_exchange = PaperExchange(starting_cash=settings.paper_starting_cash)
+    current_metrics = StreamingMetrics(current_exchange.cash, periods_per_year(current_interval, current_symbol))
     bot_running = True
     bot_thread = threading.Thread(target=run_bot_loop)
     bot_thread.daemon = True
@@ -177,6 +199,11 @@ def get_status():
         current_price = float(current_data.iloc[-1]["close"])
     
     total_equity = current_exchange.cash + current_exchange.position * current_price
+    metrics = {}
+    if current_metrics is not None:
+        # Infinity (profit factor with no losses) is not valid JSON
+        metrics = {k: (v if not isinstance(v, float) or math.isfinite(v) else None)
+                   for k, v in vars(current_metrics.snapshot()).items()}
     
     return jsonify({
         "running": bot_running,
@@ -186,9 +213,15 @@ def get_status():
         "position": current_exchange.position,
         "current_price": current_price,
         "total_equity": total_equity,
-        "trades": len(current_exchange.trades)
+        "trades": len(current_exchange.trades),
+        "metrics": metrics
     })
 
+@app.route('/api/profile')
+def get_profile():
+    """Per-stage timing percentiles of the bot loop (empty unless PROFILE=1 or --profile)"""
+    return jsonify(profile_report())
+
 @app.route('/api/chart')
 def get_chart():
     global current_data, current_symbol, current_interval
@@ -404,7 +437,8 @@ def get_equity():
     db = Database()
     conn = db.conn
     cursor = conn.cursor()
-    cursor.execute("SELECT timestamp, equity FROM equity ORDER BY timestamp")
+    symbol = request.args.get('symbol', current_symbol)
+    cursor.execute("SELECT timestamp, equity FROM equity WHERE symbol = ? ORDER BY timestamp", (symbol,))
     rows = cursor.fetchall()
     
     return jsonify([{"timestamp": row[0], "equity": row[1]} for row in rows])
@@ -424,7 +458,10 @@ def run_backtest():
         
         # Run backtest
         backtester = SimpleBacktester(initial_capital=10000, commission=0.001)
-        result = backtester.run_backtest(df)
+        params = {'initial_capital': 10000, 'commission': 0.001, 'symbol': backtester.symbol, 'engine': backtester.engine,
+                  'end_of_data': backtester.end_of_data}
+        result = default_cache().get_or_run(df, "simple_backtester", params, lambda: backtester.run_backtest(df))
+        mc = monte_carlo(trade_pnl(result), initial_capital=10000, paths=10000, seed=0)
         
         return jsonify({
             "success": True,
@@ -447,7 +484,8 @@ def run_backtest():
                 "profit_factor": round(result.profit_factor, 2),
                 "symbol": current_symbol,
                 "period": f"{df.index[0]} to {df.index[-1]}" if len(df) > 0 else "N/A",
-                "initial_capital": 10000
+                "initial_capital": 10000,
+                "monte_carlo": mc.to_dict()
             }
         })
         
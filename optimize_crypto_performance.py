@@ -3,10 +3,11 @@ Kripto Performans Optimizasyonu
 Farklı parametreleri test edip en iyisini bulur
 """
 import pandas as pd
-from bot.data.yahoo import fetch_candles
+from bot.data.store import fetch_candles
 from bot.strategy.bot_hunter import compute_bot_hunter_signals
 from bot.exchange.paper import PaperExchange
 from datetime import datetime
+from bot.backtest.events import DEBUG, default_sink
 
 
 class OptimizedBacktester:
@@ -205,6 +206,7 @@ def optimize_crypto(symbol: str):
     print("Parametreler test ediliyor...")
     total_tests = len(stop_loss_options) * len(take_profit_options) * len(confidence_options) * len(position_size_options) * len(trend_filter_options)
     test_count = 0
+    events = default_sink()
     
     for stop_loss in stop_loss_options:
         for take_profit in take_profit_options:
@@ -212,8 +214,8 @@ def optimize_crypto(symbol: str):
                 for pos_size in position_size_options:
                     for use_trend in trend_filter_options:
                         test_count += 1
-                        if test_count % 10 == 0:
-                            print(f"Test {test_count}/{total_tests}...")
+                        if test_count % 10 == 0 and events.wants(DEBUG):
+                            events.emit(DEBUG, "progress", symbol=symbol, done=test_count, total=total_tests)
                         
                         backtester = OptimizedBacktester()
                         result = backtester.run_backtest(
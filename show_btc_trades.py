@@ -3,176 +3,32 @@ BTC için detaylı işlem listesi
 """
 import pandas as pd
 from datetime import datetime
-from bot.data.yahoo import fetch_candles
-from bot.strategy.bot_hunter import compute_bot_hunter_signals
-from bot.exchange.paper import PaperExchange
+from bot.data.store import fetch_candles
+from bot.data.symbols import is_crypto
+from bot.backtest.engine import BacktestEngine, StopLoss, TakeProfit
 
 
-class DetailedBacktester:
-    """Detaylı işlem listesi için backtester"""
-    
-    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001):
-        self.initial_capital = initial_capital
-        self.commission = commission
-    
-    def run_backtest(self, df: pd.DataFrame, symbol: str):
-        """Detaylı backtest - tüm işlemleri kaydet"""
-        
-        if df.empty or len(df) < 50:
-            return []
-        
-        exchange = PaperExchange(self.initial_capital)
-        trades = []
-        equity_curve = [self.initial_capital]
-        
-        # Trend filtresi için EMA
-        close = df['close'].astype(float)
-        ema_50 = close.ewm(span=50).mean()
-        ema_200 = close.ewm(span=200).mean()
-        
-        for i in range(200, len(df)):
-            current_data = df.iloc[:i+1]
-            current_price = float(current_data.iloc[-1]['close'])
-            current_time = df.index[i]
-            
-            # Trend filtresi
-            current_ema_50 = ema_50.iloc[i] if i < len(ema_50) else current_price
-            current_ema_200 = ema_200.iloc[i] if i < len(ema_200) else current_price
-            is_uptrend = current_ema_50 > current_ema_200
-            
-            # Bot Hunter sinyali
-            signal = compute_bot_hunter_signals(current_data, symbol=symbol)
-            
-            # Mevcut pozisyon kontrolü
-            current_equity = exchange.cash + (exchange.position * current_price)
-            equity_curve.append(current_equity)
-            
-            # Stop-loss ve take-profit (kripto için optimize edilmiş)
-            if exchange.position > 0 and exchange.avg_entry_price:
-                pnl_pct = (current_price - exchange.avg_entry_price) / exchange.avg_entry_price
-                
-                # Kripto: %3 stop-loss, %6 take-profit
-                stop_loss = 0.03
-                take_profit = 0.06
-                
-                # Stop-loss
-                if pnl_pct <= -stop_loss:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    pnl_usd = (current_price - entry_price) * sell_qty
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'STOP_LOSS',
-                        'side': 'SELL',
-                        'price': current_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': pnl_usd,
-                        'equity': exchange.cash,
-                        'reason': f'Stop-loss triggered ({pnl_pct:.2%})',
-                        'confidence': 1.0,
-                        'entry_price': entry_price
-                    })
-                    continue
-                
-                # Take-profit
-                if pnl_pct >= take_profit:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    pnl_usd = (current_price - entry_price) * sell_qty
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'TAKE_PROFIT',
-                        'side': 'SELL',
-                        'price': current_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': pnl_usd,
-                        'equity': exchange.cash,
-                        'reason': f'Take-profit triggered ({pnl_pct:.2%})',
-                        'confidence': 1.0,
-                        'entry_price': entry_price
-                    })
-                    continue
-            
-            # Sinyal bazlı işlemler
-            is_crypto = symbol.endswith('-USD') and symbol not in ['AAPL', 'TSLA', 'MSFT', 'GOOGL']
-            min_confidence = 0.70 if is_crypto else 0.4
-            
-            if signal.side == "buy" and exchange.position <= 0 and signal.confidence > min_confidence:
-                # Kripto için sadece uptrend'de buy yap
-                if is_crypto and not is_uptrend:
-                    continue
-                
-                account_balance = exchange.cash + (exchange.position * current_price if exchange.position > 0 else 0)
-                if is_crypto:
-                    position_size_pct = min(0.4, signal.confidence * 0.6)
-                else:
-                    position_size_pct = min(0.7, signal.confidence)
-                position_value = account_balance * position_size_pct
-                qty = position_value / current_price
-                
-                if qty > 0 and exchange.cash >= position_value * (1 + self.commission):
-                    exchange.market_buy(symbol, int(qty * 10000) / 10000, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'BUY',
-                        'side': 'BUY',
-                        'price': current_price,
-                        'quantity': qty,
-                        'pnl_pct': 0.0,
-                        'pnl_usd': 0.0,
-                        'equity': exchange.cash + (exchange.position * current_price),
-                        'reason': signal.reason,
-                        'confidence': signal.confidence,
-                        'entry_price': current_price
-                    })
-            
-            elif signal.side == "sell" and exchange.position > 0 and signal.confidence > min_confidence:
-                sell_qty = exchange.position
-                entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                exchange.market_sell(symbol, sell_qty, current_price)
-                pnl_pct = (current_price - entry_price) / entry_price
-                pnl_usd = (current_price - entry_price) * sell_qty
-                trades.append({
-                    'timestamp': current_time,
-                    'type': 'SELL',
-                    'side': 'SELL',
-                    'price': current_price,
-                    'quantity': sell_qty,
-                    'pnl_pct': pnl_pct,
-                    'pnl_usd': pnl_usd,
-                    'equity': exchange.cash,
-                    'reason': signal.reason,
-                    'confidence': signal.confidence,
-                    'entry_price': entry_price
-                })
-        
-        # Kalan pozisyonu kapat
-        if exchange.position > 0:
-            final_price = float(df.iloc[-1]['close'])
-            final_time = df.index[-1]
-            entry_price = exchange.avg_entry_price if exchange.avg_entry_price else final_price
-            exchange.market_sell(symbol, exchange.position, final_price)
-            pnl_pct = (final_price - entry_price) / entry_price
-            pnl_usd = (final_price - entry_price) * exchange.position
-            trades.append({
-                'timestamp': final_time,
-                'type': 'FINAL',
-                'side': 'SELL',
-                'price': final_price,
-                'quantity': exchange.position,
-                'pnl_pct': pnl_pct,
-                'pnl_usd': pnl_usd,
-                'equity': exchange.cash,
-                'reason': 'Final liquidation',
-                'confidence': 0.0,
-                'entry_price': entry_price
-            })
-        
-        return trades
+def detailed_engine(symbol: str, initial_capital: float = 10000.0, commission: float = 0.001) -> BacktestEngine:
+    """Detaylı işlem listesi için engine ayarları"""
+    crypto = is_crypto(symbol)
+    return BacktestEngine(
+        strategy="bot_hunter",
+        # Kripto için optimize edilmiş: %3 stop-loss, %6 take-profit
+        exits=(StopLoss(0.03), TakeProfit(0.06)),
+        min_confidence=0.70 if crypto else 0.4,
+        position_size=(lambda conf: min(0.4, conf * 0.6)) if crypto else (lambda conf: min(0.7, conf)),
+        # Kripto için sadece uptrend'de buy yap
+        trend_filter=crypto,
+        initial_capital=initial_capital,
+        commission=commission,
+    )
+
+
+def run_detailed_backtest(df: pd.DataFrame, symbol: str) -> list:
+    """Detaylı backtest - tüm işlemleri kaydet"""
+    if df.empty or len(df) < 50:
+        return []
+    return detailed_engine(symbol).run(df, symbol).trades
 
 
 def show_btc_trades():
@@ -195,8 +51,7 @@ def show_btc_trades():
     print(f"Bitiş Fiyatı: ${df.iloc[-1]['close']:,.2f}")
     
     # Backtest çalıştır
-    backtester = DetailedBacktester(initial_capital=10000.0, commission=0.001)
-    trades = backtester.run_backtest(df, "BTC-USD")
+    trades = run_detailed_backtest(df, "BTC-USD")
     
     if not trades:
         print("\nHiç işlem yapılmadı!")
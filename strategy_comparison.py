@@ -4,282 +4,55 @@ Grafiklerden görünen pivot seviyelerini kullanarak test eder
 """
 import pandas as pd
 from datetime import datetime
-from bot.data.yahoo import fetch_candles
-from bot.strategy.bot_hunter import compute_bot_hunter_signals
-from bot.exchange.paper import PaperExchange
+from bot.data.store import fetch_candles
+from bot.data.resample import resample
+from bot.backtest.engine import BacktestEngine, StopLoss, TakeProfit
+from bot.backtest.cache import default_cache
 
 
-class DayTradingBacktester:
-    """Day-trading stratejisi - Günlük işlemler"""
-    
-    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001):
-        self.initial_capital = initial_capital
-        self.commission = commission
-    
-    def run_backtest(self, df: pd.DataFrame, symbol: str):
-        """Day-trading: Günlük işlemler, sıkı stop-loss"""
-        
-        exchange = PaperExchange(self.initial_capital)
-        trades = []
-        equity_curve = [self.initial_capital]
-        
-        # Day-trading parametreleri
-        stop_loss = 0.02  # %2 stop-loss (sıkı)
-        take_profit = 0.04  # %4 take-profit (hızlı kar)
-        min_confidence = 0.65
-        position_size = 0.5  # %50 position size
-        
-        for i in range(200, len(df)):
-            current_data = df.iloc[:i+1]
-            current_price = float(current_data.iloc[-1]['close'])
-            current_time = df.index[i]
-            
-            signal = compute_bot_hunter_signals(current_data, symbol=symbol)
-            current_equity = exchange.cash + (exchange.position * current_price)
-            equity_curve.append(current_equity)
-            
-            # Stop-loss ve take-profit (sıkı)
-            if exchange.position > 0 and exchange.avg_entry_price:
-                pnl_pct = (current_price - exchange.avg_entry_price) / exchange.avg_entry_price
-                
-                if pnl_pct <= -stop_loss:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'STOP_LOSS',
-                        'price': current_price,
-                        'entry_price': entry_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': (current_price - entry_price) * sell_qty
-                    })
-                    continue
-                
-                if pnl_pct >= take_profit:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'TAKE_PROFIT',
-                        'price': current_price,
-                        'entry_price': entry_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': (current_price - entry_price) * sell_qty
-                    })
-                    continue
-            
-            # Sinyal bazlı işlemler
-            if signal.side == "buy" and exchange.position <= 0 and signal.confidence > min_confidence:
-                account_balance = exchange.cash + (exchange.position * current_price if exchange.position > 0 else 0)
-                position_value = account_balance * position_size
-                qty = position_value / current_price
-                
-                if qty > 0 and exchange.cash >= position_value * (1 + self.commission):
-                    exchange.market_buy(symbol, int(qty * 10000) / 10000, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'BUY',
-                        'price': current_price,
-                        'quantity': qty,
-                        'confidence': signal.confidence
-                    })
-            
-            elif signal.side == "sell" and exchange.position > 0 and signal.confidence > min_confidence:
-                sell_qty = exchange.position
-                entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                exchange.market_sell(symbol, sell_qty, current_price)
-                pnl_pct = (current_price - entry_price) / entry_price
-                trades.append({
-                    'timestamp': current_time,
-                    'type': 'SELL',
-                    'price': current_price,
-                    'entry_price': entry_price,
-                    'quantity': sell_qty,
-                    'pnl_pct': pnl_pct,
-                    'pnl_usd': (current_price - entry_price) * sell_qty
-                })
-        
-        # Kalan pozisyonu kapat
-        if exchange.position > 0:
-            final_price = float(df.iloc[-1]['close'])
-            final_time = df.index[-1]
-            entry_price = exchange.avg_entry_price if exchange.avg_entry_price else final_price
-            exchange.market_sell(symbol, exchange.position, final_price)
-            pnl_pct = (final_price - entry_price) / entry_price
-            trades.append({
-                'timestamp': final_time,
-                'type': 'FINAL',
-                'price': final_price,
-                'entry_price': entry_price,
-                'quantity': exchange.position,
-                'pnl_pct': pnl_pct,
-                'pnl_usd': (final_price - entry_price) * exchange.position
-            })
-        
-        final_equity = exchange.cash
-        total_return = (final_equity - self.initial_capital) / self.initial_capital
-        
-        # Trade istatistikleri
-        sell_trades = [t for t in trades if t['type'] in ['SELL', 'TAKE_PROFIT', 'STOP_LOSS', 'FINAL']]
-        trade_pnl = [t.get('pnl_pct', 0) for t in sell_trades]
-        
-        profitable = sum(1 for pnl in trade_pnl if pnl > 0)
-        win_rate = profitable / len(trade_pnl) if trade_pnl else 0
-        
-        return {
-            'total_return': total_return,
-            'final_equity': final_equity,
-            'total_trades': len(sell_trades),
-            'win_rate': win_rate,
-            'trades': trades
-        }
+def day_trading_engine(initial_capital: float = 10000.0, commission: float = 0.001) -> BacktestEngine:
+    """Day-trading: Günlük işlemler, sıkı stop-loss (%2), hızlı kar (%4)"""
+    return BacktestEngine(
+        strategy="bot_hunter",
+        exits=(StopLoss(0.02), TakeProfit(0.04)),
+        min_confidence=0.65,
+        position_size=0.5,
+        initial_capital=initial_capital,
+        commission=commission,
+    )
 
 
-class LongTermBacktester:
-    """Uzun vadeli strateji - Yıllık kar hedefi"""
-    
-    def __init__(self, initial_capital: float = 10000.0, commission: float = 0.001):
-        self.initial_capital = initial_capital
-        self.commission = commission
-    
-    def run_backtest(self, df: pd.DataFrame, symbol: str):
-        """Long-term: Az işlem, geniş stop-loss, yüksek take-profit"""
-        
-        exchange = PaperExchange(self.initial_capital)
-        trades = []
-        equity_curve = [self.initial_capital]
-        
-        # Long-term parametreleri
-        stop_loss = 0.10  # %10 stop-loss (geniş)
-        take_profit = 0.30  # %30 take-profit (yüksek hedef)
-        min_confidence = 0.75  # Daha yüksek confidence (daha az ama kaliteli sinyal)
-        position_size = 0.7  # %70 position size (daha büyük pozisyon)
-        
-        # Trend filtresi (uzun vadeli trend takibi)
-        close = df['close'].astype(float)
-        ema_50 = close.ewm(span=50).mean()
-        ema_200 = close.ewm(span=200).mean()
-        
-        for i in range(200, len(df)):
-            current_data = df.iloc[:i+1]
-            current_price = float(current_data.iloc[-1]['close'])
-            current_time = df.index[i]
-            
-            # Trend kontrolü (sadece uptrend'de buy)
-            current_ema_50 = ema_50.iloc[i] if i < len(ema_50) else current_price
-            current_ema_200 = ema_200.iloc[i] if i < len(ema_200) else current_price
-            is_uptrend = current_ema_50 > current_ema_200
-            
-            signal = compute_bot_hunter_signals(current_data, symbol=symbol)
-            current_equity = exchange.cash + (exchange.position * current_price)
-            equity_curve.append(current_equity)
-            
-            # Stop-loss ve take-profit (geniş)
-            if exchange.position > 0 and exchange.avg_entry_price:
-                pnl_pct = (current_price - exchange.avg_entry_price) / exchange.avg_entry_price
-                
-                if pnl_pct <= -stop_loss:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'STOP_LOSS',
-                        'price': current_price,
-                        'entry_price': entry_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': (current_price - entry_price) * sell_qty
-                    })
-                    continue
-                
-                if pnl_pct >= take_profit:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'TAKE_PROFIT',
-                        'price': current_price,
-                        'entry_price': entry_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': (current_price - entry_price) * sell_qty
-                    })
-                    continue
-            
-            # Sinyal bazlı işlemler (sadece yüksek confidence + uptrend)
-            if signal.side == "buy" and exchange.position <= 0:
-                if signal.confidence > min_confidence and is_uptrend:
-                    account_balance = exchange.cash + (exchange.position * current_price if exchange.position > 0 else 0)
-                    position_value = account_balance * position_size
-                    qty = position_value / current_price
-                    
-                    if qty > 0 and exchange.cash >= position_value * (1 + self.commission):
-                        exchange.market_buy(symbol, int(qty * 10000) / 10000, current_price)
-                        trades.append({
-                            'timestamp': current_time,
-                            'type': 'BUY',
-                            'price': current_price,
-                            'quantity': qty,
-                            'confidence': signal.confidence
-                        })
-            
-            elif signal.side == "sell" and exchange.position > 0:
-                # Uzun vadeli: Sadece trend kırılırsa veya take-profit'te sat
-                if not is_uptrend and signal.confidence > min_confidence:
-                    sell_qty = exchange.position
-                    entry_price = exchange.avg_entry_price if exchange.avg_entry_price else current_price
-                    exchange.market_sell(symbol, sell_qty, current_price)
-                    pnl_pct = (current_price - entry_price) / entry_price
-                    trades.append({
-                        'timestamp': current_time,
-                        'type': 'SELL',
-                        'price': current_price,
-                        'entry_price': entry_price,
-                        'quantity': sell_qty,
-                        'pnl_pct': pnl_pct,
-                        'pnl_usd': (current_price - entry_price) * sell_qty
-                    })
-        
-        # Kalan pozisyonu kapat
-        if exchange.position > 0:
-            final_price = float(df.iloc[-1]['close'])
-            final_time = df.index[-1]
-            entry_price = exchange.avg_entry_price if exchange.avg_entry_price else final_price
-            exchange.market_sell(symbol, exchange.position, final_price)
-            pnl_pct = (final_price - entry_price) / entry_price
-            trades.append({
-                'timestamp': final_time,
-                'type': 'FINAL',
-                'price': final_price,
-                'entry_price': entry_price,
-                'quantity': exchange.position,
-                'pnl_pct': pnl_pct,
-                'pnl_usd': (final_price - entry_price) * exchange.position
-            })
-        
-        final_equity = exchange.cash
-        total_return = (final_equity - self.initial_capital) / self.initial_capital
-        
-        # Trade istatistikleri
-        sell_trades = [t for t in trades if t['type'] in ['SELL', 'TAKE_PROFIT', 'STOP_LOSS', 'FINAL']]
-        trade_pnl = [t.get('pnl_pct', 0) for t in sell_trades]
-        
-        profitable = sum(1 for pnl in trade_pnl if pnl > 0)
-        win_rate = profitable / len(trade_pnl) if trade_pnl else 0
-        
-        return {
-            'total_return': total_return,
-            'final_equity': final_equity,
-            'total_trades': len(sell_trades),
-            'win_rate': win_rate,
-            'trades': trades
-        }
+def long_term_engine(initial_capital: float = 10000.0, commission: float = 0.001) -> BacktestEngine:
+    """Long-term: Az işlem, geniş stop-loss (%10), yüksek take-profit (%30)"""
+    return BacktestEngine(
+        strategy="bot_hunter",
+        exits=(StopLoss(0.10), TakeProfit(0.30)),
+        min_confidence=0.75,  # Daha yüksek confidence (daha az ama kaliteli sinyal)
+        position_size=0.7,  # %70 position size (daha büyük pozisyon)
+        trend_filter=True,  # Sadece uptrend'de buy
+        trend_exit=True,  # Sadece trend kırılırsa sinyalle sat
+        initial_capital=initial_capital,
+        commission=commission,
+    )
+
+
+def run_backtest(engine: BacktestEngine, df: pd.DataFrame, symbol: str) -> dict:
+    result = default_cache().run_engine(engine, df, symbol)
+    
+    # Trade istatistikleri (final kapanış dahil)
+    sell_trades = [t for t in result.trades if t['type'] in ['SELL', 'TAKE_PROFIT', 'STOP_LOSS', 'FINAL']]
+    trade_pnl = [t.get('pnl_pct', 0) for t in sell_trades]
+    
+    profitable = sum(1 for pnl in trade_pnl if pnl > 0)
+    win_rate = profitable / len(trade_pnl) if trade_pnl else 0
+    
+    return {
+        'total_return': result.total_return,
+        'final_equity': result.final_equity,
+        'total_trades': len(sell_trades),
+        'win_rate': win_rate,
+        'trades': result.trades
+    }
 
 
 def compare_strategies():
@@ -289,10 +62,13 @@ def compare_strategies():
     print("STRATEJİ KARŞILAŞTIRMASI: Day-Trading vs Long-Term")
     print("="*100)
     
-    # 1 yıllık veri çek (günlük interval)
+    # 1 yıllık saatlik veri tek seferde çekilir; günlük barlar ondan türetilir
+    df_base = fetch_candles("BTC-USD", "1h", 366 * 24)
+
+    # 1 yıllık veri (günlük interval)
     print("\n1 YILLIK VERİ ANALİZİ (Daily Interval)")
     print("-"*100)
-    df_daily = fetch_candles("BTC-USD", "1d", 365)
+    df_daily = resample(df_base, "1d").tail(365)
     
     if df_daily.empty or len(df_daily) < 200:
         print("Yetersiz veri!")
@@ -305,10 +81,10 @@ def compare_strategies():
     price_change = (df_daily.iloc[-1]['close'] - df_daily.iloc[0]['close']) / df_daily.iloc[0]['close']
     print(f"Fiyat Değişimi: {price_change:+.2%}")
     
-    # 1 saatlik veri çek (son 1 ay)
+    # 1 saatlik veri (son 1 ay)
     print("\n1 AYLIK VERİ ANALİZİ (Hourly Interval)")
     print("-"*100)
-    df_hourly = fetch_candles("BTC-USD", "1h", 720)
+    df_hourly = df_base.tail(720)
     
     if df_hourly.empty or len(df_hourly) < 200:
         print("Yetersiz veri!")
@@ -321,8 +97,7 @@ def compare_strategies():
     print("\n" + "="*100)
     print("DAY-TRADING STRATEJİSİ (1 Saatlik Interval)")
     print("="*100)
-    day_trader = DayTradingBacktester()
-    day_result = day_trader.run_backtest(df_hourly, "BTC-USD")
+    day_result = run_backtest(day_trading_engine(), df_hourly, "BTC-USD")
     
     print(f"\nSonuçlar:")
     print(f"  Toplam Getiri: {day_result['total_return']:+.2%}")
@@ -334,8 +109,7 @@ def compare_strategies():
     print("\n" + "="*100)
     print("LONG-TERM STRATEJİSİ (Günlük Interval)")
     print("="*100)
-    long_term = LongTermBacktester()
-    long_result = long_term.run_backtest(df_daily, "BTC-USD")
+    long_result = run_backtest(long_term_engine(), df_daily, "BTC-USD")
     
     print(f"\nSonuçlar:")
     print(f"  Toplam Getiri: {long_result['total_return']:+.2%}")
@@ -7,7 +7,7 @@ import os
 from datetime import datetime
 from typing import Optional
 import pandas as pd
-from bot.data.yahoo import fetch_candles
+from bot.data.store import fetch_candles
 from bot.strategy.bot_hunter import compute_bot_hunter_signals
 from bot.strategy.ema_rsi_atr import compute_ema_rsi_atr_signals
 from bot.strategy.pivot_levels import compute_pivot_levels_signals
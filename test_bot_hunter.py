@@ -6,7 +6,8 @@ import sys
 import os
 from datetime import datetime
 import pandas as pd
-from bot.data.yahoo import fetch_candles
+from bot.data.store import fetch_candles
+from bot.data.symbols import is_crypto
 from bot.strategy.bot_hunter import compute_bot_hunter_signals
 from bot.exchange.paper import PaperExchange
 
@@ -50,9 +51,9 @@ class BotHunterBacktester:
                 pnl_pct = (current_price - exchange.avg_entry_price) / exchange.avg_entry_price
                 
                 # Kripto için daha sıkı stop-loss ve erken take-profit
-                is_crypto = symbol.endswith('-USD') and symbol not in ['AAPL', 'TSLA', 'MSFT', 'GOOGL']
+                crypto = is_crypto(symbol)
                 
-                if is_crypto:
+                if crypto:
                     # Kripto: %3 stop-loss, %6 take-profit (daha konservatif)
                     stop_loss = 0.03
                     take_profit = 0.06
@@ -86,11 +87,11 @@ class BotHunterBacktester:
                     continue
             
             # Sinyal bazlı işlemler (kripto için daha yüksek confidence + trend filtresi)
-            is_crypto = symbol.endswith('-USD') and symbol not in ['AAPL', 'TSLA', 'MSFT', 'GOOGL']
-            min_confidence = 0.70 if is_crypto else 0.4  # Kripto için daha yüksek threshold
+            crypto = is_crypto(symbol)
+            min_confidence = 0.70 if crypto else 0.4  # Kripto için daha yüksek threshold
             
             # Trend filtresi (kripto için)
-            if is_crypto and len(df) > 200:
+            if crypto and len(df) > 200:
                 close_prices = df['close'].astype(float)
                 ema_50 = close_prices.ewm(span=50).mean()
                 ema_200 = close_prices.ewm(span=200).mean()
@@ -102,11 +103,11 @@ class BotHunterBacktester:
             
             if signal.side == "buy" and exchange.position <= 0 and signal.confidence > min_confidence:
                 # Kripto için sadece uptrend'de buy yap
-                if is_crypto and not is_uptrend:
+                if crypto and not is_uptrend:
                     continue  # Downtrend'de buy yapma
                 # Position sizing: kripto için daha konservatif
                 account_balance = exchange.cash + (exchange.position * current_price if exchange.position > 0 else 0)
-                if is_crypto:
+                if crypto:
                     position_size_pct = min(0.4, signal.confidence * 0.6)  # Max %40, daha konservatif
                 else:
                     position_size_pct = min(0.7, signal.confidence)  # Max %70
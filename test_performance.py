@@ -6,7 +6,7 @@ import sys
 import os
 from datetime import datetime, timedelta
 import pandas as pd
-from bot.data.yahoo import fetch_candles
+from bot.data.store import fetch_candles
 from bot.backtest.simple_backtester import SimpleBacktester
 from bot.backtest.backtester import Backtester
 from bot.strategy.ema_rsi_atr import compute_ema_rsi_atr_signals
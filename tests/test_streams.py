@@ -0,0 +1,68 @@
+"""
+Bar-by-bar strategy streams against their per-bar functions: update() on bar
+i must give the signal the function computes on the frame's first i+1 bars.
+"""
+import dataclasses
+import math
+
+import pytest
+
+from bot.data.synthetic import REFERENCE, generate_candles
+from bot.runner import StreamedSignal
+from bot.strategy.bot_hunter import BotHunterStream, compute_bot_hunter_signals
+from bot.strategy.ema_rsi_atr import EMARSIATRStream, compute_ema_rsi_atr_signals
+from bot.strategy.momentum_strategy import MomentumStream, compute_momentum_signals
+from bot.strategy.simple_ema import SimpleEMAStream, compute_simple_ema_signals
+from bot.strategy.sma import SMAStream, compute_sma_signals
+from bot.strategy.vwap_strategy import VWAPStream, compute_vwap_signals
+
+BARS = 200
+
+# name -> (stream factory, update fields, per-bar function)
+CASES = {
+    "sma": (lambda: SMAStream(20, 50), ("close",), lambda df: compute_sma_signals(df, fast=20, slow=50)),
+    "simple_ema": (SimpleEMAStream, ("close",), compute_simple_ema_signals),
+    "ema_rsi_atr": (EMARSIATRStream, ("high", "low", "close"), compute_ema_rsi_atr_signals),
+    "bot_hunter": (BotHunterStream, ("high", "low", "close", "volume"), compute_bot_hunter_signals),
+    "momentum": (MomentumStream, ("close", "volume"), compute_momentum_signals),
+    "vwap": (VWAPStream, ("high", "low", "close", "volume"), compute_vwap_signals),
+}
+
+
+def _same(a, b) -> bool:
+    for f in dataclasses.fields(a):
+        x, y = getattr(a, f.name), getattr(b, f.name)
+        if isinstance(x, float) and isinstance(y, float):
+            if not (math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9) or (math.isnan(x) and math.isnan(y))):
+                return False
+        elif x != y:
+            return False
+    return True
+
+
+@pytest.fixture(scope="module", params=["BTC-USD", "AAPL"])
+def candles(request):
+    return generate_candles(request.param, "5m", BARS, end=REFERENCE, seed=7)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_stream_matches_function(candles, name):
+    make_stream, fields, fn = CASES[name]
+    stream = make_stream()
+    for i, bar in enumerate(candles[list(fields)].to_numpy(dtype=float).tolist()):
+        expected = fn(candles.iloc[:i + 1])
+        got = stream.update(*bar)
+        assert _same(got, expected), f"{name} bar {i}: {got} != {expected}"
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_streamed_signal_polls_forming_bar(candles, name):
+    """Live polling: the forming bar is re-sent with a new close before it closes"""
+    make_stream, fields, fn = CASES[name]
+    signal_fn = StreamedSignal(make_stream, fields)
+    for i in range(60, BARS):
+        frame = candles.iloc[:i + 1].copy()
+        forming = frame.copy()
+        forming.iloc[-1, forming.columns.get_loc("close")] *= 1.01
+        assert _same(signal_fn(forming), fn(forming))
+        assert _same(signal_fn(frame), fn(frame))